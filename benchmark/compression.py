@@ -0,0 +1,79 @@
+"""
+Benchmark of disk footprint and load latency of compressed storage for a full organism cache.
+
+The cache is simulated by storing the KGML file of the test suite once per pathway of an organism.
+Run from repository root with `python -m benchmark.compression`.
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from typing import List, Optional
+
+from keggtools.storage import Storage
+
+
+def main() -> None:
+    """
+    Run benchmark.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pathways", type=int, default=350, help="Number of pathways in organism cache.")
+    parser.add_argument("--kgml", default=os.path.join(os.path.dirname(__file__), "..", "test", "pathway.kgml"))
+    args = parser.parse_args()
+
+    with open(args.kgml, "r", encoding="utf-8") as file_obj:
+        payload: str = file_obj.read()
+
+    methods: List[Optional[str]] = [None, "zlib", "gzip", "lzma"]
+
+    try:
+        import zstandard # type: ignore # pylint: disable=import-outside-toplevel,unused-import
+        methods.append("zstd")
+    except ImportError:
+        pass
+
+    print(f"{'method':<8} {'bytes':>12} {'disk usage':>12} {'ratio':>7} {'load total':>11} {'per file':>10}")
+
+    plain_size: Optional[int] = None
+
+    for method in methods:
+        cachedir: str = tempfile.mkdtemp()
+        storage: Storage = Storage(cachedir=cachedir, compression=method)
+
+        filenames: List[str] = [f"mmu_path{index:05d}.kgml" for index in range(args.pathways)]
+
+        for filename in filenames:
+            storage.save(filename=filename, data=payload)
+
+        total_bytes: int = 0
+        disk_usage: int = 0
+
+        for filename in filenames:
+            stat_result = os.stat(os.path.join(cachedir, filename))
+            total_bytes += stat_result.st_size
+            disk_usage += stat_result.st_blocks * 512
+
+        if plain_size is None:
+            plain_size = total_bytes
+
+        start: float = time.perf_counter()
+
+        for filename in filenames:
+            storage.load(filename=filename)
+
+        load_time: float = time.perf_counter() - start
+
+        shutil.rmtree(cachedir)
+
+        print(
+            f"{str(method):<8} {total_bytes:>12} {disk_usage:>12} {plain_size / total_bytes:>6.1f}x " \
+            f"{load_time * 1000:>9.1f}ms {load_time / args.pathways * 1e6:>8.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
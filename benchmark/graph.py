@@ -0,0 +1,97 @@
+"""
+Benchmark of batched downstream queries on the graph view against walking relations of the pathway.
+
+A large map is simulated by copying entries and relations of the KGML file of the test suite with shifted entry ids.
+Run from repository root with `python -m benchmark.graph`.
+"""
+
+import argparse
+import os
+import time
+from typing import Dict, List
+
+from keggtools.graph import PathwayGraph
+from keggtools.models import Entry, Pathway, Relation
+
+
+def walk_relations(pathway: Pathway, source: str, k: int) -> Dict[str, int]:
+    """
+    Downstream search by scanning all relations in each step, like code without adjacency arrays.
+    """
+
+    depth: Dict[str, int] = {source: 0}
+    frontier: List[str] = [source]
+
+    for step in range(1, k + 1):
+        following: List[str] = []
+
+        for node in frontier:
+            for relation in pathway.relations:
+                if relation.entry1 == node and relation.entry2 not in depth:
+                    depth[relation.entry2] = step
+                    following.append(relation.entry2)
+
+        frontier = following
+
+    return depth
+
+
+def main() -> None:
+    """
+    Run benchmark.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--copies", type=int, default=20, help="Number of copies of pathway.")
+    parser.add_argument("--k", type=int, default=3, help="Number of steps of downstream queries.")
+    parser.add_argument("--kgml", default=os.path.join(os.path.dirname(__file__), "..", "test", "pathway.kgml"))
+    args = parser.parse_args()
+
+    with open(args.kgml, "r", encoding="utf-8") as file_obj:
+        template: Pathway = Pathway.parse(file_obj.read())
+
+    pathway: Pathway = Pathway(name=template.name, org=template.org, number=template.number)
+    shift: int = max(int(entry.id) for entry in template.entries) + 1
+
+    for copy in range(args.copies):
+        for entry in template.entries:
+            pathway.entries.append(Entry(id=str(int(entry.id) + copy * shift), name=entry.name, type=entry.type))
+
+        for relation in template.relations:
+            shifted: Relation = Relation(
+                entry1=str(int(relation.entry1) + copy * shift),
+                entry2=str(int(relation.entry2) + copy * shift),
+                type=relation.type,
+            )
+            shifted.subtypes = relation.subtypes
+            pathway.relations.append(shifted)
+
+    sources: List[str] = [entry.id for entry in pathway.get_entries_by_type("gene")]
+    print(f"{len(pathway.entries)} entries, {len(pathway.relations)} relations, {len(sources)} source genes")
+
+    start: float = time.perf_counter()
+    graph: PathwayGraph = pathway.get_graph()
+    print(f"graph build        {(time.perf_counter() - start) * 1000:>8.1f}ms")
+
+    start = time.perf_counter()
+    batch = graph.k_hop(sources, k=args.k)
+    runtime: float = time.perf_counter() - start
+    print(f"k_hop batch        {runtime * 1000:>8.1f}ms")
+
+    start = time.perf_counter()
+    graph.signed_k_hop(sources, k=args.k)
+    print(f"signed_k_hop batch {(time.perf_counter() - start) * 1000:>8.1f}ms")
+
+    # Relation walk is slow, so only a sample of sources is measured and extrapolated
+    sample: List[str] = sources[:max(1, len(sources) // 20)]
+    start = time.perf_counter()
+
+    for source in sample:
+        assert walk_relations(pathway, source, args.k) == batch[source]
+
+    walk: float = (time.perf_counter() - start) / len(sample) * len(sources)
+    print(f"relation walk      {walk * 1000:>8.1f}ms (extrapolated), speedup {walk / runtime:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
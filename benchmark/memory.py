@@ -0,0 +1,69 @@
+"""
+Benchmark of memory held by parsed pathway models of a full organism.
+
+A full organism (about 350 pathways for hsa or mmu) is simulated by parsing the KGML file of the test suite
+repeatedly. Every parsed pathway is kept alive, like in an analysis over all pathways of an organism. Run from
+repository root with `python -m benchmark.memory`.
+"""
+
+import argparse
+import gc
+import os
+import time
+import tracemalloc
+from typing import List
+
+from keggtools.models import Pathway
+
+
+def count_models(pathway: Pathway) -> int:
+    """
+    Count model instances of pathway.
+    """
+
+    count: int = 1 + len(pathway.entries) + len(pathway.relations) + len(pathway.reactions)
+
+    for entry in pathway.entries:
+        count += len(entry.components) + (1 if entry.graphics is not None else 0)
+
+    for relation in pathway.relations:
+        count += len(relation.subtypes)
+
+    for reaction in pathway.reactions:
+        count += len(reaction.products) + len(reaction.substrates)
+
+    return count
+
+
+def main() -> None:
+    """
+    Run benchmark.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pathways", type=int, default=350, help="Number of pathways of simulated organism.")
+    parser.add_argument("--kgml", default=os.path.join(os.path.dirname(__file__), "..", "test", "pathway.kgml"))
+    args = parser.parse_args()
+
+    with open(args.kgml, "r", encoding="utf-8") as file_obj:
+        kgml: str = file_obj.read()
+
+    gc.collect()
+    tracemalloc.start()
+    start: float = time.perf_counter()
+
+    pathways: List[Pathway] = [Pathway.parse(kgml) for _ in range(args.pathways)]
+
+    runtime: float = time.perf_counter() - start
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    models: int = sum(count_models(pathway) for pathway in pathways)
+
+    print(f"{len(pathways)} pathways with {models} model instances parsed in {runtime * 1000:.1f}ms")
+    print(f"Retained memory: {current / 1e6:.2f} MB ({current / models:.1f} bytes per model instance)")
+
+
+if __name__ == "__main__":
+    main()
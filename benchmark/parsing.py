@@ -0,0 +1,79 @@
+"""
+Benchmark of KGML parsing with all available XML backends, with and without validation (trusted mode), over a
+corpus of KGML files.
+
+The corpus is every "*.kgml" file in the given directories (e.g. a warmed up cache folder). Without directories,
+the KGML file of the test suite is used. Run from repository root with `python -m benchmark.parsing [DIR ...]`.
+"""
+
+import argparse
+import glob
+import os
+import time
+from typing import Dict, List, Tuple
+
+from keggtools.models import Pathway
+from keggtools.utils import XML_BACKENDS, lxml_etree
+
+
+def main() -> None:
+    """
+    Run benchmark.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("directories", nargs="*", help="Directories with KGML files.")
+    parser.add_argument("--repeat", type=int, default=20, help="Number of parsing rounds over corpus.")
+    args = parser.parse_args()
+
+    files: List[str] = []
+
+    for directory in args.directories:
+        files.extend(sorted(glob.glob(os.path.join(directory, "*.kgml"))))
+
+    if len(files) == 0:
+        files.append(os.path.join(os.path.dirname(__file__), "..", "test", "pathway.kgml"))
+
+    corpus: List[str] = []
+
+    for filename in files:
+        with open(filename, "r", encoding="utf-8") as file_obj:
+            corpus.append(file_obj.read())
+
+    print(f"Corpus of {len(corpus)} files with {sum(len(item) for item in corpus)} characters")
+
+    modes: List[Tuple[str, bool]] = [
+        (backend, validate)
+        for backend in XML_BACKENDS
+        if backend != "lxml" or lxml_etree is not None
+        for validate in (True, False)
+    ]
+    results: Dict[Tuple[str, bool], List[bytes]] = {}
+    runtimes: Dict[Tuple[str, bool], float] = {}
+
+    for backend, validate in modes:
+        start: float = time.perf_counter()
+
+        for _ in range(args.repeat):
+            parsed: List[Pathway] = [Pathway.parse(data, backend=backend, validate=validate) for data in corpus]
+
+        runtimes[(backend, validate)] = (time.perf_counter() - start) / args.repeat
+        results[(backend, validate)] = [item.to_bytes() for item in parsed]
+
+    print(f"{'backend':<8} {'validate':<9} {'per round':>10} {'per file':>10} {'speedup':>8}")
+
+    for mode in modes:
+        print(
+            f"{mode[0]:<8} {str(mode[1]):<9} {runtimes[mode] * 1000:>8.1f}ms " \
+            f"{runtimes[mode] / len(corpus) * 1000:>8.2f}ms {runtimes[('etree', True)] / runtimes[mode]:>7.2f}x"
+        )
+
+    # Output of all modes must be identical
+    for mode in modes:
+        assert results[mode] == results[("etree", True)], f"Output of {mode} differs."
+
+    print("Output of all backends and modes is identical.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark of size and load time of binary model serialization against pickle and KGML parsing.
+
+Run from repository root with `python -m benchmark.serialization`.
+"""
+
+import argparse
+import os
+import pickle
+import time
+from typing import Callable
+
+from keggtools.models import Pathway
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """
+    Measure mean runtime of function in seconds.
+    """
+
+    start: float = time.perf_counter()
+
+    for _ in range(repeat):
+        func()
+
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    """
+    Run benchmark.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200, help="Number of loads per method.")
+    parser.add_argument("--kgml", default=os.path.join(os.path.dirname(__file__), "..", "test", "pathway.kgml"))
+    args = parser.parse_args()
+
+    with open(args.kgml, "r", encoding="utf-8") as file_obj:
+        kgml: str = file_obj.read()
+
+    pathway: Pathway = Pathway.parse(kgml)
+
+    pickle_data: bytes = pickle.dumps(pathway, protocol=pickle.HIGHEST_PROTOCOL)
+    binary_data: bytes = pathway.to_bytes()
+
+    print(f"{'method':<8} {'bytes':>10} {'dump':>10} {'load':>10}")
+
+    print(f"{'kgml':<8} {len(kgml.encode('utf-8')):>10} {'-':>10} " \
+        f"{measure(lambda: Pathway.parse(kgml), args.repeat) * 1e6:>8.1f}us")
+
+    print(f"{'pickle':<8} {len(pickle_data):>10} " \
+        f"{measure(lambda: pickle.dumps(pathway, protocol=pickle.HIGHEST_PROTOCOL), args.repeat) * 1e6:>8.1f}us " \
+        f"{measure(lambda: pickle.loads(pickle_data), args.repeat) * 1e6:>8.1f}us")
+
+    print(f"{'binary':<8} {len(binary_data):>10} " \
+        f"{measure(pathway.to_bytes, args.repeat) * 1e6:>8.1f}us " \
+        f"{measure(lambda: Pathway.from_bytes(binary_data), args.repeat) * 1e6:>8.1f}us")
+
+
+if __name__ == "__main__":
+    main()
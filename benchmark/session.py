@@ -0,0 +1,96 @@
+"""
+Benchmark of KEGG REST requests with and without pooled HTTP session against a local stand-in server.
+
+Run from repository root with `python -m benchmark.session`.
+"""
+
+import argparse
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from typing import Optional
+
+import requests
+
+from keggtools.resolver import _request, create_session
+
+
+with open(os.path.join(os.path.dirname(__file__), "..", "test", "pathway.kgml"), "rb") as file_obj:
+    PAYLOAD: bytes = file_obj.read()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    Request handler serving a static KGML file with keep-alive support.
+    """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None: # pylint: disable=invalid-name
+        """
+        Answer every GET request with KGML payload.
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", "application/xml")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+
+    def log_message(self, *args) -> None: # pylint: disable=arguments-differ
+        """
+        Disable request logging.
+        """
+
+
+class StandInServer(ThreadingMixIn, HTTPServer):
+    """
+    Threaded HTTP server.
+    """
+    daemon_threads = True
+
+
+def run(count: int, session: Optional[requests.Session], url: str) -> float:
+    """
+    Run requests and return requests per second.
+    """
+
+    start: float = time.perf_counter()
+
+    for _ in range(count):
+        _request(url=url, session=session, timeout=10)
+
+    return count / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """
+    Run benchmark.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1000, help="Number of requests per run.")
+    args = parser.parse_args()
+
+    server: StandInServer = StandInServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url: str = f"http://127.0.0.1:{server.server_address[1]}/get/mmu04010/kgml"
+
+    without_session: float = run(count=args.count, session=None, url=url)
+
+    session: requests.Session = create_session(pool_size=10)
+    with_session: float = run(count=args.count, session=session, url=url)
+    session.close()
+
+    server.shutdown()
+
+    print(f"requests without session: {without_session:10.1f} req/s")
+    print(f"requests with session:    {with_session:10.1f} req/s")
+    print(f"speedup:                  {with_session / without_session:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
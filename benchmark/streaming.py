@@ -0,0 +1,75 @@
+"""
+Benchmark of peak memory and runtime of full tree parsing against streaming parsing of a large KGML file.
+
+A large pathway (similar to global maps like 01100) is simulated by repeating the children of the KGML file of the
+test suite. Run from repository root with `python -m benchmark.streaming`.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Tuple
+from xml.etree import ElementTree
+
+from keggtools.models import Pathway
+
+
+def measure(func: Callable[[], Pathway]) -> Tuple[float, int]:
+    """
+    Measure runtime in seconds and peak of allocated memory in bytes.
+    """
+
+    tracemalloc.start()
+    start: float = time.perf_counter()
+
+    func()
+
+    runtime: float = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return runtime, peak
+
+
+def main() -> None:
+    """
+    Run benchmark.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--copies", type=int, default=20, help="Number of copies of pathway children.")
+    parser.add_argument("--kgml", default=os.path.join(os.path.dirname(__file__), "..", "test", "pathway.kgml"))
+    args = parser.parse_args()
+
+    root = ElementTree.parse(args.kgml).getroot()
+    children = list(root)
+
+    for _ in range(args.copies - 1):
+        root.extend(children)
+
+    with tempfile.NamedTemporaryFile(suffix=".kgml", delete=False) as file_obj:
+        file_obj.write(ElementTree.tostring(root))
+        path: str = file_obj.name
+
+    del root, children
+
+    try:
+        print(f"KGML file with {os.path.getsize(path)} bytes")
+        print(f"{'parser':<8} {'runtime':>10} {'peak memory':>14}")
+
+        def parse_tree() -> Pathway:
+            with open(path, "r", encoding="utf-8") as kgml_file:
+                return Pathway.parse(kgml_file.read())
+
+        for name, func in (("tree", parse_tree), ("stream", lambda: Pathway.parse_stream(path))):
+            runtime, peak = measure(func)
+            print(f"{name:<8} {runtime * 1000:>8.1f}ms {peak / 1e6:>11.1f} MB")
+
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,10 @@ __version__: str = "1.0.0"
 
 from .analysis import EnrichmentResult, Enrichment
 from .const import IMMUNE_SYSTEM_PATHWAYS
+from .graph import PathwayGraph
 from .models import Pathway, Relation, Entry, Graphics, Subtype, Component
 from .render import Renderer
-from .resolver import Resolver
-from .storage import Storage
+from .resolver import Resolver, AsyncResolver
+from .storage import Storage, SQLiteStorage, BundleStorage, MemoryCache
+from .throttle import FileRateLimiter, RateLimiter, RetryPolicy
 from .utils import ColorGradient
@@ -0,0 +1,210 @@
+""" Portable single file archive of cached KEGG data """
+
+import hashlib
+import json
+import os
+import struct
+import threading
+import time
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+from .utils import create_temp_file
+
+
+# Magic bytes and version of bundle format
+BUNDLE_MAGIC: bytes = b"KTBUNDLE"
+BUNDLE_VERSION: int = 1
+
+# Header: magic, bundle version, offset and length of JSON manifest
+BUNDLE_HEADER: struct.Struct = struct.Struct("<8sHQQ")
+
+
+def write_bundle(
+    path: str,
+    entries: Iterable[Tuple[str, bytes, float]],
+    release: Optional[str] = None,
+    ) -> Dict[str, Any]:
+    """
+    Write bundle file. Entry data is written back to back after the header, followed by a JSON manifest with offset,
+    length, modification time and sha256 checksum of each entry. The file is written atomically.
+
+    :param str path: Path of bundle file.
+    :param typing.Iterable[typing.Tuple[str, bytes, float]] entries: Tuples of key, stored data and modification time.
+    :param typing.Optional[str] release: KEGG release the cached data belongs to.
+    :return: Manifest of bundle.
+    :rtype: typing.Dict[str, typing.Any]
+    """
+
+    manifest: Dict[str, Any] = {
+        "version": BUNDLE_VERSION,
+        "release": release,
+        "created": time.time(),
+        "entries": {},
+    }
+
+    directory: str = os.path.dirname(os.path.abspath(path))
+    file_descriptor, temp_path = create_temp_file(directory=directory, prefix=f".{os.path.basename(path)}.")
+
+    try:
+        with os.fdopen(file_descriptor, "wb") as f_obj:
+            # Reserve space for header, which is written after manifest position is known
+            f_obj.write(b"\0" * BUNDLE_HEADER.size)
+            offset: int = BUNDLE_HEADER.size
+
+            for key, data, mtime in entries:
+                f_obj.write(data)
+
+                manifest["entries"][key] = {
+                    "offset": offset,
+                    "length": len(data),
+                    "mtime": mtime,
+                    "sha256": hashlib.sha256(data).hexdigest(),
+                }
+                offset += len(data)
+
+            manifest_data: bytes = json.dumps(manifest, sort_keys=True).encode("utf-8")
+            f_obj.write(manifest_data)
+
+            f_obj.seek(0)
+            f_obj.write(BUNDLE_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, offset, len(manifest_data)))
+
+        os.replace(temp_path, path)
+
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+    return manifest
+
+
+
+def read_manifest(f_obj: BinaryIO) -> Dict[str, Any]:
+    """
+    Read and check header and manifest of bundle file.
+
+    :param typing.BinaryIO f_obj: Bundle file opened in binary mode.
+    :return: Manifest of bundle.
+    :rtype: typing.Dict[str, typing.Any]
+    """
+
+    f_obj.seek(0)
+    header: bytes = f_obj.read(BUNDLE_HEADER.size)
+
+    if len(header) != BUNDLE_HEADER.size:
+        raise ValueError("File is not a valid bundle.")
+
+    magic, version, manifest_offset, manifest_length = BUNDLE_HEADER.unpack(header)
+
+    if magic != BUNDLE_MAGIC:
+        raise ValueError("File is not a valid bundle.")
+
+    if version != BUNDLE_VERSION:
+        raise ValueError(f"Bundle version {version} is not supported.")
+
+    f_obj.seek(manifest_offset)
+    manifest_data: bytes = f_obj.read(manifest_length)
+
+    if len(manifest_data) != manifest_length:
+        raise ValueError("Bundle file is truncated.")
+
+    manifest: Dict[str, Any] = json.loads(manifest_data.decode("utf-8"))
+    return manifest
+
+
+
+class BundleReader:
+    """
+    Read entries of bundle file in place without unpacking.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Init BundleReader instance. Bundle file is opened and manifest is loaded.
+
+        :param str path: Path of bundle file.
+        """
+
+        self.path: str = path
+        self._file: BinaryIO = open(path, "rb") # pylint: disable=consider-using-with
+
+        try:
+            self.manifest: Dict[str, Any] = read_manifest(f_obj=self._file)
+        except BaseException:
+            self._file.close()
+            raise
+
+        self.entries: Dict[str, Dict[str, Any]] = self.manifest["entries"]
+        self._lock: threading.Lock = threading.Lock()
+
+
+    @property
+    def release(self) -> Optional[str]:
+        """
+        KEGG release of bundled data.
+
+        :rtype: typing.Optional[str]
+        """
+
+        release: Optional[str] = self.manifest.get("release")
+        return release
+
+
+    def keys(self) -> List[str]:
+        """
+        List keys of all entries in bundle.
+
+        :rtype: typing.List[str]
+        """
+
+        return list(self.entries.keys())
+
+
+    def __contains__(self, key: object) -> bool:
+        """
+        Check if entry is in bundle.
+
+        :rtype: bool
+        """
+
+        return key in self.entries
+
+
+    def read(self, key: str, verify: bool = True) -> bytes:
+        """
+        Read stored data of entry.
+
+        :param str key: Key of entry.
+        :param bool verify: Check sha256 checksum of data.
+        :return: Stored data of entry.
+        :rtype: bytes
+        """
+
+        item: Optional[Dict[str, Any]] = self.entries.get(key)
+
+        if item is None:
+            raise FileNotFoundError(f"Entry '{key}' does not exist in bundle '{self.path}'.")
+
+        with self._lock:
+            self._file.seek(item["offset"])
+            data: bytes = self._file.read(item["length"])
+
+        if verify and hashlib.sha256(data).hexdigest() != item["sha256"]:
+            raise ValueError(f"Checksum of entry '{key}' in bundle does not match.")
+
+        return data
+
+
+    def close(self) -> None:
+        """
+        Close bundle file.
+        """
+
+        self._file.close()
+
+
+    def __enter__(self) -> "BundleReader":
+        return self
+
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
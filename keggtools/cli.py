@@ -0,0 +1,170 @@
+""" Command line interface of keggtools """
+
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List, Optional, TextIO
+
+from . import __version__
+from .resolver import Resolver
+from .storage import Storage
+from .throttle import FileRateLimiter
+
+
+# Hidden file in cache folder storing token bucket of rate limiter
+RATE_LIMIT_FILENAME: str = ".rate_limit"
+
+
+def format_duration(seconds: float) -> str:
+    """
+    Format duration as short human readable string (e.g. "1h02m05s").
+
+    :param float seconds: Duration in seconds.
+    :return: Formatted duration.
+    :rtype: str
+    """
+
+    minutes, secs = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+
+    if hours > 0:
+        return f"{hours}h{minutes:02d}m{secs:02d}s"
+
+    if minutes > 0:
+        return f"{minutes}m{secs:02d}s"
+
+    return f"{secs}s"
+
+
+
+class WarmupProgress:
+    """
+    Print progress of cache warmup with throughput and estimated remaining time.
+    """
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        """
+        Init WarmupProgress instance.
+
+        :param typing.Optional[typing.TextIO] stream: Stream to print progress to. Fallback to stderr.
+        """
+
+        self.stream: TextIO = stream if stream is not None else sys.stderr
+        self.start: float = time.monotonic()
+
+
+    def __call__(self, statistics: Dict[str, int]) -> None:
+        """
+        Print progress line.
+
+        :param typing.Dict[str, int] statistics: Warmup statistics of resolver.
+        """
+
+        elapsed: float = time.monotonic() - self.start
+        processed: int = statistics["requested"] + statistics["failed"]
+        done: int = processed + statistics["cached"]
+        remaining: int = statistics["total"] - done
+
+        throughput: float = processed / elapsed if elapsed > 0 else 0.0
+        eta: str = format_duration(remaining / throughput) if throughput > 0 else "-"
+
+        self.stream.write(
+            f"\r{done}/{statistics['total']} files ({statistics['cached']} cached, {statistics['failed']} failed) " \
+            f"{throughput:.1f} files/s, ETA {eta}   "
+        )
+
+        if remaining == 0:
+            self.stream.write("\n")
+
+        self.stream.flush()
+
+
+
+def warmup(args: argparse.Namespace) -> int:
+    """
+    Run cache warmup command.
+
+    :param argparse.Namespace args: Parsed command line arguments.
+    :return: Exit code.
+    :rtype: int
+    """
+
+    storage: Storage = Storage(cachedir=args.cache)
+
+    # Rate limit is shared by all warmup processes using the same cache folder
+    resolver: Resolver = Resolver(
+        cache=storage,
+        rate_limiter=FileRateLimiter(
+            path=os.path.join(storage.cachedir, RATE_LIMIT_FILENAME),
+            rate=args.rate,
+        ) if args.rate is not None else None,
+    )
+
+    try:
+        statistics, errors = resolver.warmup(
+            organism=args.organism,
+            max_workers=args.workers,
+            progress=None if args.quiet else WarmupProgress(),
+        )
+    finally:
+        resolver.close()
+
+    for filename, error in errors.items():
+        print(f"Failed to load '{filename}': {error}", file=sys.stderr)
+
+    print(
+        f"Cache of organism '{args.organism}' contains {statistics['total'] - statistics['failed']}/" \
+        f"{statistics['total']} files ({statistics['requested']} requested)."
+    )
+
+    return 0 if len(errors) == 0 else 1
+
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Entry point of command line interface.
+
+    :param typing.Optional[typing.List[str]] argv: Command line arguments. Fallback to arguments of process.
+    :return: Exit code.
+    :rtype: int
+    """
+
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(prog="keggtools", description=__doc__)
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    warmup_parser: argparse.ArgumentParser = subparsers.add_parser(
+        "warmup",
+        help="Download all pathways and lists of an organism into cache. Interrupted runs are resumed.",
+    )
+    warmup_parser.add_argument("organism", help="3 letter organism code used by KEGG database.")
+    warmup_parser.add_argument("--cache", default=None, help="Cache directory. Fallback to default cache directory.")
+    warmup_parser.add_argument("--workers", type=int, default=8, help="Number of concurrent requests.")
+    warmup_parser.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        help="Maximal number of requests per second of all processes using the cache.",
+    )
+    warmup_parser.add_argument("--quiet", action="store_true", help="Do not print progress.")
+    warmup_parser.set_defaults(func=warmup)
+
+    args: argparse.Namespace = parser.parse_args(argv)
+
+    try:
+        exit_code: int = args.func(args)
+    except KeyboardInterrupt:
+        print("\nInterrupted. Run command again to resume.", file=sys.stderr)
+        return 130
+
+    return exit_code
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,721 @@
+""" Graph view of pathway relations with integer indexed adjacency arrays """
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .const import RELATION_SUBTYPES, RELATION_TYPES
+from .models import Pathway, Relation
+
+
+# Directions of graph traversal
+DIRECTIONS = ("out", "in", "both")
+
+# Relation subtypes with positive and negative sign of signal propagation
+POSITIVE_SUBTYPES = ("activation", "expression")
+NEGATIVE_SUBTYPES = ("inhibition", "repression")
+
+
+
+def get_type_mask(types: Iterable[str]) -> int:
+    """
+    Build bit mask of relation types. Bit positions follow list of valid relation types.
+
+    :param typing.Iterable[str] types: Relation types (e.g. "PPrel").
+    :return: Bit mask of types.
+    :rtype: int
+    :raises ValueError: Error if type is not a valid relation type.
+    """
+
+    mask: int = 0
+
+    for relation_type in types:
+        if relation_type not in RELATION_TYPES:
+            raise ValueError(f"Relation type '{relation_type}' not in list of valid types.")
+
+        mask |= 1 << RELATION_TYPES.index(relation_type)
+
+    return mask
+
+
+
+def get_subtype_mask(subtypes: Iterable[str]) -> int:
+    """
+    Build bit mask of relation subtypes. Bit positions follow list of valid relation subtypes.
+
+    :param typing.Iterable[str] subtypes: Relation subtype names (e.g. "activation").
+    :return: Bit mask of subtypes.
+    :rtype: int
+    :raises ValueError: Error if name is not a valid relation subtype.
+    """
+
+    mask: int = 0
+
+    for name in subtypes:
+        if name not in RELATION_SUBTYPES:
+            raise ValueError(f"Name of relation subtype '{name}' is not in list of valid subtypes.")
+
+        mask |= 1 << RELATION_SUBTYPES.index(name)
+
+    return mask
+
+
+
+def build_csr(node_count: int, keys: array, values: array) -> Tuple[array, array, array]:
+    """
+    Build compressed sparse row arrays from edge list with counting sort. Edges of a node keep their order.
+
+    :param int node_count: Number of nodes.
+    :param array.array keys: Node index of row of each edge.
+    :param array.array values: Node index of column of each edge.
+    :return: Offsets of rows (length node_count + 1), column node of each slot and edge index of each slot.
+    :rtype: typing.Tuple[array.array, array.array, array.array]
+    """
+
+    offsets: array = array("l", [0]) * (node_count + 1)
+
+    for key in keys:
+        offsets[key + 1] += 1
+
+    for index in range(node_count):
+        offsets[index + 1] += offsets[index]
+
+    position: array = offsets[:-1]
+    nodes: array = array("l", [0]) * len(keys)
+    edges: array = array("l", [0]) * len(keys)
+
+    for edge, (key, value) in enumerate(zip(keys, values)):
+        slot: int = position[key]
+        nodes[slot] = value
+        edges[slot] = edge
+        position[key] = slot + 1
+
+    return offsets, nodes, edges
+
+
+
+# Bit masks of signed subtypes
+POSITIVE_MASK: int = get_subtype_mask(POSITIVE_SUBTYPES)
+NEGATIVE_MASK: int = get_subtype_mask(NEGATIVE_SUBTYPES)
+
+
+
+class PathwayGraph:
+    """
+    Directed graph of pathway relations. Nodes are integer indexed entry ids, edges are relations. Successors and
+    predecessors are stored as compressed sparse row (CSR) arrays, relation types and subtypes as bit masks per edge.
+    All traversals run in linear time of nodes and edges.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, pathway: Pathway) -> None:
+        """
+        Init PathwayGraph instance from entries and relations of pathway. Entry ids of relations that are missing in
+        entries are added as nodes.
+
+        :param Pathway pathway: Pathway instance.
+        """
+
+        # Nodes in order of entries
+        self.nodes: List[str] = []
+        self.node_index: Dict[str, int] = {}
+
+        for entry in pathway.entries:
+            self._add_node(entry.id)
+
+        # Edge arrays, indexed by position of relation
+        self.relations: List[Relation] = list(pathway.relations)
+        self.edge_source: array = array("l")
+        self.edge_target: array = array("l")
+        self.edge_type: array = array("L")
+        self.edge_subtypes: array = array("L")
+        self.edge_sign: array = array("b")
+
+        for relation in self.relations:
+            self.edge_source.append(self._add_node(relation.entry1))
+            self.edge_target.append(self._add_node(relation.entry2))
+
+            # Unknown types of trusted input have an empty mask
+            self.edge_type.append(
+                1 << RELATION_TYPES.index(relation.type) if relation.type in RELATION_TYPES else 0
+            )
+
+            subtype_mask: int = 0
+            for subtype in relation.subtypes:
+                if subtype.name in RELATION_SUBTYPES:
+                    subtype_mask |= 1 << RELATION_SUBTYPES.index(subtype.name)
+
+            self.edge_subtypes.append(subtype_mask)
+
+            # Relations without or with contradicting signed subtypes are unsigned
+            positive: bool = bool(subtype_mask & POSITIVE_MASK)
+            negative: bool = bool(subtype_mask & NEGATIVE_MASK)
+            self.edge_sign.append(1 if positive and not negative else -1 if negative and not positive else 0)
+
+        node_count: int = len(self.nodes)
+
+        self.succ_offsets, self.succ_nodes, self.succ_edges = build_csr(
+            node_count=node_count, keys=self.edge_source, values=self.edge_target,
+        )
+        self.pred_offsets, self.pred_nodes, self.pred_edges = build_csr(
+            node_count=node_count, keys=self.edge_target, values=self.edge_source,
+        )
+
+        self.out_degree: array = array("l", (self.succ_offsets[index + 1] - self.succ_offsets[index]
+            for index in range(node_count)))
+        self.in_degree: array = array("l", (self.pred_offsets[index + 1] - self.pred_offsets[index]
+            for index in range(node_count)))
+
+
+    def _add_node(self, entry_id: str) -> int:
+        """
+        Get index of node and add node if it does not exist.
+
+        :param str entry_id: Entry id of node.
+        :return: Index of node.
+        :rtype: int
+        """
+
+        index: Optional[int] = self.node_index.get(entry_id)
+
+        if index is None:
+            index = len(self.nodes)
+            self.node_index[entry_id] = index
+            self.nodes.append(entry_id)
+
+        return index
+
+
+    def __len__(self) -> int:
+        """
+        Number of nodes.
+
+        :rtype: int
+        """
+
+        return len(self.nodes)
+
+
+    @property
+    def edge_count(self) -> int:
+        """
+        Number of edges.
+
+        :rtype: int
+        """
+
+        return len(self.relations)
+
+
+    def get_index(self, entry_id: str) -> int:
+        """
+        Get index of node by entry id.
+
+        :param str entry_id: Entry id of node.
+        :return: Index of node.
+        :rtype: int
+        :raises KeyError: Error if entry id is not a node of graph.
+        """
+
+        index: Optional[int] = self.node_index.get(entry_id)
+
+        if index is None:
+            raise KeyError(f"Entry '{entry_id}' is not a node of pathway graph.")
+
+        return index
+
+
+    def degree(self, entry_id: str) -> int:
+        """
+        Get number of incoming and outgoing edges of node.
+
+        :param str entry_id: Entry id of node.
+        :return: Degree of node. Nodes that are not in graph have degree 0.
+        :rtype: int
+        """
+
+        index: Optional[int] = self.node_index.get(entry_id)
+
+        if index is None:
+            return 0
+
+        degree: int = self.out_degree[index] + self.in_degree[index]
+        return degree
+
+
+    def iter_adjacent(
+        self,
+        index: int,
+        direction: str = "out",
+        type_mask: int = 0,
+        subtype_mask: int = 0,
+        ) -> Iterator[Tuple[int, int]]:
+        """
+        Iterate adjacent nodes of node index with edges matching masks. An empty mask matches all edges.
+
+        :param int index: Index of node.
+        :param str direction: Follow outgoing ("out"), incoming ("in") or all ("both") edges.
+        :param int type_mask: Bit mask of relation types (see `get_type_mask`).
+        :param int subtype_mask: Bit mask of relation subtypes (see `get_subtype_mask`).
+        :return: Iterator of tuples of adjacent node index and edge index.
+        :rtype: typing.Iterator[typing.Tuple[int, int]]
+        """
+
+        if direction not in DIRECTIONS:
+            raise ValueError(f"Direction '{direction}' is not in {DIRECTIONS}.")
+
+        csr: List[Tuple[array, array, array]] = []
+
+        if direction in ("out", "both"):
+            csr.append((self.succ_offsets, self.succ_nodes, self.succ_edges))
+
+        if direction in ("in", "both"):
+            csr.append((self.pred_offsets, self.pred_nodes, self.pred_edges))
+
+        for offsets, nodes, edges in csr:
+            for slot in range(offsets[index], offsets[index + 1]):
+                edge: int = edges[slot]
+
+                if type_mask and not self.edge_type[edge] & type_mask:
+                    continue
+
+                if subtype_mask and not self.edge_subtypes[edge] & subtype_mask:
+                    continue
+
+                yield nodes[slot], edge
+
+
+    def neighbors(
+        self,
+        entry_id: str,
+        direction: str = "out",
+        types: Optional[Iterable[str]] = None,
+        subtypes: Optional[Iterable[str]] = None,
+        ) -> List[str]:
+        """
+        Get unique adjacent entry ids of node in order of relations.
+
+        :param str entry_id: Entry id of node.
+        :param str direction: Follow outgoing ("out"), incoming ("in") or all ("both") edges.
+        :param typing.Optional[typing.Iterable[str]] types: Only follow relations of these types.
+        :param typing.Optional[typing.Iterable[str]] subtypes: Only follow relations with any of these subtypes.
+        :return: List of entry ids.
+        :rtype: typing.List[str]
+        """
+
+        result: Dict[int, None] = {}
+
+        for node, _ in self.iter_adjacent(
+            index=self.get_index(entry_id),
+            direction=direction,
+            type_mask=get_type_mask(types or ()),
+            subtype_mask=get_subtype_mask(subtypes or ()),
+        ):
+            result[node] = None
+
+        return [self.nodes[node] for node in result]
+
+
+    def successors(
+        self,
+        entry_id: str,
+        types: Optional[Iterable[str]] = None,
+        subtypes: Optional[Iterable[str]] = None,
+        ) -> List[str]:
+        """
+        Get unique entry ids of targets of outgoing relations.
+
+        :param str entry_id: Entry id of node.
+        :param typing.Optional[typing.Iterable[str]] types: Only follow relations of these types.
+        :param typing.Optional[typing.Iterable[str]] subtypes: Only follow relations with any of these subtypes.
+        :rtype: typing.List[str]
+        """
+
+        return self.neighbors(entry_id=entry_id, direction="out", types=types, subtypes=subtypes)
+
+
+    def predecessors(
+        self,
+        entry_id: str,
+        types: Optional[Iterable[str]] = None,
+        subtypes: Optional[Iterable[str]] = None,
+        ) -> List[str]:
+        """
+        Get unique entry ids of sources of incoming relations.
+
+        :param str entry_id: Entry id of node.
+        :param typing.Optional[typing.Iterable[str]] types: Only follow relations of these types.
+        :param typing.Optional[typing.Iterable[str]] subtypes: Only follow relations with any of these subtypes.
+        :rtype: typing.List[str]
+        """
+
+        return self.neighbors(entry_id=entry_id, direction="in", types=types, subtypes=subtypes)
+
+
+    def bfs(
+        self,
+        entry_id: str,
+        direction: str = "out",
+        types: Optional[Iterable[str]] = None,
+        subtypes: Optional[Iterable[str]] = None,
+        max_depth: Optional[int] = None,
+        ) -> Dict[str, int]:
+        """
+        Breadth first search of reachable nodes.
+
+        :param str entry_id: Entry id of start node.
+        :param str direction: Follow outgoing ("out"), incoming ("in") or all ("both") edges.
+        :param typing.Optional[typing.Iterable[str]] types: Only follow relations of these types.
+        :param typing.Optional[typing.Iterable[str]] subtypes: Only follow relations with any of these subtypes.
+        :param typing.Optional[int] max_depth: Maximal number of steps. Fallback to unlimited.
+        :return: Dict of reachable entry ids to number of steps, in order of visit. Start node has depth 0.
+        :rtype: typing.Dict[str, int]
+        """
+
+        return self.k_hop(
+            sources=[entry_id], k=max_depth, direction=direction, types=types, subtypes=subtypes,
+        )[entry_id]
+
+
+    def k_hop(
+        self,
+        sources: Iterable[str],
+        k: Optional[int],
+        direction: str = "out",
+        types: Optional[Iterable[str]] = None,
+        subtypes: Optional[Iterable[str]] = None,
+        ) -> Dict[str, Dict[str, int]]:
+        """
+        Batched breadth first search of nodes within k steps of each source (e.g. downstream or upstream genes). The
+        visited state is kept in arrays, which are reused for all sources.
+
+        :param typing.Iterable[str] sources: Entry ids of start nodes.
+        :param typing.Optional[int] k: Maximal number of steps. Set to None for unlimited steps.
+        :param str direction: Follow outgoing ("out"), incoming ("in") or all ("both") edges.
+        :param typing.Optional[typing.Iterable[str]] types: Only follow relations of these types.
+        :param typing.Optional[typing.Iterable[str]] subtypes: Only follow relations with any of these subtypes.
+        :return: Dict of source to dict of reachable entry ids to number of steps, in order of visit. Sources have
+            depth 0.
+        :rtype: typing.Dict[str, typing.Dict[str, int]]
+        """
+        # pylint: disable=too-many-locals
+
+        if k is not None and k < 0:
+            raise ValueError("Number of steps must not be negative.")
+
+        type_mask: int = get_type_mask(types or ())
+        subtype_mask: int = get_subtype_mask(subtypes or ())
+
+        # Node is visited in search of source if stamp matches number of source
+        stamp: array = array("l", [-1]) * len(self.nodes)
+        depth: array = array("l", [0]) * len(self.nodes)
+        result: Dict[str, Dict[str, int]] = {}
+
+        for mark, source in enumerate(dict.fromkeys(sources)):
+            start: int = self.get_index(source)
+            stamp[start] = mark
+            depth[start] = 0
+
+            # Visited list is used as queue
+            visited: List[int] = [start]
+            position: int = 0
+
+            while position < len(visited):
+                index: int = visited[position]
+                position += 1
+
+                if k is not None and depth[index] >= k:
+                    continue
+
+                for node, _ in self.iter_adjacent(index, direction, type_mask, subtype_mask):
+                    if stamp[node] != mark:
+                        stamp[node] = mark
+                        depth[node] = depth[index] + 1
+                        visited.append(node)
+
+            result[source] = {self.nodes[index]: depth[index] for index in visited}
+
+        return result
+
+
+    def _signed_search(
+        self,
+        start: int,
+        direction: str,
+        k: Optional[int],
+        type_mask: int,
+        include_unsigned: bool,
+        state: Tuple[array, array, array],
+        mark: int,
+        ) -> List[int]:
+        """
+        Breadth first search over states of node and sign of path. State of node index with positive path is
+        `2 * index`, with negative path `2 * index + 1`.
+
+        :param int start: Index of start node.
+        :param str direction: Follow outgoing ("out") or incoming ("in") edges.
+        :param typing.Optional[int] k: Maximal number of steps or None.
+        :param int type_mask: Bit mask of relation types.
+        :param bool include_unsigned: Follow relations without sign and keep sign of path.
+        :param typing.Tuple[array.array, array.array, array.array] state: Arrays of stamp, depth and parent state.
+        :param int mark: Stamp of current search.
+        :return: Visited states in order of visit.
+        :rtype: typing.List[int]
+        """
+        # pylint: disable=too-many-locals
+
+        if direction not in ("out", "in"):
+            raise ValueError(f"Direction '{direction}' is not in ('out', 'in').")
+
+        stamp, depth, parent = state
+
+        stamp[2 * start] = mark
+        depth[2 * start] = 0
+        parent[2 * start] = -1
+
+        # Visited list is used as queue
+        visited: List[int] = [2 * start]
+        position: int = 0
+
+        while position < len(visited):
+            current: int = visited[position]
+            position += 1
+
+            if k is not None and depth[current] >= k:
+                continue
+
+            for node, edge in self.iter_adjacent(current >> 1, direction, type_mask):
+                sign: int = self.edge_sign[edge]
+
+                if sign == 0 and not include_unsigned:
+                    continue
+
+                following: int = 2 * node + ((current & 1) ^ (1 if sign < 0 else 0))
+
+                if stamp[following] != mark:
+                    stamp[following] = mark
+                    depth[following] = depth[current] + 1
+                    parent[following] = current
+                    visited.append(following)
+
+        return visited
+
+
+    def _signed_state(self) -> Tuple[array, array, array]:
+        """
+        Allocate arrays of stamp, depth and parent for signed searches.
+
+        :rtype: typing.Tuple[array.array, array.array, array.array]
+        """
+
+        size: int = 2 * len(self.nodes)
+        return array("l", [-1]) * size, array("l", [0]) * size, array("l", [-1]) * size
+
+
+    def signed_k_hop(
+        self,
+        sources: Iterable[str],
+        k: Optional[int] = None,
+        direction: str = "out",
+        types: Optional[Iterable[str]] = None,
+        include_unsigned: bool = False,
+        ) -> Dict[str, Dict[str, Dict[int, int]]]:
+        """
+        Batched signal propagation from each source. Relations with activating subtypes have positive sign,
+        relations with inhibiting subtypes negative sign (see `POSITIVE_SUBTYPES` and `NEGATIVE_SUBTYPES`). The sign
+        of a path is the product of its relation signs.
+
+        :param typing.Iterable[str] sources: Entry ids of start nodes.
+        :param typing.Optional[int] k: Maximal number of steps. Fallback to unlimited.
+        :param str direction: Propagate downstream ("out") or upstream ("in").
+        :param typing.Optional[typing.Iterable[str]] types: Only follow relations of these types.
+        :param bool include_unsigned: Follow relations without or with contradicting sign and keep sign of path.
+        :return: Dict of source to dict of reached entry ids to dict of path sign (1 or -1) to number of steps of
+            shortest path with this sign. Sources are reached with sign 1 in 0 steps.
+        :rtype: typing.Dict[str, typing.Dict[str, typing.Dict[int, int]]]
+        """
+
+        if k is not None and k < 0:
+            raise ValueError("Number of steps must not be negative.")
+
+        type_mask: int = get_type_mask(types or ())
+        state: Tuple[array, array, array] = self._signed_state()
+        result: Dict[str, Dict[str, Dict[int, int]]] = {}
+
+        for mark, source in enumerate(dict.fromkeys(sources)):
+            reached: Dict[str, Dict[int, int]] = {}
+
+            for current in self._signed_search(
+                start=self.get_index(source),
+                direction=direction,
+                k=k,
+                type_mask=type_mask,
+                include_unsigned=include_unsigned,
+                state=state,
+                mark=mark,
+            ):
+                reached.setdefault(self.nodes[current >> 1], {})[-1 if current & 1 else 1] = state[1][current]
+
+            result[source] = reached
+
+        return result
+
+
+    def signed_shortest_path(
+        self,
+        source: str,
+        target: str,
+        sign: Optional[int] = None,
+        direction: str = "out",
+        types: Optional[Iterable[str]] = None,
+        include_unsigned: bool = False,
+        ) -> Optional[Tuple[int, List[str]]]:
+        """
+        Find shortest signed path from source to target. See `signed_k_hop` for signs of relations.
+
+        :param str source: Entry id of start node.
+        :param str target: Entry id of target node.
+        :param typing.Optional[int] sign: Required sign of path (1 or -1). Fallback to shortest path of any sign.
+        :param str direction: Follow relations downstream ("out") or upstream ("in").
+        :param typing.Optional[typing.Iterable[str]] types: Only follow relations of these types.
+        :param bool include_unsigned: Follow relations without or with contradicting sign and keep sign of path.
+        :return: Tuple of sign of path and entry ids along path from source to target. None if target is not
+            reachable.
+        :rtype: typing.Optional[typing.Tuple[int, typing.List[str]]]
+        """
+
+        if sign not in (None, 1, -1):
+            raise ValueError("Sign of path must be 1, -1 or None.")
+
+        target_index: int = self.get_index(target)
+        state: Tuple[array, array, array] = self._signed_state()
+
+        for current in self._signed_search(
+            start=self.get_index(source),
+            direction=direction,
+            k=None,
+            type_mask=get_type_mask(types or ()),
+            include_unsigned=include_unsigned,
+            state=state,
+            mark=0,
+        ):
+            if current >> 1 != target_index or (sign is not None and sign != (-1 if current & 1 else 1)):
+                continue
+
+            # States are visited in order of depth, so first match is shortest path
+            path: List[str] = []
+            step: int = current
+
+            while step != -1:
+                path.append(self.nodes[step >> 1])
+                step = state[2][step]
+
+            return -1 if current & 1 else 1, path[::-1]
+
+        return None
+
+
+    def dfs(
+        self,
+        entry_id: str,
+        direction: str = "out",
+        types: Optional[Iterable[str]] = None,
+        subtypes: Optional[Iterable[str]] = None,
+        ) -> List[str]:
+        """
+        Depth first search of reachable nodes. Search is iterative, so deep graphs do not hit the recursion limit.
+
+        :param str entry_id: Entry id of start node.
+        :param str direction: Follow outgoing ("out"), incoming ("in") or all ("both") edges.
+        :param typing.Optional[typing.Iterable[str]] types: Only follow relations of these types.
+        :param typing.Optional[typing.Iterable[str]] subtypes: Only follow relations with any of these subtypes.
+        :return: Reachable entry ids in preorder, starting with start node.
+        :rtype: typing.List[str]
+        """
+
+        type_mask: int = get_type_mask(types or ())
+        subtype_mask: int = get_subtype_mask(subtypes or ())
+
+        visited: bytearray = bytearray(len(self.nodes))
+        order: List[str] = []
+        stack: List[Iterator[Tuple[int, int]]] = []
+
+        start: int = self.get_index(entry_id)
+        visited[start] = 1
+        order.append(self.nodes[start])
+        stack.append(self.iter_adjacent(start, direction, type_mask, subtype_mask))
+
+        while stack:
+            for node, _ in stack[-1]:
+                if not visited[node]:
+                    visited[node] = 1
+                    order.append(self.nodes[node])
+                    stack.append(self.iter_adjacent(node, direction, type_mask, subtype_mask))
+                    break
+            else:
+                stack.pop()
+
+        return order
+
+
+    def is_reachable(
+        self,
+        source: str,
+        target: str,
+        types: Optional[Iterable[str]] = None,
+        subtypes: Optional[Iterable[str]] = None,
+        ) -> bool:
+        """
+        Check if target is reachable from source along outgoing relations.
+
+        :param str source: Entry id of start node.
+        :param str target: Entry id of target node.
+        :param typing.Optional[typing.Iterable[str]] types: Only follow relations of these types.
+        :param typing.Optional[typing.Iterable[str]] subtypes: Only follow relations with any of these subtypes.
+        :rtype: bool
+        """
+
+        return target in self.bfs(entry_id=source, direction="out", types=types, subtypes=subtypes)
+
+
+    def connected_components(
+        self,
+        types: Optional[Iterable[str]] = None,
+        subtypes: Optional[Iterable[str]] = None,
+        ) -> List[List[str]]:
+        """
+        Get weakly connected components, ignoring direction of relations. Nodes without relations form single node
+        components.
+
+        :param typing.Optional[typing.Iterable[str]] types: Only follow relations of these types.
+        :param typing.Optional[typing.Iterable[str]] subtypes: Only follow relations with any of these subtypes.
+        :return: List of components as lists of entry ids, in order of first node.
+        :rtype: typing.List[typing.List[str]]
+        """
+
+        type_mask: int = get_type_mask(types or ())
+        subtype_mask: int = get_subtype_mask(subtypes or ())
+
+        visited: bytearray = bytearray(len(self.nodes))
+        components: List[List[str]] = []
+
+        for start in range(len(self.nodes)):
+            if visited[start]:
+                continue
+
+            visited[start] = 1
+            component: List[int] = [start]
+
+            # Component list is used as queue
+            position: int = 0
+
+            while position < len(component):
+                for node, _ in self.iter_adjacent(component[position], "both", type_mask, subtype_mask):
+                    if not visited[node]:
+                        visited[node] = 1
+                        component.append(node)
+
+                position += 1
+
+            components.append([self.nodes[index] for index in component])
+
+        return components
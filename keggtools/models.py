@@ -1,1154 +1,2102 @@
-""" KEGG pathway models to parse object relational """
-# pylint: disable=invalid-name,redefined-builtin,too-many-lines
-
-
-# from warnings import warn
-from datetime import datetime
-from xml.etree import ElementTree
-from xml.etree.ElementTree import Element
-from typing import List, Union, Optional
-
-from .const import (
-    REACTION_TYPE,
-    RELATION_TYPES,
-    RELATION_SUBTYPES,
-    ENTRY_TYPE,
-    GRAPHIC_TYPE,
-)
-
-from .utils import (
-    get_attribute,
-    get_numeric_attribute,
-    parse_xml,
-    is_valid_pathway_number,
-    is_valid_hex_color,
-    is_valid_pathway_name,
-    is_valid_pathway_org,
-)
-
-
-
-
-class Subtype:
-    """
-    Subtype model class.
-    """
-
-    def __init__(
-        self,
-        name: str,
-        value: str,
-    ) -> None:
-        """
-        Init Subtype model instance.
-
-        :param str name: Name of subtype. Must match list of valid subtypes.
-        :param str value: Value of subtype.
-        """
-
-        # check for valid subtype names in RELATION_SUBTYPES
-        if name not in RELATION_SUBTYPES:
-            raise ValueError(f"Name of relation subtype '{name}' is not in list of valid subtypes.")
-
-        self.name: str = name
-        self.value: str = value
-
-
-
-    @staticmethod
-    def parse(item: Element) -> "Subtype":
-        """
-        Parse Subtype XML element.
-
-        :param xml.etree.ElementTree.Element item: XML element.
-        :return: Parsed Subtype instance.
-        :rtype: Subtype
-        """
-
-        # check correct type
-        assert item.tag == "subtype"
-
-        # Generate and return subtype instance
-        return Subtype(
-            name=get_attribute(element=item, key="name"),
-            value=get_attribute(element=item, key="value")
-        )
-
-
-    def to_xml(self) -> Element:
-        """
-        Generate XML string from Subtype element.
-
-        :return: XML string.
-        :rtype: xml.etree.ElementTree.Element
-        """
-
-        return Element(
-            "subtype",
-            attrib={
-                "name": self.name,
-                "value": self.value
-            },
-        )
-
-
-    def __str__(self) -> str:
-        """
-        Generate string from Subtype instance.
-
-        :return: String of Subtype instance.
-        :rtype: str
-        """
-        return f"<Subtype name='{self.name}' value='{self.value}'>"
-
-
-
-
-
-
-class Relation:
-    """
-    Relation model class.
-    """
-
-    def __init__(
-        self,
-        entry1: str,
-        entry2: str,
-        type: str,
-    ) -> None:
-        """
-        Init relation model instance.
-
-        :param str entry1: Source entry of relation.
-        :param str entry2: Destination entry of relation.
-        :param str type: Type of Relation. Must be contained in list of valid relation types.
-        """
-
-        # Check if type is in valid relation types
-        if type not in RELATION_TYPES:
-            raise ValueError(f"Relation type '{type}' not in list of valid types.")
-
-        self.entry1: str = entry1
-        self.entry2: str = entry2
-        self.type: str = type
-        self.subtypes: List[Subtype] = []
-
-
-    @staticmethod
-    def parse(item: Element) -> "Relation":
-        """
-        Parse XML element into Relation instance.
-
-        :param xml.etree.ElementTree.Element item: XML element to parse.
-        :return: Relation instance.
-        :rtype: Relation
-        """
-
-        # Check tag of relation is correct
-        assert item.tag == "relation"
-
-
-        # Create relation instance from attributes
-        relation: Relation = Relation(
-            entry1=get_numeric_attribute(element=item, key="entry1"),
-            entry2=get_numeric_attribute(element=item, key="entry2"),
-            type=get_attribute(element=item, key="type"),
-        )
-
-
-        # Parse Child items of xml element by iterating of child elements
-        for child in item:
-            relation.subtypes.append(Subtype.parse(item=child))
-
-
-        return relation
-
-
-    def to_xml(self) -> Element:
-        """
-        Generate XML string from Relation element.
-
-        :return: XML string.
-        :rtype: xml.etree.ElementTree.Element
-        """
-
-        return Element(
-            "relation",
-            attrib={
-                "entry1": self.entry1,
-                "entry2": self.entry2,
-                "type": self.type,
-            },
-        )
-
-    def __str__(self) -> str:
-        """
-        Generate string from relation instance.
-
-        :return: String of Relation instance.
-        :rtype: str
-        """
-        return f"<Relation {self.entry1}->{self.entry2} type='{self.type}'>"
-
-
-
-
-class Component:
-    """
-    Component model.
-    """
-
-    def __init__(self, id: str) -> None:
-        """
-        Init Component model.
-
-        :param str id: Id of component.
-        """
-
-        # id can't be empty
-        if id == "":
-            raise ValueError("Component id can't be empty.")
-
-
-        # TODO: Check pattern of component id
-        # TODO: component id should reference an existing entry !
-
-        self.id: str = id
-
-
-    @staticmethod
-    def parse(item: Element) -> "Component":
-        """
-        Parsing ElementTree into Component.
-
-        :param xml.etree.ElementTree.Element item: XML element to parse.
-        :return: Parsed Component instance.
-        :rtype: Component
-        """
-
-        # Check for correct xml tag
-        assert item.tag == "component"
-
-        # Create component instance from id attribute
-        return Component(id=get_attribute(element=item, key="id"))
-
-
-    def to_xml(self) -> Element:
-        """
-        Generate XML string from Component element.
-
-        :return: XML string.
-        :rtype: xml.etree.ElementTree.Element
-        """
-
-        return Element(
-            "component",
-            attrib={
-                "id": self.id,
-            },
-        )
-
-
-    def __str__(self) -> str:
-        """
-        Build string of component instance.
-
-        :return: String of Component instance.
-        :rtype: str
-        """
-        return f"<Component id='{self.id}'>"
-
-
-
-class Graphics:
-    """
-    Graphics information for rendering.
-    """
-
-    def __init__(
-        self,
-        x: Optional[str] = None,
-        y: Optional[str] = None,
-        width: Optional[str] = None,
-        height: Optional[str] = None,
-        coords: Optional[str] = None,
-        name: Optional[str] = None,
-        type: Optional[str] = None,
-        fgcolor: Optional[str] = None,
-        bgcolor: Optional[str] = None,
-    ) -> None:
-        """
-        Init Graphics model instance.
-
-        :param typing.Optional[str] x:
-        :param typing.Optional[str] y:
-        :param typing.Optional[str] width:
-        :param typing.Optional[str] height:
-        :param typing.Optional[str] coords:
-        :param typing.Optional[str] name:
-        :param typing.Optional[str] type:
-        :param typing.Optional[str] fgcolor:
-        :param typing.Optional[str] bgcolor:
-        """
-
-        # All parameter are implied (optional)
-        self.x: Optional[str] = x
-        self.y: Optional[str] = y
-        self.width: Optional[str] = width
-        self.height: Optional[str] = height
-        self.coords: Optional[str] = coords
-        self.name: Optional[str] = name
-        self.type: Optional[str] = type
-        self.fgcolor: Optional[str] = fgcolor
-        self.bgcolor: Optional[str] = bgcolor
-
-
-        # Validate parameter if not None
-
-        # Check type is in list of valid types
-        if self.type is not None and self.type not in GRAPHIC_TYPE:
-            raise ValueError(f"Type '{self.type}' is not a valid graphics type.")
-
-        # Check foreground and background color are hex format
-        if self.fgcolor is not None and is_valid_hex_color(value=self.fgcolor) is False:
-            raise ValueError("Fgcolor is not a valid hex color.")
-
-        if self.bgcolor is not None and is_valid_hex_color(value=self.bgcolor) is False:
-            raise ValueError("Bgcolor is not a valid hex color.")
-
-
-        # Check x,y,width and height are numeric (only if not None)
-        if self.x is not None and str.isdigit(self.x) is False:
-            raise ValueError("Value x is not a number.")
-
-        if self.y is not None and str.isdigit(self.y) is False:
-            raise ValueError("Value y is not a number.")
-
-        if self.width is not None and str.isdigit(self.width) is False:
-            raise ValueError("Value width is not a number.")
-
-        if self.height is not None and str.isdigit(self.height) is False:
-            raise ValueError("Value height is not a number.")
-
-
-    @staticmethod
-    def parse(item: Element) -> "Graphics":
-        """
-        Parse XML element into Graphics instance.
-
-        :param xml.etree.ElementTree.Element item: XML element to parse.
-        :return: Parsed Graphics instance.
-        :rtype: Graphics
-        """
-
-        # Check xml tag
-        assert item.tag == "graphics"
-
-        # Parse attributes from XML element
-        return Graphics(
-            x = item.attrib.get("x"),
-            y = item.attrib.get("y"),
-            width = item.attrib.get("width"),
-            height = item.attrib.get("height"),
-            name = item.attrib.get("name"),
-            type = item.attrib.get("type"),
-            fgcolor = item.attrib.get("fgcolor"),
-            bgcolor = item.attrib.get("bgcolor"),
-            coords = item.attrib.get("coords"),
-        )
-
-
-    def to_xml(self) -> Element:
-        """
-        Generate XML string from Graphics element.
-
-        :return: XML string.
-        :rtype: xml.etree.ElementTree.Element
-        """
-
-        graphics_element: Element = Element(
-            "graphics",
-        )
-
-        if self.x is not None:
-            graphics_element.attrib["x"] = self.x
-
-        if self.y is not None:
-            graphics_element.attrib["y"] = self.y
-
-        if self.width is not None:
-            graphics_element.attrib["width"] = self.width
-
-        if self.height is not None:
-            graphics_element.attrib["height"] = self.height
-
-        if self.name is not None:
-            graphics_element.attrib["name"] = self.name
-
-        if self.type is not None:
-            graphics_element.attrib["type"] = self.type
-
-        if self.fgcolor is not None:
-            graphics_element.attrib["fgcolor"] = self.fgcolor
-
-        if self.bgcolor is not None:
-            graphics_element.attrib["bgcolor"] = self.bgcolor
-
-        if self.coords is not None:
-            graphics_element.attrib["coords"] = self.coords
-
-        return graphics_element
-
-
-    def __str__(self) -> str:
-        """
-        Return Graphics instance summary string.
-
-        :return: String of Graphics instance.
-        :rtype: str
-        """
-        return f"<Graphics name='{self.name}'>"
-
-
-
-class Entry:
-    """
-    Entry model class.
-    """
-
-    def __init__(
-        self,
-        id: str,
-        name: str,
-        type: str,
-        link: Optional[str] = None,
-        reaction: Optional[str] = None,
-    ) -> None:
-        """
-        Init entry model instance.
-
-        :param str id: Id of Entry.
-        :param str name: Name of Entry.
-        :param str type: Type of Entry. Must be contained in list of valid entry types.
-        :param typing.Optional[str] link: Link to KEGG database with reference to entry.
-        :param typing.Optional[str] reaction: Reaction TODO: specify. Is str format correct?
-        """
-
-        # required
-        self.id: str = id
-        self.name: str = name
-        self.type: str = type
-
-        # TODO: validate entry id and name
-
-
-        if self.type not in ENTRY_TYPE:
-            raise ValueError(f"Type '{self.type}' is not in list of valid entry types.")
-
-
-        # optional (implied)
-        self.link: Optional[str] = link
-        self.reaction: Optional[str] = reaction
-
-        # TODO: validate reaction if not None
-
-
-        # Implied child instances
-        self.graphics: Optional[Graphics] = None
-        self.components: List[Component] = []
-
-
-    @property
-    def has_multiple_names(self) -> bool:
-        """
-        Checks if entry has multiple names that are space seperated.
-
-        :return: Retruns True if entry has multiple names.
-        :rtype: bool
-        """
-
-        return len(self.name.split(" ")) > 1
-
-
-
-    @staticmethod
-    def parse(item: Element) -> "Entry":
-        """
-        Parsing XML element into Entry instance.
-
-        :param xml.etree.ElementTree.Element item: XML element to parse.
-        :return: Parsed Entry instance.
-        :rtype: Entry
-        """
-
-        assert item.tag == "entry"
-
-        # Generate entry instance from required attributes
-        entry: Entry = Entry(
-            id=get_numeric_attribute(element=item, key="id"),
-            name=get_attribute(element=item, key="name"),
-            type=get_attribute(element=item, key="type"),
-            link=item.attrib.get("link"),
-            reaction=item.attrib.get("reaction"),
-        )
-
-        # Iterate over children and parse graphics, components, ...
-        for child in item:
-            if child.tag == "graphics":
-                entry.graphics = Graphics.parse(child)
-            elif child.tag == "component":
-                entry.components.append(Component.parse(child))
-
-        return entry
-
-
-    def to_xml(self) -> Element:
-        """
-        Generate XML string from Entry element.
-
-        :return: XML string.
-        :rtype: xml.etree.ElementTree.Element
-        """
-
-        entry_element: Element = Element(
-            "entry",
-            attrib={
-                "id": self.id,
-                "name": self.name,
-                "type": self.type
-            }
-        )
-
-        # Add optional attributes to xml element
-        if self.link is not None:
-            entry_element.attrib["link"] = self.link
-
-        if self.reaction is not None:
-            entry_element.attrib["reaction"] = self.reaction
-
-        # generate xml element from children elements
-
-        # Add graphics element to entry element
-        if self.graphics is not None:
-            entry_element.append(self.graphics.to_xml())
-
-
-        # Iterate over components and add to entry element
-        for component in self.components:
-            entry_element.append(component.to_xml())
-
-
-        return entry_element
-
-
-
-
-    def __str__(self) -> str:
-        """
-        Build Entry summary string.
-
-        :return: String of Entry instance.
-        :rtype: str
-        """
-        return f"<Entry id='{self.id}' name='{self.name}' type='{self.type}'>"
-
-
-
-    def get_gene_id(self) -> List[str]:
-        """
-        Parse variable 'name' of Entry into KEGG id.
-
-        :return: List of KEGG identifier.
-        :rtype: typing.List[str]
-        """
-
-        # TODO: validate return valid !!
-        # r"^([a-z]){3}([0-9]){5}$"
-
-        # return self.name.split(":")[1]
-        return [value.split(":")[1] for value in self.name.split(" ")]
-
-
-
-
-class Alt:
-    """
-    Alt model.
-    """
-
-    def __init__(self, name: str) -> None:
-        """
-        Init Alt instance.
-
-        :param str name: Alt element name.
-        """
-
-        self.name: str = name
-
-
-    @staticmethod
-    def parse(item: Element) -> "Alt":
-        """
-        Parse Alt instance from XML element.
-
-        :param xml.etree.ElementTree.Element item: XML element to parse.
-        :rtype: Alt
-        :return: Parsed Alt element.
-        """
-        assert item.tag == "alt"
-
-        return Alt(name=get_attribute(element=item, key="name"))
-
-
-    def to_xml(self) -> Element:
-        """
-        Generate XML string from Alt element.
-
-        :return: XML string.
-        :rtype: xml.etree.ElementTree.Element
-        """
-
-        return Element(
-            "alt",
-            attrib={
-                "name": self.name,
-            },
-        )
-
-
-    def __str__(self) -> str:
-        """
-        Build string from Alt instance.
-
-        :return: String of Alt instance.
-        :rtype: str
-        """
-
-        return f"<Alt name='{self.name}'>"
-
-
-class Product:
-    """
-    Reaction Product model.
-    """
-
-    def __init__(
-        self,
-        id: str,
-        name: str,
-        alt: Optional[Alt] = None
-        ) -> None:
-        """
-        Init Product instance.
-
-        :param str id: Identifier of Product in pathway.
-        :param str name: KEGG identifier of compound.
-        :param Alt alt: Alternative name of element.
-        """
-
-        # TODO: verify correct format
-
-        self.id: str = id
-        self.name: str = name
-        self.alt: Optional[Alt] = alt
-
-    @staticmethod
-    def parse(item: Element) -> "Product":
-        """
-        Parse XML element instance to Product model instance.
-
-        :param xml.etree.ElementTree.Element item: XML element to parse.
-        :return: Parsed Product model.
-        :rtype: Product
-        """
-
-        assert item.tag == "product"
-
-        parsed_product: Product = Product(
-            id=get_attribute(element=item, key="id"),
-            name=get_attribute(element=item, key="name"),
-        )
-
-        # Parse child alt elements
-        for child in item:
-            if child.tag == "alt":
-
-                # TODO warn if overwrite
-                # TODO: or raise exception (only 1 alt should be presnet)
-                # if parsed_product.alt is not None:
-                #     warn(message="'Alt'")
-
-                parsed_product.alt = Alt.parse(item=child)
-
-        return parsed_product
-
-
-    def to_xml(self) -> Element:
-        """
-        Generate XML string from Product element.
-
-        :return: XML string.
-        :rtype: xml.etree.ElementTree.Element
-        """
-
-        product_element: Element = Element(
-            "product",
-            attrib={
-                "id": self.id,
-                "name": self.name,
-            },
-        )
-
-        # Add optional alt element if exist
-        if self.alt is not None:
-            product_element.append(self.alt.to_xml())
-
-        return product_element
-
-
-    def __str__(self) -> str:
-        """
-        Build string from Product instance.
-
-        :return: String of Product instance.
-        :rtype: str
-        """
-        return f"<Product id='{self.id}' name='{self.name}'>"
-
-
-class Substrate:
-    """
-    reaction Substrate model
-    """
-    def __init__(
-        self,
-        id: str,
-        name: str,
-        alt: Optional[Alt] = None,
-        ) -> None:
-        """
-        Init Substrate instance.
-
-        :param str id: Identifier of Substrate in pathway.
-        :param str name: KEGG identifier of compound.
-        :param Alt alt: Alternative name of element.
-        """
-
-        # TODO: verify correct format
-
-        self.id: str = id
-        self.name: str = name
-        self.alt: Optional[Alt] = alt
-
-    @staticmethod
-    def parse(item: Element) -> "Substrate":
-        """
-        Parse XML element instance to Substrate model instance.
-
-        :param xml.etree.ElementTree.Element item: XML element to parse.
-        :return: Parsed Substrate model.
-        :rtype: Substrate
-        """
-
-        assert item.tag == "substrate"
-
-        parsed_substrate: Substrate = Substrate(
-            id=get_attribute(element=item, key="id"),
-            name=get_attribute(element=item, key="name"),
-        )
-
-        # Parse child alt elements
-        for child in item:
-            if child.tag == "alt":
-
-                # TODO warn if overwrite
-                # TODO: or raise exception (only 1 alt should be presnet)
-                # if parsed_substrate.alt is not None:
-                #     warn(message="'Alt'")
-
-                parsed_substrate.alt = Alt.parse(item=child)
-
-        return parsed_substrate
-
-
-    def to_xml(self) -> Element:
-        """
-        Generate XML string from Substrate element.
-
-        :return: XML string.
-        :rtype: xml.etree.ElementTree.Element
-        """
-
-        substrate_element: Element = Element(
-            "substrate",
-            attrib={
-                "id": self.id,
-                "name": self.name,
-            },
-        )
-
-        # Add optional alt element if exist
-        if self.alt is not None:
-            substrate_element.append(self.alt.to_xml())
-
-        return substrate_element
-
-
-    def __str__(self) -> str:
-        """
-        Build string from Substrate instance.
-
-        :return: String of Substrate instance.
-        :rtype: str
-        """
-        return f"<Substrate id='{self.id}' name='{self.name}'>"
-
-
-
-class Reaction:
-    """
-    Reaction model.
-    """
-
-    def __init__(
-        self,
-        id: str,
-        name: str,
-        type: str,
-        ) -> None:
-        """
-        Init Reaction model instance.
-
-        :param str id: Identifier of reaction.
-        :param str name: KEGG identifer of reaction.
-        :param str type: Type of reaction. Must be contained in list of valid reaction types.
-        """
-
-        if type not in REACTION_TYPE:
-            raise ValueError("Type of reaction is not in list of valid reaction types.")
-
-        # TODO: check valid reaction id
-        self.id = id
-        self.name = name
-        self.type = type
-
-        # Child elements of reaction
-        self.products: List[Product] = []
-        self.substrates: List[Substrate] = []
-
-
-    @staticmethod
-    def parse(item: Element) -> "Reaction":
-        """
-        Parse XML element instance to Reaction model instance.
-
-        :param xml.etree.ElementTree.Element item: XML element to parse.
-        :return: Parsed Reaction model.
-        :rtype: Reaction
-        """
-
-        assert item.tag == "reaction"
-
-        # Parse reaction instance from xml attributes
-        parsed_reaction: Reaction = Reaction(
-            id=get_attribute(element=item, key="id"),
-            name=get_attribute(element=item, key="name"),
-            type=get_attribute(element=item, key="type"),
-        )
-
-        # Parse product and substrate from child elements
-        for child in item:
-            if child.tag == "product":
-                parsed_reaction.products.append(Product.parse(child))
-            elif child.tag == "substrate":
-                parsed_reaction.substrates.append(Substrate.parse(child))
-
-        return parsed_reaction
-
-
-    def to_xml(self) -> Element:
-        """
-        Generate XML string from Reaction element.
-
-        :return: XML string.
-        :rtype: xml.etree.ElementTree.Element
-        """
-
-        reaction_element: Element = Element(
-            "reaction",
-            attrib={
-                "id": self.id,
-                "name": self.name,
-                "type": self.type,
-            },
-        )
-
-        # Add substrate and product to reaction element
-
-        for substrate in self.substrates:
-            reaction_element.append(substrate.to_xml())
-
-        for product in self.products:
-            reaction_element.append(product.to_xml())
-
-
-        return reaction_element
-
-
-    def __str__(self) -> str:
-        """
-        Build string of reaction instance.
-
-        :return: String of Reaction instance.
-        :rtype: str
-        """
-
-        return f"<Reaction id='{self.id}' name='{self.name}'>"
-
-
-
-
-class Pathway:
-    """
-    KEGG Pathway object.
-    The KEGG pathway object stores graphics information and related objects.
-    """
-    # pylint: disable=too-many-instance-attributes
-
-    def __init__(
-        self,
-        name: str,
-        org: str,
-        number: str,
-        title: Optional[str] = None,
-        image: Optional[str] = None,
-        link: Optional[str] = None,
-        ) -> None:
-        """
-        Init KEGG Pathway model.
-
-        :param str name: Name of pathway, which is the full KEGG identifier.
-        :param str org: Organism code.
-        :param str number: Number of pathway.
-        :param typing.Optional[str] title: Title of pathway.
-        :param typing.Optional[str] image: Image for pathway provided by KEGG database.
-        :param typing.Optional[str] link: Link to pathway in KEGG database.
-        """
-
-        # required parameter of pathway element
-        self.name: str = name
-        self.org: str = org
-        self.number: str = number
-
-        # Check all required parameter formats
-        if not is_valid_pathway_name(value=name):
-            raise ValueError(f"Pathway name '{name}' is not a valid value.")
-
-        if not is_valid_pathway_org(value=org):
-            raise ValueError(f"Pathway org '{org}' is not a valid value.")
-
-        if not is_valid_pathway_number(value=number):
-            raise ValueError(f"Pathway number '{number}' is not a valid value.")
-
-
-        # Check match of number, org and name
-        if self.name != f"path:{self.org}{self.number}":
-            raise ValueError("Mismatch of arguments name, org and number.")
-
-
-        # implied
-        self.title: Optional[str] = title
-        self.image: Optional[str] = image
-        self.link: Optional[str] = link
-
-        # children
-        self.relations: List[Relation] = []
-        self.entries: List[Entry] = []
-        self.reactions: List[Reaction] = []
-
-
-
-
-    @staticmethod
-    def parse(data: Union[Element, str]) -> "Pathway":
-        """
-        Parsing XML string or element in Pathway instance.
-
-        :param typing.Union[xml.etree.ElementTree.Element, str] data: String or XML element to parse.
-        :return: Parsed Pathway instance.
-        :rtype: Pathway
-        """
-
-        # Generate correct format from string or XML element object
-        item: Element = parse_xml(xml_object_or_string=data)
-
-
-        # Init pathway instance with all required attributes
-        pathway: Pathway = Pathway(
-            name=get_attribute(element=item, key="name"),
-            org=get_attribute(element=item, key="org"),
-            number=get_attribute(element=item, key="number"),
-            title=item.attrib.get("title"),
-            image=item.attrib.get("image"),
-            link=item.attrib.get("link"),
-        )
-
-
-        # Parse child items of pathway
-        for child in item:
-            if child.tag == "entry":
-                pathway.entries.append(Entry.parse(child))
-            elif child.tag == "relation":
-                pathway.relations.append(Relation.parse(child))
-            elif child.tag == "reaction":
-                pathway.reactions.append(Reaction.parse(child))
-
-
-        return pathway
-
-
-    def to_xml(self) -> Element:
-        """
-        Generate XML element from Pathway instance and its children.
-
-        :return: XML element in KGML format.
-        :rtype: xml.etree.ElementTree.Element
-        """
-
-        pathway_element: Element = Element(
-            "pathway",
-            attrib={
-                "name": self.name,
-                "org": self.org,
-                "number": self.number,
-            }
-        )
-
-        # Adding optional attributes to pathway root element
-        if self.title is not None:
-            pathway_element.attrib["title"] = self.title
-
-        if self.link is not None:
-            pathway_element.attrib["link"] = self.link
-
-        if self.image is not None:
-            pathway_element.attrib["image"] = self.image
-
-
-        # add children entries, relations and reactions
-
-        for entry in self.entries:
-            pathway_element.append(entry.to_xml())
-
-        for relation in self.relations:
-            pathway_element.append(relation.to_xml())
-
-        for reaction in self.reactions:
-            pathway_element.append(reaction.to_xml())
-
-
-        return pathway_element
-
-
-    def to_xml_string(self) -> str:
-        """
-        Generate XML string from pathway instance.
-
-        :return: XML string in KGML format.
-        :rtype: str
-        """
-
-        # Generate xml header string
-        # docstring is not supported by build-in xml builer
-        xml_timestamp: str = datetime.now().astimezone().strftime("%b %d, %Y %H:%M:%S (GMT%z)")
-        xml_header: str = "<?xml version=\"1.0\"?>\n" \
-            "<!DOCTYPE pathway SYSTEM \"http://www.kegg.jp/kegg/xml/KGML_v0.7.2_.dtd\">\n" \
-            f"<!-- Creation date: {xml_timestamp} -->\n"
-
-
-        pathway_element: Element = self.to_xml()
-
-        xml_content: str = ElementTree.tostring(pathway_element).decode("utf-8")
-
-        return xml_header + xml_content
-
-
-    def get_entry_by_id(self, entry_id: str) -> Optional[Entry]:
-        """
-        Get pathway Entry object by id.
-
-        :param str entry_id: Id of Entry.
-        :return: Returns Entry instance if id is found in Pathway. Otherwise returns None.
-        :rtype: typing.Optional[Entry]
-        """
-
-        for item in self.entries:
-            if item.id == entry_id:
-                return item
-        return None
-
-
-
-    def get_genes(self) -> List[str]:
-        """
-        List all genes from pathway.
-
-        :return: List of entry ids with type gene.
-        :rtype: typing.List[str]
-        """
-
-        result: List[str] = []
-
-        # Iterate of entries and get all gene type
-        # Keep list of genes unique
-        for entry in self.entries:
-            if entry.type == "gene":
-
-                # Get name of entry (KEGG identifier)
-                # if " " in entry.name:
-                #     # Check if name contains a space, which indicates list of multiple identifier
-                #     splitted_entries: List[str] = entry.name.split(" ")
-                #     for single_entry in splitted_entries:
-                #         if single_entry not in result:
-                #             result.append(single_entry)
-
-
-                # elif entry.name not in result:
-                #     result.append(entry.name)
-
-                for gene_id in entry.get_gene_id():
-                    if gene_id not in result:
-                        result.append(gene_id)
-
-        return result
-
-
-    def __str__(self) -> str:
-        """
-        Build string summary for KEGG pathway.
-
-        :return: String of Pathway instance.
-        :rtype: str
-        """
-        return f"<Pathway path:{self.org}{self.number} title='{self.title}'>"
-
-
-    def merge(self) -> "Pathway":
-        """
-        Merge identical entries in Pathway together and generate new pathway instance.
-
-        :return: Merged Pathway instance.
-        :rtype: Pathway
-        """
-
-        merged_pathway: Pathway = Pathway(
-            name=self.name,
-            org=self.org,
-            number=self.number,
-            title=self.title,
-        )
-
-        # TODO find duplicate entries in pathway
-
-        return merged_pathway
+""" KEGG pathway models to parse object relational """
+# pylint: disable=invalid-name,redefined-builtin,too-many-lines
+
+
+# from warnings import warn
+import copy
+import sys
+from array import array
+from datetime import datetime
+from xml.etree import ElementTree
+from xml.etree.ElementTree import Element
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, FrozenSet, Iterable, List, Sequence, Tuple, Union, Optional
+
+from .const import (
+    REACTION_TYPE,
+    RELATION_TYPES,
+    RELATION_SUBTYPES,
+    ENTRY_TYPE,
+    GRAPHIC_TYPE,
+)
+
+if TYPE_CHECKING: # pragma: no cover
+    from .graph import PathwayGraph
+
+from .serialize import BinaryReader, BinaryWriter, Serializable
+from .utils import (
+    get_attribute,
+    get_numeric_attribute,
+    intern_optional,
+    iterparse_kgml,
+    parse_kgml,
+    is_valid_pathway_number,
+    is_valid_hex_color,
+    is_valid_pathway_name,
+    is_valid_pathway_org,
+)
+
+
+
+
+class Subtype(Serializable):
+    """
+    Subtype model class.
+    """
+
+    __slots__ = ("name", "value")
+
+    # Number of strings written by `pack`
+    FIELD_COUNT: int = 2
+
+    def __init__(
+        self,
+        name: str,
+        value: str,
+        validate: bool = True,
+    ) -> None:
+        """
+        Init Subtype model instance.
+
+        :param str name: Name of subtype. Must match list of valid subtypes.
+        :param str value: Value of subtype.
+        :param bool validate: Validate arguments. Disable only for trusted input.
+        """
+
+        # check for valid subtype names in RELATION_SUBTYPES
+        if validate and name not in RELATION_SUBTYPES:
+            raise ValueError(f"Name of relation subtype '{name}' is not in list of valid subtypes.")
+
+        self.name: str = sys.intern(name)
+        self.value: str = value
+
+
+
+    @staticmethod
+    def parse(item: Element, validate: bool = True) -> "Subtype":
+        """
+        Parse Subtype XML element.
+
+        :param xml.etree.ElementTree.Element item: XML element.
+        :param bool validate: Validate attributes. Disable only for trusted input.
+        :return: Parsed Subtype instance.
+        :rtype: Subtype
+        """
+
+        # check correct type
+        assert item.tag == "subtype"
+
+        # Generate and return subtype instance
+        return Subtype(
+            name=get_attribute(element=item, key="name", validate=validate),
+            value=get_attribute(element=item, key="value", validate=validate),
+            validate=validate,
+        )
+
+
+    def to_xml(self) -> Element:
+        """
+        Generate XML string from Subtype element.
+
+        :return: XML string.
+        :rtype: xml.etree.ElementTree.Element
+        """
+
+        return Element(
+            "subtype",
+            attrib={
+                "name": self.name,
+                "value": self.value
+            },
+        )
+
+
+    def pack(self, writer: BinaryWriter) -> None:
+        """
+        Write Subtype instance to binary writer.
+
+        :param BinaryWriter writer: Writer instance.
+        """
+
+        writer.write_str(self.name)
+        writer.write_str(self.value)
+
+
+    @classmethod
+    def from_values(cls, values: Sequence[Optional[str]]) -> "Subtype":
+        """
+        Build Subtype instance from strings read in order of `pack`.
+
+        :param typing.Sequence[typing.Optional[str]] values: `FIELD_COUNT` strings.
+        :return: Subtype instance.
+        :rtype: Subtype
+        """
+
+        name, value = values
+
+        if name is None or value is None:
+            raise ValueError("Missing required attribute of subtype in binary data.")
+
+        return Subtype(name=name, value=value, validate=False)
+
+
+    @classmethod
+    def unpack(cls, reader: BinaryReader) -> "Subtype":
+        """
+        Read Subtype instance from binary reader.
+
+        :param BinaryReader reader: Reader instance.
+        :return: Subtype instance.
+        :rtype: Subtype
+        """
+
+        return Subtype.from_values(reader.read_strs(count=Subtype.FIELD_COUNT))
+
+
+    def __str__(self) -> str:
+        """
+        Generate string from Subtype instance.
+
+        :return: String of Subtype instance.
+        :rtype: str
+        """
+        return f"<Subtype name='{self.name}' value='{self.value}'>"
+
+
+
+
+
+
+class Relation(Serializable):
+    """
+    Relation model class.
+    """
+
+    __slots__ = ("entry1", "entry2", "type", "subtypes")
+
+    def __init__(
+        self,
+        entry1: str,
+        entry2: str,
+        type: str,
+        validate: bool = True,
+    ) -> None:
+        """
+        Init relation model instance.
+
+        :param str entry1: Source entry of relation.
+        :param str entry2: Destination entry of relation.
+        :param str type: Type of Relation. Must be contained in list of valid relation types.
+        :param bool validate: Validate arguments. Disable only for trusted input.
+        """
+
+        # Check if type is in valid relation types
+        if validate and type not in RELATION_TYPES:
+            raise ValueError(f"Relation type '{type}' not in list of valid types.")
+
+        self.entry1: str = entry1
+        self.entry2: str = entry2
+        self.type: str = sys.intern(type)
+        self.subtypes: List[Subtype] = []
+
+
+    @staticmethod
+    def parse(item: Element, validate: bool = True) -> "Relation":
+        """
+        Parse XML element into Relation instance.
+
+        :param xml.etree.ElementTree.Element item: XML element to parse.
+        :param bool validate: Validate attributes. Disable only for trusted input.
+        :return: Relation instance.
+        :rtype: Relation
+        """
+
+        # Check tag of relation is correct
+        assert item.tag == "relation"
+
+
+        # Create relation instance from attributes
+        relation: Relation = Relation(
+            entry1=get_numeric_attribute(element=item, key="entry1", validate=validate),
+            entry2=get_numeric_attribute(element=item, key="entry2", validate=validate),
+            type=get_attribute(element=item, key="type", validate=validate),
+            validate=validate,
+        )
+
+
+        # Parse Child items of xml element by iterating of child elements
+        for child in item:
+            relation.subtypes.append(Subtype.parse(item=child, validate=validate))
+
+
+        return relation
+
+
+    def to_xml(self) -> Element:
+        """
+        Generate XML string from Relation element.
+
+        :return: XML string.
+        :rtype: xml.etree.ElementTree.Element
+        """
+
+        return Element(
+            "relation",
+            attrib={
+                "entry1": self.entry1,
+                "entry2": self.entry2,
+                "type": self.type,
+            },
+        )
+
+    def pack(self, writer: BinaryWriter) -> None:
+        """
+        Write Relation instance and subtypes to binary writer.
+
+        :param BinaryWriter writer: Writer instance.
+        """
+
+        writer.write_str(self.entry1)
+        writer.write_str(self.entry2)
+        writer.write_str(self.type)
+
+        writer.write_int(len(self.subtypes))
+        for subtype in self.subtypes:
+            subtype.pack(writer=writer)
+
+
+    @classmethod
+    def unpack(cls, reader: BinaryReader) -> "Relation":
+        """
+        Read Relation instance and subtypes from binary reader.
+
+        :param BinaryReader reader: Reader instance.
+        :return: Relation instance.
+        :rtype: Relation
+        """
+
+        # Values are read from slices of the reader directly, see `Entry.unpack`
+        strings: List[Optional[str]] = reader.strings
+        values: array = reader.values
+        position: int = reader.position
+
+        entry1, entry2, type = [strings[index] for index in values[position:position + 3]]
+
+        if entry1 is None or entry2 is None or type is None:
+            raise ValueError("Missing required attribute of relation in binary data.")
+
+        relation: Relation = Relation(entry1=entry1, entry2=entry2, type=type, validate=False)
+
+        size: int = values[position + 3] * Subtype.FIELD_COUNT
+        position += 4
+        fields: List[Optional[str]] = [strings[index] for index in values[position:position + size]]
+        reader.position = position + size
+
+        if len(fields) != size:
+            raise ValueError("Unexpected end of binary data.")
+
+        relation.subtypes = [
+            Subtype.from_values(fields[index:index + Subtype.FIELD_COUNT])
+            for index in range(0, size, Subtype.FIELD_COUNT)
+        ]
+
+        return relation
+
+
+    def __str__(self) -> str:
+        """
+        Generate string from relation instance.
+
+        :return: String of Relation instance.
+        :rtype: str
+        """
+        return f"<Relation {self.entry1}->{self.entry2} type='{self.type}'>"
+
+
+
+
+class Component(Serializable):
+    """
+    Component model.
+    """
+
+    __slots__ = ("id",)
+
+    def __init__(self, id: str, validate: bool = True) -> None:
+        """
+        Init Component model.
+
+        :param str id: Id of component.
+        :param bool validate: Validate arguments. Disable only for trusted input.
+        """
+
+        # id can't be empty
+        if validate and id == "":
+            raise ValueError("Component id can't be empty.")
+
+
+        # TODO: Check pattern of component id
+        # TODO: component id should reference an existing entry !
+
+        self.id: str = id
+
+
+    @staticmethod
+    def parse(item: Element, validate: bool = True) -> "Component":
+        """
+        Parsing ElementTree into Component.
+
+        :param xml.etree.ElementTree.Element item: XML element to parse.
+        :param bool validate: Validate attributes. Disable only for trusted input.
+        :return: Parsed Component instance.
+        :rtype: Component
+        """
+
+        # Check for correct xml tag
+        assert item.tag == "component"
+
+        # Create component instance from id attribute
+        return Component(id=get_attribute(element=item, key="id", validate=validate), validate=validate)
+
+
+    def to_xml(self) -> Element:
+        """
+        Generate XML string from Component element.
+
+        :return: XML string.
+        :rtype: xml.etree.ElementTree.Element
+        """
+
+        return Element(
+            "component",
+            attrib={
+                "id": self.id,
+            },
+        )
+
+
+    def pack(self, writer: BinaryWriter) -> None:
+        """
+        Write Component instance to binary writer.
+
+        :param BinaryWriter writer: Writer instance.
+        """
+
+        writer.write_str(self.id)
+
+
+    @classmethod
+    def unpack(cls, reader: BinaryReader) -> "Component":
+        """
+        Read Component instance from binary reader.
+
+        :param BinaryReader reader: Reader instance.
+        :return: Component instance.
+        :rtype: Component
+        """
+
+        return Component(id=reader.read_required_str(), validate=False)
+
+
+    def __str__(self) -> str:
+        """
+        Build string of component instance.
+
+        :return: String of Component instance.
+        :rtype: str
+        """
+        return f"<Component id='{self.id}'>"
+
+
+
+class Graphics(Serializable):
+    """
+    Graphics information for rendering.
+    """
+
+    __slots__ = ("x", "y", "width", "height", "coords", "name", "type", "fgcolor", "bgcolor")
+
+    # Number of strings written by `pack`
+    FIELD_COUNT: int = 9
+
+    def __init__(
+        self,
+        x: Optional[str] = None,
+        y: Optional[str] = None,
+        width: Optional[str] = None,
+        height: Optional[str] = None,
+        coords: Optional[str] = None,
+        name: Optional[str] = None,
+        type: Optional[str] = None,
+        fgcolor: Optional[str] = None,
+        bgcolor: Optional[str] = None,
+        validate: bool = True,
+    ) -> None:
+        """
+        Init Graphics model instance.
+
+        :param typing.Optional[str] x:
+        :param typing.Optional[str] y:
+        :param typing.Optional[str] width:
+        :param typing.Optional[str] height:
+        :param typing.Optional[str] coords:
+        :param typing.Optional[str] name:
+        :param typing.Optional[str] type:
+        :param typing.Optional[str] fgcolor:
+        :param typing.Optional[str] bgcolor:
+        :param bool validate: Validate arguments. Disable only for trusted input.
+        """
+
+        # All parameter are implied (optional)
+        self.x: Optional[str] = x
+        self.y: Optional[str] = y
+        self.width: Optional[str] = width
+        self.height: Optional[str] = height
+        self.coords: Optional[str] = coords
+        self.name: Optional[str] = name
+        self.type: Optional[str] = intern_optional(type)
+        self.fgcolor: Optional[str] = intern_optional(fgcolor)
+        self.bgcolor: Optional[str] = intern_optional(bgcolor)
+
+
+        if not validate:
+            return
+
+        # Validate parameter if not None
+
+        # Check type is in list of valid types
+        if self.type is not None and self.type not in GRAPHIC_TYPE:
+            raise ValueError(f"Type '{self.type}' is not a valid graphics type.")
+
+        # Check foreground and background color are hex format
+        if self.fgcolor is not None and is_valid_hex_color(value=self.fgcolor) is False:
+            raise ValueError("Fgcolor is not a valid hex color.")
+
+        if self.bgcolor is not None and is_valid_hex_color(value=self.bgcolor) is False:
+            raise ValueError("Bgcolor is not a valid hex color.")
+
+
+        # Check x,y,width and height are numeric (only if not None)
+        if self.x is not None and str.isdigit(self.x) is False:
+            raise ValueError("Value x is not a number.")
+
+        if self.y is not None and str.isdigit(self.y) is False:
+            raise ValueError("Value y is not a number.")
+
+        if self.width is not None and str.isdigit(self.width) is False:
+            raise ValueError("Value width is not a number.")
+
+        if self.height is not None and str.isdigit(self.height) is False:
+            raise ValueError("Value height is not a number.")
+
+
+    @staticmethod
+    def parse(item: Element, validate: bool = True) -> "Graphics":
+        """
+        Parse XML element into Graphics instance.
+
+        :param xml.etree.ElementTree.Element item: XML element to parse.
+        :param bool validate: Validate attributes. Disable only for trusted input.
+        :return: Parsed Graphics instance.
+        :rtype: Graphics
+        """
+
+        # Check xml tag
+        assert item.tag == "graphics"
+
+        # Parse attributes from XML element
+        return Graphics(
+            x = item.get("x"),
+            y = item.get("y"),
+            width = item.get("width"),
+            height = item.get("height"),
+            name = item.get("name"),
+            type = item.get("type"),
+            fgcolor = item.get("fgcolor"),
+            bgcolor = item.get("bgcolor"),
+            coords = item.get("coords"),
+            validate = validate,
+        )
+
+
+    def to_xml(self) -> Element:
+        """
+        Generate XML string from Graphics element.
+
+        :return: XML string.
+        :rtype: xml.etree.ElementTree.Element
+        """
+
+        graphics_element: Element = Element(
+            "graphics",
+        )
+
+        if self.x is not None:
+            graphics_element.attrib["x"] = self.x
+
+        if self.y is not None:
+            graphics_element.attrib["y"] = self.y
+
+        if self.width is not None:
+            graphics_element.attrib["width"] = self.width
+
+        if self.height is not None:
+            graphics_element.attrib["height"] = self.height
+
+        if self.name is not None:
+            graphics_element.attrib["name"] = self.name
+
+        if self.type is not None:
+            graphics_element.attrib["type"] = self.type
+
+        if self.fgcolor is not None:
+            graphics_element.attrib["fgcolor"] = self.fgcolor
+
+        if self.bgcolor is not None:
+            graphics_element.attrib["bgcolor"] = self.bgcolor
+
+        if self.coords is not None:
+            graphics_element.attrib["coords"] = self.coords
+
+        return graphics_element
+
+
+    def pack(self, writer: BinaryWriter) -> None:
+        """
+        Write Graphics instance to binary writer.
+
+        :param BinaryWriter writer: Writer instance.
+        """
+
+        writer.write_str(self.x)
+        writer.write_str(self.y)
+        writer.write_str(self.width)
+        writer.write_str(self.height)
+        writer.write_str(self.coords)
+        writer.write_str(self.name)
+        writer.write_str(self.type)
+        writer.write_str(self.fgcolor)
+        writer.write_str(self.bgcolor)
+
+
+    @classmethod
+    def unpack(cls, reader: BinaryReader) -> "Graphics":
+        """
+        Read Graphics instance from binary reader.
+
+        :param BinaryReader reader: Reader instance.
+        :return: Graphics instance.
+        :rtype: Graphics
+        """
+
+        return Graphics.from_values(reader.read_strs(count=Graphics.FIELD_COUNT))
+
+
+    @classmethod
+    def from_values(cls, values: Sequence[Optional[str]]) -> "Graphics":
+        """
+        Build Graphics instance from strings read in order of `pack`.
+
+        :param typing.Sequence[typing.Optional[str]] values: `FIELD_COUNT` strings.
+        :return: Graphics instance.
+        :rtype: Graphics
+        """
+
+        x, y, width, height, coords, name, type, fgcolor, bgcolor = values
+
+        return Graphics(
+            x=x,
+            y=y,
+            width=width,
+            height=height,
+            coords=coords,
+            name=name,
+            type=type,
+            fgcolor=fgcolor,
+            bgcolor=bgcolor,
+            validate=False,
+        )
+
+
+    def __str__(self) -> str:
+        """
+        Return Graphics instance summary string.
+
+        :return: String of Graphics instance.
+        :rtype: str
+        """
+        return f"<Graphics name='{self.name}'>"
+
+
+
+class Entry(Serializable):
+    """
+    Entry model class.
+    """
+
+    __slots__ = ("id", "name", "type", "link", "reaction", "graphics", "components")
+
+    def __init__(
+        self,
+        id: str,
+        name: str,
+        type: str,
+        link: Optional[str] = None,
+        reaction: Optional[str] = None,
+        validate: bool = True,
+    ) -> None:
+        """
+        Init entry model instance.
+
+        :param str id: Id of Entry.
+        :param str name: Name of Entry.
+        :param str type: Type of Entry. Must be contained in list of valid entry types.
+        :param typing.Optional[str] link: Link to KEGG database with reference to entry.
+        :param typing.Optional[str] reaction: Reaction TODO: specify. Is str format correct?
+        :param bool validate: Validate arguments. Disable only for trusted input.
+        """
+
+        # required
+        self.id: str = id
+        self.name: str = name
+        self.type: str = sys.intern(type)
+
+        # TODO: validate entry id and name
+
+
+        if validate and self.type not in ENTRY_TYPE:
+            raise ValueError(f"Type '{self.type}' is not in list of valid entry types.")
+
+
+        # optional (implied)
+        self.link: Optional[str] = link
+        self.reaction: Optional[str] = reaction
+
+        # TODO: validate reaction if not None
+
+
+        # Implied child instances
+        self.graphics: Optional[Graphics] = None
+        self.components: List[Component] = []
+
+
+    @property
+    def has_multiple_names(self) -> bool:
+        """
+        Checks if entry has multiple names that are space seperated.
+
+        :return: Retruns True if entry has multiple names.
+        :rtype: bool
+        """
+
+        return len(self.name.split(" ")) > 1
+
+
+
+    @staticmethod
+    def parse(item: Element, validate: bool = True) -> "Entry":
+        """
+        Parsing XML element into Entry instance.
+
+        :param xml.etree.ElementTree.Element item: XML element to parse.
+        :param bool validate: Validate attributes. Disable only for trusted input.
+        :return: Parsed Entry instance.
+        :rtype: Entry
+        """
+
+        assert item.tag == "entry"
+
+        # Generate entry instance from required attributes
+        entry: Entry = Entry(
+            id=get_numeric_attribute(element=item, key="id", validate=validate),
+            name=get_attribute(element=item, key="name", validate=validate),
+            type=get_attribute(element=item, key="type", validate=validate),
+            link=item.get("link"),
+            reaction=item.get("reaction"),
+            validate=validate,
+        )
+
+        # Iterate over children and parse graphics, components, ...
+        for child in item:
+            if child.tag == "graphics":
+                entry.graphics = Graphics.parse(child, validate=validate)
+            elif child.tag == "component":
+                entry.components.append(Component.parse(child, validate=validate))
+
+        return entry
+
+
+    def to_xml(self) -> Element:
+        """
+        Generate XML string from Entry element.
+
+        :return: XML string.
+        :rtype: xml.etree.ElementTree.Element
+        """
+
+        entry_element: Element = Element(
+            "entry",
+            attrib={
+                "id": self.id,
+                "name": self.name,
+                "type": self.type
+            }
+        )
+
+        # Add optional attributes to xml element
+        if self.link is not None:
+            entry_element.attrib["link"] = self.link
+
+        if self.reaction is not None:
+            entry_element.attrib["reaction"] = self.reaction
+
+        # generate xml element from children elements
+
+        # Add graphics element to entry element
+        if self.graphics is not None:
+            entry_element.append(self.graphics.to_xml())
+
+
+        # Iterate over components and add to entry element
+        for component in self.components:
+            entry_element.append(component.to_xml())
+
+
+        return entry_element
+
+
+
+
+    def pack(self, writer: BinaryWriter) -> None:
+        """
+        Write Entry instance, graphics and components to binary writer.
+
+        :param BinaryWriter writer: Writer instance.
+        """
+
+        writer.write_str(self.id)
+        writer.write_str(self.name)
+        writer.write_str(self.type)
+        writer.write_str(self.link)
+        writer.write_str(self.reaction)
+
+        writer.write_int(int(self.graphics is not None))
+        if self.graphics is not None:
+            self.graphics.pack(writer=writer)
+
+        writer.write_int(len(self.components))
+        for component in self.components:
+            component.pack(writer=writer)
+
+
+    @classmethod
+    def unpack(cls, reader: BinaryReader) -> "Entry":
+        """
+        Read Entry instance, graphics and components from binary reader.
+
+        :param BinaryReader reader: Reader instance.
+        :return: Entry instance.
+        :rtype: Entry
+        """
+
+        # Values are read from slices of the reader directly instead of a reader call per value. Invalid references
+        # raise IndexError, which is converted by `from_bytes`.
+        strings: List[Optional[str]] = reader.strings
+        values: array = reader.values
+        position: int = reader.position
+
+        id, name, type, link, reaction = [strings[index] for index in values[position:position + 5]]
+
+        if id is None or name is None or type is None:
+            raise ValueError("Missing required attribute of entry in binary data.")
+
+        entry: Entry = Entry(id=id, name=name, type=type, link=link, reaction=reaction, validate=False)
+        has_graphics: int = values[position + 5]
+        position += 6
+
+        if has_graphics:
+            entry.graphics = Graphics.from_values(
+                [strings[index] for index in values[position:position + Graphics.FIELD_COUNT]]
+            )
+            position += Graphics.FIELD_COUNT
+
+        # Components are rare compared to entries and read with their own unpack
+        reader.position = position + 1
+        entry.components = [Component.unpack(reader=reader) for _ in range(values[position])]
+
+        return entry
+
+
+    def __str__(self) -> str:
+        """
+        Build Entry summary string.
+
+        :return: String of Entry instance.
+        :rtype: str
+        """
+        return f"<Entry id='{self.id}' name='{self.name}' type='{self.type}'>"
+
+
+
+    def get_gene_id(self) -> List[str]:
+        """
+        Parse variable 'name' of Entry into KEGG id.
+
+        :return: List of KEGG identifier.
+        :rtype: typing.List[str]
+        """
+
+        # TODO: validate return valid !!
+        # r"^([a-z]){3}([0-9]){5}$"
+
+        # return self.name.split(":")[1]
+        return [value.split(":")[1] for value in self.name.split(" ")]
+
+
+
+
+class EntryList(List[Entry]):
+    """
+    List of pathway entries with lookup indexes by id, name and type. Indexes are built on first lookup and kept up
+    to date when entries are appended. Other changes of the list invalidate them. Changes of attributes of contained
+    entries are not tracked.
+    """
+
+    def __init__(self, entries: Iterable[Entry] = ()) -> None:
+        """
+        Init EntryList instance.
+
+        :param typing.Iterable[Entry] entries: Initial entries.
+        """
+
+        super().__init__(entries)
+
+        # Version is increased on every change of list
+        self.version: int = 0
+
+        self._by_id: Optional[Dict[str, Entry]] = None
+        self._by_name: Optional[Dict[str, List[Entry]]] = None
+        self._by_type: Optional[Dict[str, List[Entry]]] = None
+
+
+    def _index(self, entry: Entry) -> None:
+        """
+        Add entry to built indexes. The first entry with an id is kept, like in a linear search.
+
+        :param Entry entry: Entry to add.
+        """
+
+        if self._by_id is None or self._by_name is None or self._by_type is None:
+            return
+
+        self._by_id.setdefault(entry.id, entry)
+
+        # Entry names are space separated lists of KEGG identifier
+        for name in dict.fromkeys(entry.name.split(" ")):
+            self._by_name.setdefault(name, []).append(entry)
+
+        self._by_type.setdefault(entry.type, []).append(entry)
+
+
+    def _build_index(self) -> None:
+        """
+        Build all indexes from entries of list.
+        """
+
+        self._by_id = {}
+        self._by_name = {}
+        self._by_type = {}
+
+        for entry in self:
+            self._index(entry)
+
+
+    def _changed(self) -> None:
+        """
+        Increase version and drop indexes after a change that can not be applied incrementally.
+        """
+
+        self.version += 1
+        self._by_id = None
+        self._by_name = None
+        self._by_type = None
+
+
+    def get_by_id(self, entry_id: str) -> Optional[Entry]:
+        """
+        Get entry by id.
+
+        :param str entry_id: Id of entry.
+        :return: First entry with id or None.
+        :rtype: typing.Optional[Entry]
+        """
+
+        if self._by_id is None:
+            self._build_index()
+
+        return self._by_id.get(entry_id) # type: ignore
+
+
+    def get_by_name(self, name: str) -> List[Entry]:
+        """
+        Get all entries with KEGG identifier in name (e.g. "mmu:19697").
+
+        :param str name: Single KEGG identifier.
+        :return: Entries in order of list.
+        :rtype: typing.List[Entry]
+        """
+
+        if self._by_name is None:
+            self._build_index()
+
+        return list(self._by_name.get(name, ())) # type: ignore
+
+
+    def get_by_type(self, type: str) -> List[Entry]:
+        """
+        Get all entries of type (e.g. "gene").
+
+        :param str type: Type of entry.
+        :return: Entries in order of list.
+        :rtype: typing.List[Entry]
+        """
+
+        if self._by_type is None:
+            self._build_index()
+
+        return list(self._by_type.get(type, ())) # type: ignore
+
+
+    def append(self, entry: Entry) -> None:
+        super().append(entry)
+        self.version += 1
+        self._index(entry)
+
+
+    def extend(self, entries: Iterable[Entry]) -> None:
+        for entry in entries:
+            self.append(entry)
+
+
+    def __iadd__(self, entries: Iterable[Entry]) -> "EntryList": # type: ignore
+        self.extend(entries)
+        return self
+
+
+    def insert(self, index: Any, entry: Entry) -> None:
+        super().insert(index, entry)
+        self._changed()
+
+
+    def remove(self, entry: Entry) -> None:
+        super().remove(entry)
+        self._changed()
+
+
+    def pop(self, index: Any = -1) -> Entry:
+        entry: Entry = super().pop(index)
+        self._changed()
+        return entry
+
+
+    def clear(self) -> None:
+        super().clear()
+        self._changed()
+
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        super().sort(*args, **kwargs)
+        self._changed()
+
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._changed()
+
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        super().__setitem__(index, value)
+        self._changed()
+
+
+    def __delitem__(self, index: Any) -> None:
+        super().__delitem__(index)
+        self._changed()
+
+
+    def __imul__(self, count: Any) -> "EntryList": # type: ignore
+        super().__imul__(count)
+        self._changed()
+        return self
+
+
+    def __reduce__(self) -> Any:
+        # Indexes are not pickled, but rebuilt on demand
+        return (EntryList, (list(self),))
+
+
+
+
+
+class Alt(Serializable):
+    """
+    Alt model.
+    """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str) -> None:
+        """
+        Init Alt instance.
+
+        :param str name: Alt element name.
+        """
+
+        self.name: str = name
+
+
+    @staticmethod
+    def parse(item: Element, validate: bool = True) -> "Alt":
+        """
+        Parse Alt instance from XML element.
+
+        :param xml.etree.ElementTree.Element item: XML element to parse.
+        :param bool validate: Validate attributes. Disable only for trusted input.
+        :rtype: Alt
+        :return: Parsed Alt element.
+        """
+        assert item.tag == "alt"
+
+        return Alt(name=get_attribute(element=item, key="name", validate=validate))
+
+
+    def to_xml(self) -> Element:
+        """
+        Generate XML string from Alt element.
+
+        :return: XML string.
+        :rtype: xml.etree.ElementTree.Element
+        """
+
+        return Element(
+            "alt",
+            attrib={
+                "name": self.name,
+            },
+        )
+
+
+    def pack(self, writer: BinaryWriter) -> None:
+        """
+        Write Alt instance to binary writer.
+
+        :param BinaryWriter writer: Writer instance.
+        """
+
+        writer.write_str(self.name)
+
+
+    @classmethod
+    def unpack(cls, reader: BinaryReader) -> "Alt":
+        """
+        Read Alt instance from binary reader.
+
+        :param BinaryReader reader: Reader instance.
+        :return: Alt instance.
+        :rtype: Alt
+        """
+
+        return Alt(name=reader.read_required_str())
+
+
+    def __str__(self) -> str:
+        """
+        Build string from Alt instance.
+
+        :return: String of Alt instance.
+        :rtype: str
+        """
+
+        return f"<Alt name='{self.name}'>"
+
+
+class Product(Serializable):
+    """
+    Reaction Product model.
+    """
+
+    __slots__ = ("id", "name", "alt")
+
+    def __init__(
+        self,
+        id: str,
+        name: str,
+        alt: Optional[Alt] = None
+        ) -> None:
+        """
+        Init Product instance.
+
+        :param str id: Identifier of Product in pathway.
+        :param str name: KEGG identifier of compound.
+        :param Alt alt: Alternative name of element.
+        """
+
+        # TODO: verify correct format
+
+        self.id: str = id
+        self.name: str = name
+        self.alt: Optional[Alt] = alt
+
+    @staticmethod
+    def parse(item: Element, validate: bool = True) -> "Product":
+        """
+        Parse XML element instance to Product model instance.
+
+        :param xml.etree.ElementTree.Element item: XML element to parse.
+        :param bool validate: Validate attributes. Disable only for trusted input.
+        :return: Parsed Product model.
+        :rtype: Product
+        """
+
+        assert item.tag == "product"
+
+        parsed_product: Product = Product(
+            id=get_attribute(element=item, key="id", validate=validate),
+            name=get_attribute(element=item, key="name", validate=validate),
+        )
+
+        # Parse child alt elements
+        for child in item:
+            if child.tag == "alt":
+
+                # TODO warn if overwrite
+                # TODO: or raise exception (only 1 alt should be presnet)
+                # if parsed_product.alt is not None:
+                #     warn(message="'Alt'")
+
+                parsed_product.alt = Alt.parse(item=child, validate=validate)
+
+        return parsed_product
+
+
+    def to_xml(self) -> Element:
+        """
+        Generate XML string from Product element.
+
+        :return: XML string.
+        :rtype: xml.etree.ElementTree.Element
+        """
+
+        product_element: Element = Element(
+            "product",
+            attrib={
+                "id": self.id,
+                "name": self.name,
+            },
+        )
+
+        # Add optional alt element if exist
+        if self.alt is not None:
+            product_element.append(self.alt.to_xml())
+
+        return product_element
+
+
+    def pack(self, writer: BinaryWriter) -> None:
+        """
+        Write Product instance to binary writer.
+
+        :param BinaryWriter writer: Writer instance.
+        """
+
+        writer.write_str(self.id)
+        writer.write_str(self.name)
+
+        writer.write_int(int(self.alt is not None))
+        if self.alt is not None:
+            self.alt.pack(writer=writer)
+
+
+    @classmethod
+    def unpack(cls, reader: BinaryReader) -> "Product":
+        """
+        Read Product instance from binary reader.
+
+        :param BinaryReader reader: Reader instance.
+        :return: Product instance.
+        :rtype: Product
+        """
+
+        id, name = reader.read_required_strs(count=2)
+        return Product(id=id, name=name, alt=Alt.unpack(reader=reader) if reader.read_int() else None)
+
+
+    def __str__(self) -> str:
+        """
+        Build string from Product instance.
+
+        :return: String of Product instance.
+        :rtype: str
+        """
+        return f"<Product id='{self.id}' name='{self.name}'>"
+
+
+class Substrate(Serializable):
+    """
+    reaction Substrate model
+    """
+
+    __slots__ = ("id", "name", "alt")
+    def __init__(
+        self,
+        id: str,
+        name: str,
+        alt: Optional[Alt] = None,
+        ) -> None:
+        """
+        Init Substrate instance.
+
+        :param str id: Identifier of Substrate in pathway.
+        :param str name: KEGG identifier of compound.
+        :param Alt alt: Alternative name of element.
+        """
+
+        # TODO: verify correct format
+
+        self.id: str = id
+        self.name: str = name
+        self.alt: Optional[Alt] = alt
+
+    @staticmethod
+    def parse(item: Element, validate: bool = True) -> "Substrate":
+        """
+        Parse XML element instance to Substrate model instance.
+
+        :param xml.etree.ElementTree.Element item: XML element to parse.
+        :param bool validate: Validate attributes. Disable only for trusted input.
+        :return: Parsed Substrate model.
+        :rtype: Substrate
+        """
+
+        assert item.tag == "substrate"
+
+        parsed_substrate: Substrate = Substrate(
+            id=get_attribute(element=item, key="id", validate=validate),
+            name=get_attribute(element=item, key="name", validate=validate),
+        )
+
+        # Parse child alt elements
+        for child in item:
+            if child.tag == "alt":
+
+                # TODO warn if overwrite
+                # TODO: or raise exception (only 1 alt should be presnet)
+                # if parsed_substrate.alt is not None:
+                #     warn(message="'Alt'")
+
+                parsed_substrate.alt = Alt.parse(item=child, validate=validate)
+
+        return parsed_substrate
+
+
+    def to_xml(self) -> Element:
+        """
+        Generate XML string from Substrate element.
+
+        :return: XML string.
+        :rtype: xml.etree.ElementTree.Element
+        """
+
+        substrate_element: Element = Element(
+            "substrate",
+            attrib={
+                "id": self.id,
+                "name": self.name,
+            },
+        )
+
+        # Add optional alt element if exist
+        if self.alt is not None:
+            substrate_element.append(self.alt.to_xml())
+
+        return substrate_element
+
+
+    def pack(self, writer: BinaryWriter) -> None:
+        """
+        Write Substrate instance to binary writer.
+
+        :param BinaryWriter writer: Writer instance.
+        """
+
+        writer.write_str(self.id)
+        writer.write_str(self.name)
+
+        writer.write_int(int(self.alt is not None))
+        if self.alt is not None:
+            self.alt.pack(writer=writer)
+
+
+    @classmethod
+    def unpack(cls, reader: BinaryReader) -> "Substrate":
+        """
+        Read Substrate instance from binary reader.
+
+        :param BinaryReader reader: Reader instance.
+        :return: Substrate instance.
+        :rtype: Substrate
+        """
+
+        id, name = reader.read_required_strs(count=2)
+        return Substrate(id=id, name=name, alt=Alt.unpack(reader=reader) if reader.read_int() else None)
+
+
+    def __str__(self) -> str:
+        """
+        Build string from Substrate instance.
+
+        :return: String of Substrate instance.
+        :rtype: str
+        """
+        return f"<Substrate id='{self.id}' name='{self.name}'>"
+
+
+
+class Reaction(Serializable):
+    """
+    Reaction model.
+    """
+
+    __slots__ = ("id", "name", "type", "products", "substrates")
+
+    def __init__(
+        self,
+        id: str,
+        name: str,
+        type: str,
+        validate: bool = True,
+        ) -> None:
+        """
+        Init Reaction model instance.
+
+        :param str id: Identifier of reaction.
+        :param str name: KEGG identifer of reaction.
+        :param str type: Type of reaction. Must be contained in list of valid reaction types.
+        :param bool validate: Validate arguments. Disable only for trusted input.
+        """
+
+        if validate and type not in REACTION_TYPE:
+            raise ValueError("Type of reaction is not in list of valid reaction types.")
+
+        # TODO: check valid reaction id
+        self.id = id
+        self.name = name
+        self.type = sys.intern(type)
+
+        # Child elements of reaction
+        self.products: List[Product] = []
+        self.substrates: List[Substrate] = []
+
+
+    @staticmethod
+    def parse(item: Element, validate: bool = True) -> "Reaction":
+        """
+        Parse XML element instance to Reaction model instance.
+
+        :param xml.etree.ElementTree.Element item: XML element to parse.
+        :param bool validate: Validate attributes. Disable only for trusted input.
+        :return: Parsed Reaction model.
+        :rtype: Reaction
+        """
+
+        assert item.tag == "reaction"
+
+        # Parse reaction instance from xml attributes
+        parsed_reaction: Reaction = Reaction(
+            id=get_attribute(element=item, key="id", validate=validate),
+            name=get_attribute(element=item, key="name", validate=validate),
+            type=get_attribute(element=item, key="type", validate=validate),
+            validate=validate,
+        )
+
+        # Parse product and substrate from child elements
+        for child in item:
+            if child.tag == "product":
+                parsed_reaction.products.append(Product.parse(child, validate=validate))
+            elif child.tag == "substrate":
+                parsed_reaction.substrates.append(Substrate.parse(child, validate=validate))
+
+        return parsed_reaction
+
+
+    def to_xml(self) -> Element:
+        """
+        Generate XML string from Reaction element.
+
+        :return: XML string.
+        :rtype: xml.etree.ElementTree.Element
+        """
+
+        reaction_element: Element = Element(
+            "reaction",
+            attrib={
+                "id": self.id,
+                "name": self.name,
+                "type": self.type,
+            },
+        )
+
+        # Add substrate and product to reaction element
+
+        for substrate in self.substrates:
+            reaction_element.append(substrate.to_xml())
+
+        for product in self.products:
+            reaction_element.append(product.to_xml())
+
+
+        return reaction_element
+
+
+    def pack(self, writer: BinaryWriter) -> None:
+        """
+        Write Reaction instance, products and substrates to binary writer.
+
+        :param BinaryWriter writer: Writer instance.
+        """
+
+        writer.write_str(self.id)
+        writer.write_str(self.name)
+        writer.write_str(self.type)
+
+        writer.write_int(len(self.products))
+        for product in self.products:
+            product.pack(writer=writer)
+
+        writer.write_int(len(self.substrates))
+        for substrate in self.substrates:
+            substrate.pack(writer=writer)
+
+
+    @classmethod
+    def unpack(cls, reader: BinaryReader) -> "Reaction":
+        """
+        Read Reaction instance, products and substrates from binary reader.
+
+        :param BinaryReader reader: Reader instance.
+        :return: Reaction instance.
+        :rtype: Reaction
+        """
+
+        id, name, type = reader.read_required_strs(count=3)
+        reaction: Reaction = Reaction(id=id, name=name, type=type, validate=False)
+        reaction.products = [Product.unpack(reader=reader) for _ in range(reader.read_int())]
+        reaction.substrates = [Substrate.unpack(reader=reader) for _ in range(reader.read_int())]
+
+        return reaction
+
+
+    def __str__(self) -> str:
+        """
+        Build string of reaction instance.
+
+        :return: String of Reaction instance.
+        :rtype: str
+        """
+
+        return f"<Reaction id='{self.id}' name='{self.name}'>"
+
+
+
+
+class Pathway(Serializable):
+    """
+    KEGG Pathway object.
+    The KEGG pathway object stores graphics information and related objects.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(
+        self,
+        name: str,
+        org: str,
+        number: str,
+        title: Optional[str] = None,
+        image: Optional[str] = None,
+        link: Optional[str] = None,
+        validate: bool = True,
+        ) -> None:
+        """
+        Init KEGG Pathway model.
+
+        :param str name: Name of pathway, which is the full KEGG identifier.
+        :param str org: Organism code.
+        :param str number: Number of pathway.
+        :param typing.Optional[str] title: Title of pathway.
+        :param typing.Optional[str] image: Image for pathway provided by KEGG database.
+        :param typing.Optional[str] link: Link to pathway in KEGG database.
+        :param bool validate: Validate arguments. Disable only for trusted input.
+        """
+
+        # required parameter of pathway element
+        self.name: str = name
+        self.org: str = org
+        self.number: str = number
+
+        if validate:
+            self._validate()
+
+
+        # implied
+        self.title: Optional[str] = title
+        self.image: Optional[str] = image
+        self.link: Optional[str] = link
+
+        # children
+        self.relations: List[Relation] = []
+        self._entries: EntryList = EntryList()
+        self.reactions: List[Reaction] = []
+
+        # Memoized gene ids with entry list and version they were collected from
+        self._genes: Optional[Tuple[EntryList, int, List[str], FrozenSet[str]]] = None
+
+        # Cached graph view with entry list and version it was built from
+        self._graph: Optional[Tuple[EntryList, int, List[Relation], "PathwayGraph"]] = None
+
+
+    @property
+    def entries(self) -> EntryList:
+        """
+        Entries of pathway. Assigned lists are converted to EntryList to support indexed lookups.
+
+        :rtype: EntryList
+        """
+
+        return self._entries
+
+
+    @entries.setter
+    def entries(self, entries: Iterable[Entry]) -> None:
+        self._entries = entries if isinstance(entries, EntryList) else EntryList(entries)
+
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Pathways pickled before entries became a property store a plain list. Child models of these pickles are
+        # restored by Serializable.__setstate__, see test/pathway_legacy.dump.
+        if "entries" in state:
+            state["_entries"] = EntryList(state.pop("entries"))
+
+        state.setdefault("_genes", None)
+        state.setdefault("_graph", None)
+
+        self.__dict__.update(state)
+
+
+
+
+    def _validate(self) -> None:
+        """
+        Check format of required parameter of pathway.
+
+        :raises ValueError: Error if name, org or number are not valid or do not match.
+        """
+
+        # Check all required parameter formats
+        if not is_valid_pathway_name(value=self.name):
+            raise ValueError(f"Pathway name '{self.name}' is not a valid value.")
+
+        if not is_valid_pathway_org(value=self.org):
+            raise ValueError(f"Pathway org '{self.org}' is not a valid value.")
+
+        if not is_valid_pathway_number(value=self.number):
+            raise ValueError(f"Pathway number '{self.number}' is not a valid value.")
+
+
+        # Check match of number, org and name
+        if self.name != f"path:{self.org}{self.number}":
+            raise ValueError("Mismatch of arguments name, org and number.")
+
+
+    @staticmethod
+    def parse(
+        data: Union[Element, str],
+        backend: Optional[str] = None,
+        validate: bool = True,
+        ) -> "Pathway":
+        """
+        Parsing XML string or element in Pathway instance.
+
+        :param typing.Union[xml.etree.ElementTree.Element, str] data: String or XML element to parse.
+        :param typing.Optional[str] backend: XML parser backend for strings ("lxml" or "etree"). Fallback to lxml \
+            if installed.
+        :param bool validate: Validate attributes of pathway and all children. Disable only for trusted input, \
+            e.g. files that were parsed with validation before.
+        :return: Parsed Pathway instance.
+        :rtype: Pathway
+        """
+
+        # Generate correct format from string or XML element object
+        item: Element = parse_kgml(data=data, backend=backend) if isinstance(data, str) else data
+
+        # Init pathway instance with all required attributes
+        pathway: Pathway = Pathway._parse_attributes(item=item, validate=validate)
+
+        # Parse child items of pathway
+        for child in item:
+            pathway.parse_child(item=child, validate=validate)
+
+
+        return pathway
+
+
+    @staticmethod
+    def parse_stream(
+        source: Union[str, BinaryIO],
+        backend: Optional[str] = None,
+        validate: bool = True,
+        ) -> "Pathway":
+        """
+        Parse KGML file incrementally without building the full XML tree. Entries, relations and reactions are
+        parsed as soon as their element is closed and the element is released afterwards, which keeps peak memory
+        low for large pathways.
+
+        :param typing.Union[str, typing.BinaryIO] source: Path to KGML file or binary stream (e.g. from \
+            `Storage.open_stream`).
+        :param typing.Optional[str] backend: XML parser backend ("lxml" or "etree"). Fallback to lxml if installed.
+        :param bool validate: Validate attributes of pathway and all children. Disable only for trusted input.
+        :return: Parsed Pathway instance.
+        :rtype: Pathway
+        """
+
+        pathway: Optional[Pathway] = None
+        root: Optional[Element] = None
+        depth: int = 0
+
+        for event, element in iterparse_kgml(source=source, backend=backend):
+            if event == "start":
+                depth += 1
+
+                if depth == 1:
+                    # Attributes of root element are complete on start event
+                    root = element
+                    pathway = Pathway._parse_attributes(item=element, validate=validate)
+
+                continue
+
+            depth -= 1
+
+            if depth == 1 and pathway is not None and root is not None:
+                pathway.parse_child(item=element, validate=validate)
+
+                # Release processed children of root element
+                root.clear()
+
+        if pathway is None:
+            raise ValueError("KGML document does not contain a pathway element.")
+
+        return pathway
+
+
+    @staticmethod
+    def _parse_attributes(item: Element, validate: bool = True) -> "Pathway":
+        """
+        Init Pathway instance from attributes of pathway XML element. Children are not parsed.
+
+        :param xml.etree.ElementTree.Element item: Pathway XML element.
+        :param bool validate: Validate attributes.
+        :return: Pathway instance without children.
+        :rtype: Pathway
+        """
+
+        return Pathway(
+            name=get_attribute(element=item, key="name", validate=validate),
+            org=get_attribute(element=item, key="org", validate=validate),
+            number=get_attribute(element=item, key="number", validate=validate),
+            title=item.get("title"),
+            image=item.get("image"),
+            link=item.get("link"),
+            validate=validate,
+        )
+
+
+    def parse_child(self, item: Element, validate: bool = True) -> None:
+        """
+        Parse child XML element of pathway and add it to entries, relations or reactions.
+
+        :param xml.etree.ElementTree.Element item: Child XML element.
+        :param bool validate: Validate attributes.
+        """
+
+        if item.tag == "entry":
+            self.entries.append(Entry.parse(item, validate=validate))
+        elif item.tag == "relation":
+            self.relations.append(Relation.parse(item, validate=validate))
+        elif item.tag == "reaction":
+            self.reactions.append(Reaction.parse(item, validate=validate))
+
+
+    def to_xml(self) -> Element:
+        """
+        Generate XML element from Pathway instance and its children.
+
+        :return: XML element in KGML format.
+        :rtype: xml.etree.ElementTree.Element
+        """
+
+        pathway_element: Element = Element(
+            "pathway",
+            attrib={
+                "name": self.name,
+                "org": self.org,
+                "number": self.number,
+            }
+        )
+
+        # Adding optional attributes to pathway root element
+        if self.title is not None:
+            pathway_element.attrib["title"] = self.title
+
+        if self.link is not None:
+            pathway_element.attrib["link"] = self.link
+
+        if self.image is not None:
+            pathway_element.attrib["image"] = self.image
+
+
+        # add children entries, relations and reactions
+
+        for entry in self.entries:
+            pathway_element.append(entry.to_xml())
+
+        for relation in self.relations:
+            pathway_element.append(relation.to_xml())
+
+        for reaction in self.reactions:
+            pathway_element.append(reaction.to_xml())
+
+
+        return pathway_element
+
+
+    def to_xml_string(self) -> str:
+        """
+        Generate XML string from pathway instance.
+
+        :return: XML string in KGML format.
+        :rtype: str
+        """
+
+        # Generate xml header string
+        # docstring is not supported by build-in xml builer
+        xml_timestamp: str = datetime.now().astimezone().strftime("%b %d, %Y %H:%M:%S (GMT%z)")
+        xml_header: str = "<?xml version=\"1.0\"?>\n" \
+            "<!DOCTYPE pathway SYSTEM \"http://www.kegg.jp/kegg/xml/KGML_v0.7.2_.dtd\">\n" \
+            f"<!-- Creation date: {xml_timestamp} -->\n"
+
+
+        pathway_element: Element = self.to_xml()
+
+        xml_content: str = ElementTree.tostring(pathway_element).decode("utf-8")
+
+        return xml_header + xml_content
+
+
+    def get_entry_by_id(self, entry_id: str) -> Optional[Entry]:
+        """
+        Get pathway Entry object by id.
+
+        :param str entry_id: Id of Entry.
+        :return: Returns Entry instance if id is found in Pathway. Otherwise returns None.
+        :rtype: typing.Optional[Entry]
+        """
+
+        return self.entries.get_by_id(entry_id)
+
+
+    def get_entries_by_name(self, name: str) -> List[Entry]:
+        """
+        Get all pathway Entry objects with KEGG identifier in name. Names with multiple space separated identifier are
+        found by each of them.
+
+        :param str name: Single KEGG identifier (e.g. "mmu:19697").
+        :return: List of found Entry instances.
+        :rtype: typing.List[Entry]
+        """
+
+        return self.entries.get_by_name(name)
+
+
+    def get_entries_by_type(self, type: str) -> List[Entry]:
+        """
+        Get all pathway Entry objects of type.
+
+        :param str type: Type of Entry (e.g. "gene").
+        :return: List of found Entry instances.
+        :rtype: typing.List[Entry]
+        """
+
+        return self.entries.get_by_type(type)
+
+
+
+    def _collect_genes(self) -> Tuple[List[str], FrozenSet[str]]:
+        """
+        Collect unique gene ids of entries with type gene. Result is memoized until entries are changed.
+
+        :return: Gene ids in order of first occurrence and as frozenset.
+        :rtype: typing.Tuple[typing.List[str], typing.FrozenSet[str]]
+        """
+
+        entries: EntryList = self.entries
+
+        if self._genes is not None and self._genes[0] is entries and self._genes[1] == entries.version:
+            return self._genes[2], self._genes[3]
+
+        # dict keeps insertion order and uniqueness of gene ids
+        genes: Dict[str, None] = {}
+
+        for entry in entries.get_by_type("gene"):
+            for gene_id in entry.get_gene_id():
+                genes[gene_id] = None
+
+        result: List[str] = list(genes)
+        gene_set: FrozenSet[str] = frozenset(result)
+
+        self._genes = (entries, entries.version, result, gene_set)
+        return result, gene_set
+
+
+    def get_genes(self) -> List[str]:
+        """
+        List all genes from pathway. The result is memoized until the entries list is changed. In place changes of
+        name or type of an entry are not tracked.
+
+        :return: List of unique gene ids of entries with type gene, in order of occurrence.
+        :rtype: typing.List[str]
+        """
+
+        return list(self._collect_genes()[0])
+
+
+    @property
+    def gene_set(self) -> FrozenSet[str]:
+        """
+        Gene ids of pathway as frozenset for fast membership tests.
+
+        :rtype: typing.FrozenSet[str]
+        """
+
+        return self._collect_genes()[1]
+
+
+    def get_graph(self) -> "PathwayGraph":
+        """
+        Get graph view of relations with integer indexed adjacency arrays. The graph is cached until entries or
+        relations lists are changed. In place changes of attributes of entries and relations are not tracked.
+
+        :return: Graph of pathway.
+        :rtype: keggtools.graph.PathwayGraph
+        """
+
+        # pylint: disable=import-outside-toplevel,cyclic-import
+        from .graph import PathwayGraph
+
+        entries: EntryList = self.entries
+
+        if self._graph is not None and self._graph[0] is entries and self._graph[1] == entries.version and \
+            self._graph[2] is self.relations and self._graph[3].relations == self.relations:
+            return self._graph[3]
+
+        graph: PathwayGraph = PathwayGraph(pathway=self)
+        self._graph = (entries, entries.version, self.relations, graph)
+
+        return graph
+
+
+    def pack(self, writer: BinaryWriter) -> None:
+        """
+        Write Pathway instance and all children to binary writer.
+
+        :param BinaryWriter writer: Writer instance.
+        """
+
+        writer.write_str(self.name)
+        writer.write_str(self.org)
+        writer.write_str(self.number)
+        writer.write_str(self.title)
+        writer.write_str(self.image)
+        writer.write_str(self.link)
+
+        writer.write_int(len(self.entries))
+        for entry in self.entries:
+            entry.pack(writer=writer)
+
+        writer.write_int(len(self.relations))
+        for relation in self.relations:
+            relation.pack(writer=writer)
+
+        writer.write_int(len(self.reactions))
+        for reaction in self.reactions:
+            reaction.pack(writer=writer)
+
+
+    @classmethod
+    def unpack(cls, reader: BinaryReader) -> "Pathway":
+        """
+        Read Pathway instance and all children from binary reader.
+
+        :param BinaryReader reader: Reader instance.
+        :return: Pathway instance.
+        :rtype: Pathway
+        """
+
+        pathway: Pathway = Pathway(
+            name=reader.read_required_str(),
+            org=reader.read_required_str(),
+            number=reader.read_required_str(),
+            title=reader.read_str(),
+            image=reader.read_str(),
+            link=reader.read_str(),
+            validate=False,
+        )
+
+        # Lists are built at once, EntryList indexes are built on first lookup
+        pathway.entries = EntryList([Entry.unpack(reader=reader) for _ in range(reader.read_int())])
+        pathway.relations = [Relation.unpack(reader=reader) for _ in range(reader.read_int())]
+        pathway.reactions = [Reaction.unpack(reader=reader) for _ in range(reader.read_int())]
+
+        return pathway
+
+
+    def __str__(self) -> str:
+        """
+        Build string summary for KEGG pathway.
+
+        :return: String of Pathway instance.
+        :rtype: str
+        """
+        return f"<Pathway path:{self.org}{self.number} title='{self.title}'>"
+
+
+    def merge(self) -> "Pathway":
+        """
+        Merge identical entries in Pathway together and generate new pathway instance. See `merge_with_mapping`.
+
+        :return: Merged Pathway instance.
+        :rtype: Pathway
+        """
+
+        return self.merge_with_mapping()[0]
+
+
+    def merge_with_mapping(self) -> Tuple["Pathway", Dict[str, str]]:
+        """
+        Merge identical entries in Pathway together and generate new pathway instance. Entries with same name and type
+        are identical, groups are identical if they have the same components after merging. The first entry of
+        identical entries is kept. Relations, reactions, components and compound subtypes are remapped to ids of kept
+        entries, and resulting duplicates are dropped. Child elements are copied, so the original pathway is not
+        changed.
+
+        :return: Tuple of merged Pathway instance and mapping of every entry id to id of kept entry.
+        :rtype: typing.Tuple[Pathway, typing.Dict[str, str]]
+        """
+        # pylint: disable=too-many-locals
+
+        merged_pathway: Pathway = Pathway(
+            name=self.name,
+            org=self.org,
+            number=self.number,
+            title=self.title,
+            image=self.image,
+            link=self.link,
+            validate=False,
+        )
+
+        mapping: Dict[str, str] = {}
+        kept: Dict[Tuple[Any, ...], str] = {}
+        merged_entries: Dict[str, Entry] = {}
+
+        # Groups are merged after their components
+        for entry in [item for item in self.entries if item.type != "group"] + self.entries.get_by_type("group"):
+            component_ids: List[str] = list(dict.fromkeys(
+                mapping.get(component.id, component.id) for component in entry.components
+            ))
+
+            key: Tuple[Any, ...] = (entry.name, entry.type)
+            if entry.type == "group":
+                key += tuple(sorted(component_ids))
+
+            entry_id: str = kept.setdefault(key, entry.id)
+            mapping.setdefault(entry.id, entry_id)
+
+            if entry_id == entry.id and entry.id not in merged_entries:
+                merged_entry: Entry = Entry(
+                    id=entry.id,
+                    name=entry.name,
+                    type=entry.type,
+                    link=entry.link,
+                    reaction=entry.reaction,
+                    validate=False,
+                )
+                merged_entry.graphics = copy.copy(entry.graphics)
+                merged_entry.components = [Component(id=component_id, validate=False) for component_id in component_ids]
+                merged_entries[entry.id] = merged_entry
+
+        # Keep order of entries in pathway
+        merged_pathway.entries = [merged_entries[entry.id] for entry in self.entries if entry.id in merged_entries]
+
+        relations: Dict[Tuple[Any, ...], Relation] = {}
+
+        for relation in self.relations:
+            merged_relation: Relation = Relation(
+                entry1=mapping.get(relation.entry1, relation.entry1),
+                entry2=mapping.get(relation.entry2, relation.entry2),
+                type=relation.type,
+                validate=False,
+            )
+
+            for subtype in relation.subtypes:
+                # Values of compound subtypes are entry ids
+                merged_relation.subtypes.append(Subtype(
+                    name=subtype.name,
+                    value=mapping.get(subtype.value, subtype.value) if "compound" in subtype.name else subtype.value,
+                    validate=False,
+                ))
+
+            relations.setdefault((
+                merged_relation.entry1,
+                merged_relation.entry2,
+                merged_relation.type,
+                tuple((subtype.name, subtype.value) for subtype in merged_relation.subtypes),
+            ), merged_relation)
+
+        merged_pathway.relations = list(relations.values())
+
+        reactions: Dict[str, Reaction] = {}
+
+        for reaction in self.reactions:
+            reaction_id: str = mapping.get(reaction.id, reaction.id)
+
+            if reaction_id in reactions:
+                continue
+
+            merged_reaction: Reaction = Reaction(id=reaction_id, name=reaction.name, type=reaction.type, validate=False)
+
+            for product in reaction.products:
+                merged_reaction.products.append(Product(
+                    id=mapping.get(product.id, product.id),
+                    name=product.name,
+                    alt=copy.copy(product.alt),
+                ))
+
+            for substrate in reaction.substrates:
+                merged_reaction.substrates.append(Substrate(
+                    id=mapping.get(substrate.id, substrate.id),
+                    name=substrate.name,
+                    alt=copy.copy(substrate.alt),
+                ))
+
+            reactions[reaction_id] = merged_reaction
+
+        merged_pathway.reactions = list(reactions.values())
+
+        return merged_pathway, mapping
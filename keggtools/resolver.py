@@ -1,262 +1,1001 @@
-""" Resolve requests to KEGG data Api """
-
-from typing import Dict, List, Optional, Union
-# from warnings import warn
-
-import requests
-
-from .utils import (
-    parse_tsv_to_dict,
-    # is_valid_gene_name,
-)
-from .storage import Storage
-from .models import Pathway
-
-
-def _request(url: str) -> str:
-    """
-    Url request helper function.
-
-    :param str url: Url to request from.
-    """
-
-    response = requests.get(url=url)
-    response.raise_for_status()
-    return response.content.decode(encoding="utf-8")
-
-
-
-def get_gene_names(genes: List[str], max_genes: int = 50) -> Dict[str, str]:
-    """
-    Resolve KEGG gene identifer to name using to KEGG database REST Api.
-    Function is implemented outside the resolver instance, because requests are not cached and only gene identifier
-    are used.
-
-    :param typing.List[str] genes: List of gene identifer in format "<organism>:<code>"
-    :return: Dict of gene idenifier to gene name.
-    :rtype: typing.Dict[str, str]
-    """
-
-    if len(genes) == 0:
-        raise ValueError("No items to request.")
-
-    # Check maximum number of entries requests
-    # TODO: build fallback to make multiple requests from long lists (iterate over list chunks)
-    if len(genes) > max_genes:
-        raise ValueError(f"Too many entries are requested at once ({len(genes)}/50).")
-
-    # TODO check if pattern of identifer is correct
-    # for item in genes:
-    #     if not is_valid_gene_name(value=item):
-    #         raise ValueError(
-    #             f"Item '{item}' is not a valid gene identifer." \
-    #             "Identifier must be 3 letter organism code with 5 digit KEGG gene id."
-    #         )
-
-    # Build query string
-    query_string: str = "+".join(genes)
-
-    # Request without cache
-    resolve_dict: Dict[str, str] = parse_tsv_to_dict(data=_request(f"http://rest.kegg.jp/list/{query_string}"))
-
-    # Sanitize dict by splitting first entry of gene name
-    result_dict: Dict[str, str] = {}
-
-    for key, value in resolve_dict.items():
-        result_dict[key] = value.split(", ")[0]
-
-
-    # Check if all genes are in dict
-    # for item in genes:
-    #     if item not in result_dict:
-    #         warn(
-    #             message=f"Gene identifer '{item}' could not be resolved by API request.",
-    #             category=UserWarning,
-    #         )
-
-
-    return result_dict
-
-
-class Resolver:
-    """
-    KEGG pathway resolver class.
-    Request interface for KEGG API endpoint.
-    """
-
-    def __init__(
-        self,
-        cache: Optional[Union[Storage, str]] = None
-    ) -> None:
-        """
-        Init Resolver instance.
-
-        :param typing.Optional[typing.Union[Storage, str]] cache: Directory to use as cache storage or Storage instance.
-        """
-
-        # Handle different types of argument for cache
-
-        _store: Optional[Storage] = None
-
-        if isinstance(cache, str):
-            _store = Storage(cachedir=cache)
-
-        elif isinstance(cache, Storage):
-            _store = cache
-        else:
-            # Fallback to default storage with hard coded folder name
-            _store = Storage()
-
-
-        # Internal storage instance
-        self.storage: Storage = _store
-
-
-    def _cache_or_request(
-        self,
-        filename: str,
-        url: str,
-        ) -> str:
-        """
-        Load file from cache folder. If file does not exist, request from given url.
-
-        :param str filename: Filename to store in cache folder.
-        :param str url: Url to online resource to request if file is not present in cache folder.
-        :return: Returns content of file as string.
-        :rtype: str
-        """
-
-        file_data: Optional[str] = None
-
-        if self.storage.exist(filename=filename):
-
-            # return pathway list dump
-            file_data = self.storage.load(filename=filename)
-
-        else:
-
-            # Data not found in cache. Request from REST api
-
-            file_data = _request(url=url)
-
-            # Save in storage
-            self.storage.save(filename=filename, data=file_data)
-
-        return file_data
-
-
-
-
-    def get_pathway_list(
-        self,
-        organism: str,
-        ) -> Dict[str, str]:
-        """
-        Request list of pathways linked to organism.
-
-        :param str organism: 3 letter organism code used by KEGG database.
-        :return: Dict in format {<pathway-id>: <name>}.
-        :rtype: typing.Dict[str, str]
-        """
-
-        # TODO: return as list of pathway identifier ?
-
-        # TODO: verify org code
-
-        # path:mmu00010	Glycolysis / Gluconeogenesis - Mus musculus (mouse)
-        # path:<org><code>\t<name> - <org>
-
-
-        list_data: str = self._cache_or_request(
-            filename=f"pathway_list_{organism}.tsv",
-            url=f"http://rest.kegg.jp/list/pathway/{organism}"
-        )
-
-
-        pathways: Dict[str, str] = parse_tsv_to_dict(
-            data=list_data,
-        )
-
-        # return pathway list
-        return pathways
-
-
-    def get_pathway(
-        self,
-        organism: str,
-        code: str,
-        ) -> Pathway:
-        """
-        Load and parse KGML pathway by identifier.
-
-        :param str organism: 3 letter organism code used by KEGG database.
-        :param str code: Pathway identify used by KEGG database.
-        :return: Returns parsed Pathway instance.
-        :rtype: Pathway
-        """
-
-        # TODO: verify org code
-
-        data: str = self._cache_or_request(
-            filename=f"{organism}_path{code}.kgml",
-            url=f"http://rest.kegg.jp/get/{organism}{code}/kgml",
-        )
-
-        # Parse string
-        return Pathway.parse(data)
-
-
-
-    def get_compounds(self) -> Dict[str, str]:
-        """
-        Get dict of components. Request from KEGG API if not in cache.
-
-        :return: Dict of compound identifier to compound name.
-        :rtype: typing.Dict[str, str]
-        """
-
-        compound_data: str = self._cache_or_request(
-            filename="compound.tsv",
-            url="http://rest.kegg.jp/list/compound",
-        )
-
-        # Parse tsv string
-        result: Dict[str, str] = parse_tsv_to_dict(data=compound_data)
-
-        return result
-
-
-
-    def get_organism_list(self) -> Dict[str, str]:
-        """
-        Get organism codes from file or KEGG API.
-
-        :return: Dict with format {<org>: <org-name>}
-        :rtype: typing.Dict[str, str]
-        """
-
-        data: str = self._cache_or_request(
-            filename="organism.tsv",
-            url="http://rest.kegg.jp/list/organism"
-        )
-
-        result: Dict[str, str] = parse_tsv_to_dict(
-            data=data,
-            col_keys=1,
-            col_values=2,
-        )
-
-        return result
-
-
-    def check_organism(self, organism: str) -> bool:
-        """
-        Check if organism code exist.
-
-        :param str organism: 3 letter organism code used by KEGG database.
-        :return: Returns True if organism code is found in list of valid organisms.
-        :rtype: bool
-        """
-
-        organism_list = self.get_organism_list()
-        return organism_list.get(organism) is not None
+""" Resolve requests to KEGG data Api """
+# pylint: disable=too-many-lines
+
+import asyncio
+import hashlib
+import lzma
+import weakref
+import zlib
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+# from warnings import warn
+
+import requests
+
+from .throttle import RateLimiter, RetryPolicy, ThrottledAdapter
+from .utils import (
+    get_flat_file_entry_id,
+    parse_tsv_to_dict,
+    split_flat_file,
+    # is_valid_gene_name,
+)
+from .storage import MemoryCache, Storage, compress, decompress
+from .models import Pathway
+
+
+def create_session(
+    pool_size: int = 10,
+    rate_limiter: Optional[RateLimiter] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    ) -> requests.Session:
+    """
+    Create HTTP session with connection pooling and keep-alive for KEGG REST Api requests.
+
+    :param int pool_size: Maximal number of connections kept alive per host.
+    :param typing.Optional[RateLimiter] rate_limiter: Rate limiter applied to all requests of session.
+    :param typing.Optional[RetryPolicy] retry_policy: Retry policy applied to all requests of session.
+    :return: Session instance.
+    :rtype: requests.Session
+    """
+
+    if pool_size < 1:
+        raise ValueError("Pool size must be at least 1.")
+
+    session: requests.Session = requests.Session()
+    adapter: ThrottledAdapter = ThrottledAdapter(
+        rate_limiter=rate_limiter,
+        retry_policy=retry_policy,
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+    )
+
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    return session
+
+
+
+def _request(
+    url: str,
+    session: Optional[requests.Session] = None,
+    timeout: Optional[float] = None,
+    ) -> str:
+    """
+    Url request helper function.
+
+    :param str url: Url to request from.
+    :param typing.Optional[requests.Session] session: Session to use for request. Fallback to request without session.
+    :param typing.Optional[float] timeout: Timeout of request in seconds.
+    """
+
+    if session is None:
+        response = requests.get(url=url, timeout=timeout)
+    else:
+        response = session.get(url=url, timeout=timeout)
+
+    response.raise_for_status()
+    return response.content.decode(encoding="utf-8")
+
+
+
+def _request_gene_names(
+    genes: List[str],
+    session: Optional[requests.Session] = None,
+    timeout: Optional[float] = None,
+    ) -> Dict[str, str]:
+    """
+    Request names of a single chunk of gene identifier from KEGG database REST Api.
+
+    :param typing.List[str] genes: List of gene identifer in format "<organism>:<code>"
+    :param typing.Optional[requests.Session] session: Session to use for request.
+    :param typing.Optional[float] timeout: Timeout of request in seconds.
+    :return: Dict of gene idenifier to gene name.
+    :rtype: typing.Dict[str, str]
+    """
+
+    # Build query string
+    query_string: str = "+".join(genes)
+
+    resolve_dict: Dict[str, str] = parse_tsv_to_dict(data=_request(
+        url=f"http://rest.kegg.jp/list/{query_string}",
+        session=session,
+        timeout=timeout,
+    ))
+
+    # Sanitize dict by splitting first entry of gene name
+    result_dict: Dict[str, str] = {}
+
+    for key, value in resolve_dict.items():
+        result_dict[key] = value.split(", ")[0]
+
+    return result_dict
+
+
+
+def get_gene_names(
+    genes: List[str],
+    max_genes: int = 50,
+    session: Optional[requests.Session] = None,
+    timeout: Optional[float] = None,
+    storage: Optional[Storage] = None,
+    max_workers: int = 4,
+    ) -> Dict[str, str]:
+    """
+    Resolve KEGG gene identifer to name using to KEGG database REST Api.
+    Long lists of genes are split into chunks of `max_genes` identifier, which are requested concurrently. If a
+    storage instance is given, resolved names are cached in file "gene_names.tsv" and only missing genes are
+    requested.
+
+    :param typing.List[str] genes: List of gene identifer in format "<organism>:<code>"
+    :param int max_genes: Maximal number of genes per request.
+    :param typing.Optional[requests.Session] session: Session to use for request (e.g. `Resolver.session`).
+    :param typing.Optional[float] timeout: Timeout of request in seconds.
+    :param typing.Optional[Storage] storage: Storage instance to cache resolved gene names.
+    :param int max_workers: Maximal number of concurrent requests.
+    :return: Dict of gene idenifier to gene name.
+    :rtype: typing.Dict[str, str]
+    """
+
+    if len(genes) == 0:
+        raise ValueError("No items to request.")
+
+    if max_genes < 1:
+        raise ValueError("Number of genes per request must be at least 1.")
+
+    if max_workers < 1:
+        raise ValueError("Number of workers must be at least 1.")
+
+    # TODO check if pattern of identifer is correct
+    # for item in genes:
+    #     if not is_valid_gene_name(value=item):
+    #         raise ValueError(
+    #             f"Item '{item}' is not a valid gene identifer." \
+    #             "Identifier must be 3 letter organism code with 5 digit KEGG gene id."
+    #         )
+
+    cache_filename: str = "gene_names.tsv"
+    cached_names: Dict[str, str] = {}
+
+    if storage is not None and storage.exist(filename=cache_filename):
+        cached_names = parse_tsv_to_dict(data=storage.load(filename=cache_filename))
+
+    # Remove duplicates and cached genes but keep order of gene list
+    missing_genes: List[str] = [gene for gene in dict.fromkeys(genes) if gene not in cached_names]
+
+    # Split list of genes into chunks of maximal size
+    chunks: List[List[str]] = [
+        missing_genes[index:index + max_genes] for index in range(0, len(missing_genes), max_genes)
+    ]
+
+    requested_names: Dict[str, str] = {}
+
+    if len(chunks) == 1:
+        requested_names = _request_gene_names(genes=chunks[0], session=session, timeout=timeout)
+
+    elif len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+            for chunk_result in executor.map(
+                lambda chunk: _request_gene_names(genes=chunk, session=session, timeout=timeout),
+                chunks,
+            ):
+                requested_names.update(chunk_result)
+
+
+    cached_names.update(requested_names)
+
+    # Save newly resolved names to cache. Cache file is reloaded under lock to keep names saved concurrently.
+    if storage is not None and not storage.read_only and len(requested_names) > 0:
+        with storage.lock(filename=cache_filename):
+            merged_names: Dict[str, str] = {}
+
+            if storage.exist(filename=cache_filename):
+                merged_names = parse_tsv_to_dict(data=storage.load(filename=cache_filename))
+
+            merged_names.update(requested_names)
+
+            storage.save(
+                filename=cache_filename,
+                data="".join(f"{key}\t{value}\n" for key, value in merged_names.items()),
+            )
+
+
+    # Check if all genes are in dict
+    # for item in genes:
+    #     if item not in result_dict:
+    #         warn(
+    #             message=f"Gene identifer '{item}' could not be resolved by API request.",
+    #             category=UserWarning,
+    #         )
+
+    return {gene: cached_names[gene] for gene in dict.fromkeys(genes) if gene in cached_names}
+
+
+
+class Resolver:
+    """
+    KEGG pathway resolver class.
+    Request interface for KEGG API endpoint.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[Union[Storage, str]] = None,
+        session: Optional[requests.Session] = None,
+        pool_size: int = 10,
+        timeout: Optional[float] = 60.0,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        memory_cache: Optional[MemoryCache] = None,
+        parsed_cache: bool = False,
+    ) -> None:
+        """
+        Init Resolver instance.
+
+        :param typing.Optional[typing.Union[Storage, str]] cache: Directory to use as cache storage or Storage instance.
+        :param typing.Optional[requests.Session] session: HTTP session used for all requests. If not given, a session \
+            with connection pooling is created. Rate limiter and retry policy only apply to the created session.
+        :param int pool_size: Maximal number of pooled connections of created session.
+        :param typing.Optional[float] timeout: Timeout of requests in seconds. Set to None to disable timeout.
+        :param typing.Optional[RateLimiter] rate_limiter: Rate limiter shared by all requests of resolver. \
+            Disabled by default.
+        :param typing.Optional[RetryPolicy] retry_policy: Retry policy for failed requests. Fallback to default \
+            RetryPolicy instance.
+        :param typing.Optional[MemoryCache] memory_cache: In-memory LRU cache for parsed pathways and lists. Cached \
+            Pathway instances are shared between calls. Disabled by default.
+        :param bool parsed_cache: Save parsed pathways as dump next to KGML file in storage and load them instead of \
+            parsing KGML again. Disabled by default.
+        """
+
+        # Handle different types of argument for cache
+
+        _store: Optional[Storage] = None
+
+        if isinstance(cache, str):
+            _store = Storage(cachedir=cache)
+
+        elif isinstance(cache, Storage):
+            _store = cache
+        else:
+            # Fallback to default storage with hard coded folder name
+            _store = Storage()
+
+
+        # Internal storage instance
+        self.storage: Storage = _store
+
+        # Optional in-memory cache of parsed objects in front of storage
+        self.memory_cache: Optional[MemoryCache] = memory_cache
+        self.parsed_cache: bool = parsed_cache
+
+        # Rate limiter and retry policy. Counters of both instances are shared by all threads using the resolver.
+        self.rate_limiter: Optional[RateLimiter] = rate_limiter
+        self.retry_policy: RetryPolicy = retry_policy if retry_policy is not None else RetryPolicy()
+
+        # Shared HTTP session with keep-alive connections
+        self.session: requests.Session = session if session is not None else create_session(
+            pool_size=pool_size,
+            rate_limiter=self.rate_limiter,
+            retry_policy=self.retry_policy,
+        )
+        self.timeout: Optional[float] = timeout
+
+
+    @property
+    def statistics(self) -> Dict[str, float]:
+        """
+        Counters of retries and throttling for requests of resolver instance.
+
+        :return: Dict with number of retries, time spent waiting for retries and time throttled by rate limiter.
+        :rtype: typing.Dict[str, float]
+        """
+
+        return {
+            "retries": self.retry_policy.retries,
+            "retry_time": self.retry_policy.retry_time,
+            "throttled_time": self.rate_limiter.throttled_time if self.rate_limiter is not None else 0.0,
+        }
+
+
+    def close(self) -> None:
+        """
+        Close HTTP session and release pooled connections.
+        """
+
+        self.session.close()
+
+
+    def _get(self, url: str) -> str:
+        """
+        Request url with shared session of resolver instance.
+
+        :param str url: Url to request from.
+        :return: Content of response as string.
+        :rtype: str
+        """
+
+        return _request(url=url, session=self.session, timeout=self.timeout)
+
+
+    def _cache_or_request(
+        self,
+        filename: str,
+        url: str,
+        ) -> str:
+        """
+        Load file from cache folder. If file does not exist, request from given url. Concurrent misses of the same
+        file in other threads or processes wait for the first request instead of requesting again.
+
+        :param str filename: Filename to store in cache folder.
+        :param str url: Url to online resource to request if file is not present in cache folder.
+        :return: Returns content of file as string.
+        :rtype: str
+        """
+
+        file_data: Optional[str] = None
+
+        if self.storage.exist(filename=filename):
+
+            # return pathway list dump
+            return self.storage.load(filename=filename)
+
+        # Missing entries of read-only storage (e.g. bundle on offline nodes) are not requested
+        if self.storage.read_only:
+            raise FileNotFoundError(f"File '{filename}' is missing in read-only storage and is not requested.")
+
+        with self.storage.lock(filename=filename):
+
+            # Check again, because file could be saved while waiting for lock
+            if self.storage.exist(filename=filename):
+                file_data = self.storage.load(filename=filename)
+
+            else:
+
+                # Data not found in cache. Request from REST api
+
+                file_data = self._get(url=url)
+
+                # Save in storage
+                self.storage.save(filename=filename, data=file_data)
+
+        return file_data
+
+
+    def _cache_or_parse(
+        self,
+        filename: str,
+        url: str,
+        parse: Callable[[str], Any],
+        ) -> Any:
+        """
+        Load parsed object from memory cache. If object is missing or the cached file changed, load file from cache
+        folder or url and parse it.
+
+        :param str filename: Filename to store in cache folder.
+        :param str url: Url to online resource to request if file is not present in cache folder.
+        :param typing.Callable[[str], typing.Any] parse: Function to parse file content.
+        :return: Parsed object.
+        :rtype: typing.Any
+        """
+
+        if self.memory_cache is None:
+            return parse(self._cache_or_request(filename=filename, url=url))
+
+        # Expired files are a miss, even if parsed object is still in memory
+        if self.storage.exist(filename=filename):
+            cached_item: Any = self.memory_cache.get(key=filename, version=self.storage.get_version(filename=filename))
+
+            if cached_item is not None:
+                return cached_item
+
+        parsed_item: Any = parse(self._cache_or_request(filename=filename, url=url))
+
+        self.memory_cache.put(key=filename, value=parsed_item, version=self.storage.get_version(filename=filename))
+
+        return parsed_item
+
+
+    def _parse_pathway(self, filename: str, data: str) -> Pathway:
+        """
+        Parse KGML pathway. If parsed cache is enabled, the pathway is loaded from binary dump file if format version
+        and hash of KGML file match. Otherwise the KGML is parsed and a new dump is saved.
+
+        :param str filename: Filename of KGML file in cache folder.
+        :param str data: KGML file content.
+        :return: Parsed Pathway instance.
+        :rtype: Pathway
+        """
+
+        if not self.parsed_cache:
+            return Pathway.parse(data)
+
+        dump_filename: str = f"{filename}.dump"
+
+        # Dump starts with sha256 digest of KGML file followed by serialized pathway
+        checksum: bytes = hashlib.sha256(data.encode("utf-8")).digest()
+
+        if self.storage.exist(filename=dump_filename):
+            try:
+                dump: bytes = decompress(data=self.storage.load_bytes(filename=dump_filename))
+
+                if dump[:len(checksum)] == checksum:
+                    return Pathway.from_bytes(dump[len(checksum):])
+
+            except (ValueError, OSError, EOFError, zlib.error, lzma.LZMAError):
+                # Unreadable or outdated dump is replaced below
+                pass
+
+        pathway: Pathway = Pathway.parse(data)
+
+        # Dump can not be saved in read-only storage
+        if not self.storage.read_only:
+            self.storage.save_bytes(
+                filename=dump_filename,
+                data=compress(data=checksum + pathway.to_bytes(), method=self.storage.compression),
+            )
+
+        return pathway
+
+
+
+
+    def get_pathway_list(
+        self,
+        organism: str,
+        ) -> Dict[str, str]:
+        """
+        Request list of pathways linked to organism.
+
+        :param str organism: 3 letter organism code used by KEGG database.
+        :return: Dict in format {<pathway-id>: <name>}.
+        :rtype: typing.Dict[str, str]
+        """
+
+        # TODO: return as list of pathway identifier ?
+
+        # TODO: verify org code
+
+        # path:mmu00010	Glycolysis / Gluconeogenesis - Mus musculus (mouse)
+        # path:<org><code>\t<name> - <org>
+
+
+        pathways: Dict[str, str] = self._cache_or_parse(
+            filename=f"pathway_list_{organism}.tsv",
+            url=f"http://rest.kegg.jp/list/pathway/{organism}",
+            parse=lambda data: parse_tsv_to_dict(data=data),
+        )
+
+        # return copy of pathway list
+        return dict(pathways)
+
+
+    def get_pathway(
+        self,
+        organism: str,
+        code: str,
+        ) -> Pathway:
+        """
+        Load and parse KGML pathway by identifier.
+
+        :param str organism: 3 letter organism code used by KEGG database.
+        :param str code: Pathway identify used by KEGG database.
+        :return: Returns parsed Pathway instance.
+        :rtype: Pathway
+        """
+
+        # TODO: verify org code
+
+        filename: str = f"{organism}_path{code}.kgml"
+
+        pathway: Pathway = self._cache_or_parse(
+            filename=filename,
+            url=f"http://rest.kegg.jp/get/{organism}{code}/kgml",
+            parse=lambda data: self._parse_pathway(filename=filename, data=data),
+        )
+
+        return pathway
+
+
+    def get_pathways(
+        self,
+        organism: str,
+        codes: List[str],
+        max_workers: int = 8,
+        ) -> Tuple[List[Pathway], Dict[str, Exception]]:
+        """
+        Load and parse multiple KGML pathways. Pathways missing in cache are requested concurrently in a bounded
+        thread pool. A failing pathway does not abort the whole batch.
+
+        :param str organism: 3 letter organism code used by KEGG database.
+        :param typing.List[str] codes: List of pathway identifier used by KEGG database.
+        :param int max_workers: Maximal number of concurrent requests.
+        :return: Tuple of parsed Pathway instances in order of input codes and dict of pathway identifier to error \
+            for all pathways that failed to load.
+        :rtype: typing.Tuple[typing.List[Pathway], typing.Dict[str, Exception]]
+        """
+
+        if max_workers < 1:
+            raise ValueError("Number of workers must be at least 1.")
+
+        results: Dict[str, Pathway] = {}
+        errors: Dict[str, Exception] = {}
+
+        # Split cached pathways from pathways that must be requested
+        missing_codes: List[str] = []
+
+        for code in codes:
+            if code in results or code in errors or code in missing_codes:
+                continue
+
+            if self.storage.exist(filename=f"{organism}_path{code}.kgml"):
+                try:
+                    results[code] = self.get_pathway(organism=organism, code=code)
+                except Exception as error: # pylint: disable=broad-except
+                    errors[code] = error
+            else:
+                missing_codes.append(code)
+
+
+        # Request cache misses concurrently
+        if len(missing_codes) > 0:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(missing_codes))) as executor:
+                futures = {
+                    code: executor.submit(self.get_pathway, organism=organism, code=code)
+                    for code in missing_codes
+                }
+
+                for code, future in futures.items():
+                    try:
+                        results[code] = future.result()
+                    except Exception as error: # pylint: disable=broad-except
+                        errors[code] = error
+
+
+        # Keep order of input codes
+        return [results[code] for code in codes if code in results], errors
+
+
+
+    @staticmethod
+    def _build_entry_filename(entry: str) -> str:
+        """
+        Build filename of cached flat file entry.
+
+        :param str entry: KEGG identifier (e.g. "mmu:11797").
+        :return: Filename in cache folder.
+        :rtype: str
+        """
+
+        return "entry_" + entry.replace(":", "_") + ".txt"
+
+
+    def _request_entry_batch(self, batch: Dict[str, str]) -> Dict[str, str]:
+        """
+        Request batch of flat file entries and cache each record. Concurrent misses of the same entries in other
+        threads or processes wait for the batch instead of requesting again.
+
+        :param typing.Dict[str, str] batch: Dict of identifier without database prefix to requested identifier.
+        :return: Dict of requested identifier to flat file record.
+        :rtype: typing.Dict[str, str]
+        """
+
+        # Missing entries of read-only storage (e.g. bundle on offline nodes) are not requested
+        if self.storage.read_only:
+            raise FileNotFoundError(
+                f"Entries {list(batch.values())} are missing in read-only storage and are not requested."
+            )
+
+        records: Dict[str, str] = {}
+
+        with self.storage.lock_all(filenames=[self._build_entry_filename(entry=entry) for entry in batch.values()]):
+            missing: Dict[str, str] = {}
+
+            # Check again, because entries could be saved while waiting for locks
+            for suffix, entry in batch.items():
+                if self.storage.exist(filename=self._build_entry_filename(entry=entry)):
+                    records[entry] = self.storage.load(filename=self._build_entry_filename(entry=entry))
+                else:
+                    missing[suffix] = entry
+
+            if len(missing) == 0:
+                return records
+
+            for record in split_flat_file(data=self._get(url="http://rest.kegg.jp/get/" + "+".join(missing.values()))):
+                record_id: Optional[str] = get_flat_file_entry_id(record=record)
+
+                if record_id is not None and record_id in missing:
+                    records[missing[record_id]] = record
+                    self.storage.save(filename=self._build_entry_filename(entry=missing[record_id]), data=record)
+
+        return records
+
+
+    def get_entries(
+        self,
+        entries: List[str],
+        batch_size: int = 10,
+        max_workers: int = 4,
+        ) -> Tuple[Dict[str, str], Dict[str, Exception]]:
+        """
+        Load KEGG flat file entries (e.g. "path:mmu04010", "mmu:11797" or "cpd:C00001"). Entries missing in cache are
+        requested in batches of multiple "+"-joined identifier with the "/get" endpoint. The concatenated response is
+        split into records and each record is cached as a seperate file.
+
+        KGML files can not be batched, because the KEGG REST Api only allows a single entry with the "kgml" option.
+
+        :param typing.List[str] entries: List of KEGG identifier.
+        :param int batch_size: Maximal number of entries per request. The KEGG REST Api allows up to 10 entries.
+        :param int max_workers: Maximal number of concurrent requests.
+        :return: Tuple of dict of identifier to flat file record and dict of identifier to error for all entries that \
+            failed to load.
+        :rtype: typing.Tuple[typing.Dict[str, str], typing.Dict[str, Exception]]
+        """
+        # pylint: disable=too-many-locals
+
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1.")
+
+        if max_workers < 1:
+            raise ValueError("Number of workers must be at least 1.")
+
+        results: Dict[str, str] = {}
+        errors: Dict[str, Exception] = {}
+
+        # Group cache misses into batches. Identifier of records in response lack the database prefix, so suffixes
+        # must be unique within a batch to map records back to requested entries.
+        batches: List[Dict[str, str]] = []
+
+        for entry in dict.fromkeys(entries):
+            if self.storage.exist(filename=self._build_entry_filename(entry=entry)):
+                results[entry] = self.storage.load(filename=self._build_entry_filename(entry=entry))
+                continue
+
+            suffix: str = entry.split(":")[-1]
+
+            if len(batches) == 0 or len(batches[-1]) >= batch_size or suffix in batches[-1]:
+                batches.append({})
+
+            batches[-1][suffix] = entry
+
+
+        if len(batches) > 0:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+                futures = [(batch, executor.submit(self._request_entry_batch, batch)) for batch in batches]
+
+                for batch, future in futures:
+                    try:
+                        results.update(future.result())
+                    except Exception as error: # pylint: disable=broad-except
+                        for entry in batch.values():
+                            errors[entry] = error
+                        continue
+
+                    for entry in batch.values():
+                        if entry not in results:
+                            errors[entry] = KeyError(f"Entry '{entry}' not found in response.")
+
+
+        return {entry: results[entry] for entry in dict.fromkeys(entries) if entry in results}, errors
+
+
+
+    def get_compounds(self) -> Dict[str, str]:
+        """
+        Get dict of components. Request from KEGG API if not in cache.
+
+        :return: Dict of compound identifier to compound name.
+        :rtype: typing.Dict[str, str]
+        """
+
+        # Parse tsv string
+        result: Dict[str, str] = self._cache_or_parse(
+            filename="compound.tsv",
+            url="http://rest.kegg.jp/list/compound",
+            parse=lambda data: parse_tsv_to_dict(data=data),
+        )
+
+        return dict(result)
+
+
+
+    def get_organism_list(self) -> Dict[str, str]:
+        """
+        Get organism codes from file or KEGG API.
+
+        :return: Dict with format {<org>: <org-name>}
+        :rtype: typing.Dict[str, str]
+        """
+
+        result: Dict[str, str] = self._cache_or_parse(
+            filename="organism.tsv",
+            url="http://rest.kegg.jp/list/organism",
+            parse=lambda data: parse_tsv_to_dict(data=data, col_keys=1, col_values=2),
+        )
+
+        return dict(result)
+
+
+    def get_gene_names(self, genes: List[str], max_workers: int = 4) -> Dict[str, str]:
+        """
+        Resolve KEGG gene identifer to name. Resolved names are cached in storage of resolver instance.
+
+        :param typing.List[str] genes: List of gene identifer in format "<organism>:<code>"
+        :param int max_workers: Maximal number of concurrent requests.
+        :return: Dict of gene idenifier to gene name.
+        :rtype: typing.Dict[str, str]
+        """
+
+        return get_gene_names(
+            genes=genes,
+            session=self.session,
+            timeout=self.timeout,
+            storage=self.storage,
+            max_workers=max_workers,
+        )
+
+
+    def check_organism(self, organism: str) -> bool:
+        """
+        Check if organism code exist.
+
+        :param str organism: 3 letter organism code used by KEGG database.
+        :return: Returns True if organism code is found in list of valid organisms.
+        :rtype: bool
+        """
+
+        organism_list = self.get_organism_list()
+        return organism_list.get(organism) is not None
+
+
+    def get_release(self) -> Optional[str]:
+        """
+        Request current release of KEGG database. The release is not cached.
+
+        :return: Release string (e.g. "108.0+/10-18, Oct 23") or None if release is not found in response.
+        :rtype: typing.Optional[str]
+        """
+
+        for line in self._get(url="http://rest.kegg.jp/info/kegg").splitlines():
+            if "Release " in line:
+                return line.split("Release ", 1)[1].strip()
+
+        return None
+
+
+    def warmup(
+        self,
+        organism: str,
+        max_workers: int = 8,
+        progress: Optional[Callable[[Dict[str, int]], None]] = None,
+        ) -> Tuple[Dict[str, int], Dict[str, Exception]]:
+        """
+        Populate cache with all data of an organism: organism list, pathway list, compound list and every KGML
+        pathway. Files already present in storage are skipped, so an interrupted warmup can be resumed by calling
+        it again.
+
+        :param str organism: 3 letter organism code used by KEGG database.
+        :param int max_workers: Maximal number of concurrent requests.
+        :param typing.Optional[typing.Callable[[typing.Dict[str, int]], None]] progress: Function called with \
+            statistics after each processed file.
+        :return: Tuple of statistics dict with number of "total", "cached", "requested" and "failed" files and dict \
+            of filename to error for all files that failed to load.
+        :rtype: typing.Tuple[typing.Dict[str, int], typing.Dict[str, Exception]]
+        """
+        # pylint: disable=too-many-locals
+
+        if max_workers < 1:
+            raise ValueError("Number of workers must be at least 1.")
+
+        # List files are required to find all pathways of organism
+        files: Dict[str, str] = {
+            "organism.tsv": "http://rest.kegg.jp/list/organism",
+            "compound.tsv": "http://rest.kegg.jp/list/compound",
+        }
+
+        # Pathway list is loaded upfront and counted as requested if it was missing
+        pathway_list_filename: str = f"pathway_list_{organism}.tsv"
+        pathway_list_cached: bool = self.storage.exist(filename=pathway_list_filename)
+
+        files[pathway_list_filename] = f"http://rest.kegg.jp/list/pathway/{organism}"
+
+        for identifier in self.get_pathway_list(organism=organism):
+            # Identifier format is "path:<org><code>" or "<org><code>"
+            code: str = identifier.split(":")[-1][len(organism):]
+            files[f"{organism}_path{code}.kgml"] = f"http://rest.kegg.jp/get/{organism}{code}/kgml"
+
+        statistics: Dict[str, int] = {"total": len(files), "cached": 0, "requested": 0, "failed": 0}
+        errors: Dict[str, Exception] = {}
+
+        missing_files: List[str] = []
+
+        for filename in files:
+            if filename == pathway_list_filename and not pathway_list_cached:
+                statistics["requested"] += 1
+            elif self.storage.exist(filename=filename):
+                statistics["cached"] += 1
+            else:
+                missing_files.append(filename)
+
+        if progress is not None:
+            progress(dict(statistics))
+
+        if len(missing_files) > 0:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(missing_files))) as executor:
+                futures = {
+                    executor.submit(self._cache_or_request, filename=filename, url=files[filename]): filename
+                    for filename in missing_files
+                }
+
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                        statistics["requested"] += 1
+                    except Exception as error: # pylint: disable=broad-except
+                        errors[futures[future]] = error
+                        statistics["failed"] += 1
+
+                    if progress is not None:
+                        progress(dict(statistics))
+
+        return statistics, errors
+
+
+
+class AsyncResolver:
+    """
+    Asynchronous KEGG pathway resolver class.
+    Coroutine interface for KEGG API endpoint on top of a Resolver instance. Blocking requests, cache access and KGML
+    parsing are offloaded to an executor, so the event loop is not blocked.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[Union[Storage, str, Resolver]] = None,
+        max_concurrency: int = 16,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        """
+        Init AsyncResolver instance.
+
+        :param typing.Optional[typing.Union[Storage, str, Resolver]] cache: Directory to use as cache storage, Storage \
+            instance or Resolver instance.
+        :param int max_concurrency: Maximal number of concurrent requests and cache operations.
+        :param typing.Optional[concurrent.futures.Executor] executor: Executor to run blocking calls in. Fallback to \
+            default executor of event loop.
+        """
+
+        if max_concurrency < 1:
+            raise ValueError("Maximal concurrency must be at least 1.")
+
+        if isinstance(cache, Resolver):
+            self.resolver: Resolver = cache
+        else:
+            self.resolver = Resolver(cache=cache, pool_size=max_concurrency)
+
+        self.max_concurrency: int = max_concurrency
+        self.executor: Optional[Executor] = executor
+
+        # Semaphores are bound to event loop, so each running loop gets its own semaphore on first use. Entries of
+        # closed loops are dropped with the loop.
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
+
+
+    async def _run(self, func: Callable[..., Any], **kwargs: Any) -> Any:
+        """
+        Run blocking function in executor.
+
+        :param typing.Callable func: Function to run.
+        :return: Return value of function.
+        :rtype: typing.Any
+        """
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self.executor, partial(func, **kwargs))
+
+
+    async def _call(self, func: Callable[..., Any], **kwargs: Any) -> Any:
+        """
+        Run blocking method of resolver in executor with limited concurrency. Memory cache, parsed cache and locks of
+        the resolver are shared with synchronous calls.
+
+        :param typing.Callable func: Method of resolver to run.
+        :return: Return value of method.
+        :rtype: typing.Any
+        """
+
+        loop = asyncio.get_event_loop()
+        semaphore: Optional[asyncio.Semaphore] = self._semaphores.get(loop)
+
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+
+        async with semaphore:
+            return await self._run(func, **kwargs)
+
+
+    async def get_pathway_list(self, organism: str) -> Dict[str, str]:
+        """
+        Request list of pathways linked to organism.
+
+        :param str organism: 3 letter organism code used by KEGG database.
+        :return: Dict in format {<pathway-id>: <name>}.
+        :rtype: typing.Dict[str, str]
+        """
+
+        pathways: Dict[str, str] = await self._call(self.resolver.get_pathway_list, organism=organism)
+        return pathways
+
+
+    async def get_pathway(self, organism: str, code: str) -> Pathway:
+        """
+        Load and parse KGML pathway by identifier. Parsing is offloaded to executor.
+
+        :param str organism: 3 letter organism code used by KEGG database.
+        :param str code: Pathway identify used by KEGG database.
+        :return: Returns parsed Pathway instance.
+        :rtype: Pathway
+        """
+
+        pathway: Pathway = await self._call(self.resolver.get_pathway, organism=organism, code=code)
+        return pathway
+
+
+    async def get_pathways(
+        self,
+        organism: str,
+        codes: List[str],
+        ) -> Tuple[List[Pathway], Dict[str, Exception]]:
+        """
+        Load and parse multiple KGML pathways concurrently. A failing pathway does not abort the whole batch.
+
+        :param str organism: 3 letter organism code used by KEGG database.
+        :param typing.List[str] codes: List of pathway identifier used by KEGG database.
+        :return: Tuple of parsed Pathway instances in order of input codes and dict of pathway identifier to error \
+            for all pathways that failed to load.
+        :rtype: typing.Tuple[typing.List[Pathway], typing.Dict[str, Exception]]
+        """
+
+        unique_codes: List[str] = list(dict.fromkeys(codes))
+
+        loaded: List[Any] = await asyncio.gather(
+            *[self.get_pathway(organism=organism, code=code) for code in unique_codes],
+            return_exceptions=True,
+        )
+
+        results: Dict[str, Pathway] = {}
+        errors: Dict[str, Exception] = {}
+
+        for code, item in zip(unique_codes, loaded):
+            if isinstance(item, Exception):
+                errors[code] = item
+            else:
+                results[code] = item
+
+        return [results[code] for code in codes if code in results], errors
+
+
+    async def get_compounds(self) -> Dict[str, str]:
+        """
+        Get dict of components. Request from KEGG API if not in cache.
+
+        :return: Dict of compound identifier to compound name.
+        :rtype: typing.Dict[str, str]
+        """
+
+        compounds: Dict[str, str] = await self._call(self.resolver.get_compounds)
+        return compounds
+
+
+    async def get_organism_list(self) -> Dict[str, str]:
+        """
+        Get organism codes from file or KEGG API.
+
+        :return: Dict with format {<org>: <org-name>}
+        :rtype: typing.Dict[str, str]
+        """
+
+        organisms: Dict[str, str] = await self._call(self.resolver.get_organism_list)
+        return organisms
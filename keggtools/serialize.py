@@ -0,0 +1,341 @@
+""" Compact versioned binary serialization of KEGG pathway models """
+
+import struct
+import sys
+from array import array
+from itertools import accumulate, chain
+from typing import Any, Dict, List, Optional, Type, TypeVar
+
+
+# Magic bytes and version of binary format. Increase version when layout of any model changes.
+FORMAT_MAGIC: bytes = b"KTPW"
+FORMAT_VERSION: int = 1
+
+# Header: magic, format version, number of strings, number of values
+_HEADER: struct.Struct = struct.Struct("<4sHII")
+
+# All values are stored as little endian unsigned 32 bit integers
+_SWAP_BYTES: bool = sys.byteorder != "little"
+
+
+class BinaryWriter:
+    """
+    Writer for binary model format. All strings are stored once in a string table and referenced by index, all
+    other values are packed into a single array of unsigned integers.
+    """
+
+    def __init__(self) -> None:
+        """
+        Init BinaryWriter instance.
+        """
+
+        self.values: array = array("I")
+        self._strings: List[str] = []
+        self._string_index: Dict[str, int] = {}
+
+
+    def write_int(self, value: int) -> None:
+        """
+        Write unsigned integer.
+
+        :param int value: Value to write.
+        """
+
+        self.values.append(value)
+
+
+    def write_str(self, value: Optional[str]) -> None:
+        """
+        Write optional string as reference to string table. Index 0 is reserved for None.
+
+        :param typing.Optional[str] value: String to write.
+        """
+
+        if value is None:
+            self.values.append(0)
+            return
+
+        index: Optional[int] = self._string_index.get(value)
+
+        if index is None:
+            self._strings.append(value)
+            index = len(self._strings)
+            self._string_index[value] = index
+
+        self.values.append(index)
+
+
+    def to_bytes(self) -> bytes:
+        """
+        Build binary data with header, string table and values.
+
+        :return: Binary data.
+        :rtype: bytes
+        """
+
+        encoded_strings: List[bytes] = [item.encode("utf-8") for item in self._strings]
+        lengths: array = array("I", [len(item) for item in encoded_strings])
+        values: array = array("I", self.values)
+
+        if _SWAP_BYTES:
+            lengths.byteswap()
+            values.byteswap()
+
+        return b"".join([
+            _HEADER.pack(FORMAT_MAGIC, FORMAT_VERSION, len(encoded_strings), len(values)),
+            lengths.tobytes(),
+            b"".join(encoded_strings),
+            values.tobytes(),
+        ])
+
+
+
+class BinaryReader:
+    """
+    Reader for binary model format.
+    """
+
+    def __init__(self, data: bytes) -> None:
+        """
+        Init BinaryReader instance. Header and string table are checked and decoded at once.
+
+        :param bytes data: Binary data created by BinaryWriter.
+        """
+
+        if len(data) < _HEADER.size:
+            raise ValueError("Binary data is too short.")
+
+        magic, version, string_count, value_count = _HEADER.unpack_from(data)
+
+        if magic != FORMAT_MAGIC:
+            raise ValueError("Binary data has invalid format.")
+
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Binary format version {version} is not supported.")
+
+        offset: int = _HEADER.size
+
+        lengths: array = array("I")
+        lengths.frombytes(data[offset:offset + string_count * lengths.itemsize])
+        offset += string_count * lengths.itemsize
+
+        if _SWAP_BYTES:
+            lengths.byteswap()
+
+        # Index 0 is reserved for None
+        ends: List[int] = list(accumulate(chain((0,), lengths)))
+        table: bytes = data[offset:offset + ends[-1]]
+        text: str = table.decode("utf-8")
+        self.strings: List[Optional[str]] = [None]
+
+        # Byte offsets are character offsets of decoded table, if it is pure ASCII (KGML attributes usually are)
+        if len(text) == len(table):
+            self.strings.extend([text[start:end] for start, end in zip(ends, ends[1:])])
+        else:
+            self.strings.extend([table[start:end].decode("utf-8") for start, end in zip(ends, ends[1:])])
+
+        offset += len(table)
+
+        self.values: array = array("I")
+        self.values.frombytes(data[offset:offset + value_count * self.values.itemsize])
+        offset += value_count * self.values.itemsize
+
+        if _SWAP_BYTES:
+            self.values.byteswap()
+
+        if len(lengths) != string_count or len(self.values) != value_count or offset != len(data):
+            raise ValueError("Binary data is truncated or has trailing bytes.")
+
+        self.position: int = 0
+
+
+    def read_int(self) -> int:
+        """
+        Read unsigned integer.
+
+        :return: Read value.
+        :rtype: int
+        """
+
+        try:
+            value: int = self.values[self.position]
+        except IndexError as error:
+            raise ValueError("Unexpected end of binary data.") from error
+
+        self.position += 1
+        return value
+
+
+    def read_str(self) -> Optional[str]:
+        """
+        Read optional string from string table.
+
+        :return: Read string or None.
+        :rtype: typing.Optional[str]
+        """
+
+        try:
+            value: Optional[str] = self.strings[self.values[self.position]]
+        except IndexError as error:
+            raise ValueError("Invalid reference to string table or unexpected end of binary data.") from error
+
+        self.position += 1
+        return value
+
+
+    def read_strs(self, count: int) -> List[Optional[str]]:
+        """
+        Read multiple optional strings from string table at once.
+
+        :param int count: Number of strings to read.
+        :return: List of read strings.
+        :rtype: typing.List[typing.Optional[str]]
+        """
+
+        indices: array = self.values[self.position:self.position + count]
+
+        if len(indices) != count:
+            raise ValueError("Unexpected end of binary data.")
+
+        strings: List[Optional[str]] = self.strings
+
+        try:
+            values: List[Optional[str]] = [strings[index] for index in indices]
+        except IndexError as error:
+            raise ValueError("Invalid reference to string table.") from error
+
+        self.position += count
+        return values
+
+
+    def read_required_strs(self, count: int) -> List[str]:
+        """
+        Read multiple strings from string table at once, which must not be None.
+
+        :param int count: Number of strings to read.
+        :return: List of read strings.
+        :rtype: typing.List[str]
+        """
+
+        values: List[Optional[str]] = self.read_strs(count=count)
+
+        if None in values:
+            raise ValueError("Missing required string in binary data.")
+
+        return values # type: ignore
+
+
+    def read_required_str(self) -> str:
+        """
+        Read string from string table, which must not be None.
+
+        :return: Read string.
+        :rtype: str
+        """
+
+        value: Optional[str] = self.read_str()
+
+        if value is None:
+            raise ValueError("Missing required string in binary data.")
+
+        return value
+
+
+    def check_end(self) -> None:
+        """
+        Check all values are read.
+        """
+
+        if self.position != len(self.values):
+            raise ValueError("Binary data has unread values.")
+
+
+
+SerializableT = TypeVar("SerializableT", bound="Serializable")
+
+
+class Serializable:
+    """
+    Mixin for models with binary serialization. Models implement `pack` and `unpack`.
+    """
+
+    # Empty slots to keep slotted models free of an instance dict
+    __slots__ = ()
+
+
+    def __setstate__(self, state: Any) -> None:
+        """
+        Restore pickled model. Models pickled before they used slots (e.g. dumps of `Storage.save_dump`) store their
+        attributes as dict, slotted models store a tuple of instance dict (None) and dict of slots.
+
+        :param typing.Any state: Pickled state.
+        """
+
+        if isinstance(state, tuple):
+            dict_state, slot_state = state
+            state = dict(dict_state or {}, **(slot_state or {}))
+
+        for key, value in state.items():
+            setattr(self, key, value)
+
+
+    def pack(self, writer: BinaryWriter) -> None:
+        """
+        Write model to binary writer.
+
+        :param BinaryWriter writer: Writer instance.
+        """
+
+        raise NotImplementedError()
+
+
+    @classmethod
+    def unpack(cls: Type[SerializableT], reader: BinaryReader) -> SerializableT:
+        """
+        Read model from binary reader.
+
+        :param BinaryReader reader: Reader instance.
+        :return: Model instance.
+        """
+
+        raise NotImplementedError()
+
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize model into binary format.
+
+        :return: Binary data.
+        :rtype: bytes
+        """
+
+        writer: BinaryWriter = BinaryWriter()
+        writer.write_str(type(self).__name__)
+        self.pack(writer=writer)
+
+        return writer.to_bytes()
+
+
+    @classmethod
+    def from_bytes(cls: Type[SerializableT], data: bytes) -> SerializableT:
+        """
+        Deserialize model from binary format.
+
+        :param bytes data: Binary data created by `to_bytes`.
+        :return: Model instance.
+        """
+
+        reader: BinaryReader = BinaryReader(data=data)
+
+        if reader.read_str() != cls.__name__:
+            raise ValueError(f"Binary data does not contain a {cls.__name__} instance.")
+
+        # Models may read slices of values directly, so truncated data or invalid references end up as IndexError
+        try:
+            instance: SerializableT = cls.unpack(reader=reader)
+        except IndexError as error:
+            raise ValueError("Binary data is truncated or has invalid references.") from error
+
+        reader.check_end()
+
+        return instance
@@ -1,149 +1,1389 @@
-""" Storage of KEGG data. Caching downloaded files from API to local file system. """
-
-import os
-import pickle
-from typing import Any, Optional
-
-
-class Storage:
-    """
-    Storage handler class.
-    """
-
-    def __init__(self, cachedir: Optional[str] = None) -> None:
-        """
-        Init KEGG data storage instance.
-
-        :param typing.Optional[str] cachedir: Path to folder to use as cache.
-        """
-
-        if cachedir is None:
-            # Cachedir argument not given. Fallback to default cache directory
-            cachedir = os.path.join(os.getcwd(), ".keggtools_cache")
-
-
-        if os.path.isdir(cachedir) is False:
-            # Directory does not exist. Auto-generate diretory
-            os.mkdir(cachedir)
-            # logging.info("Cache folder '%s' does not exist. Auto-generating folder.", cachedir)
-            # raise NotADirectoryError(f"Directory '{cachedir}' does not exist.")
-
-
-        self.cachedir = cachedir
-
-
-
-    def check_cache_dir(self) -> None:
-        """
-        Checks if cache dir exist. Raises "NotADirectoryError" of caching folder not found.
-
-        :raises NotADirectoryError: Error if cache folder does not exist.
-        """
-
-        if os.path.isdir(self.cachedir) is False:
-            raise NotADirectoryError(f"Directory '{self.cachedir}' does not exist.")
-
-
-
-    def build_cache_path(self, filename: str) -> str:
-        """
-        Build absolute filename for caching directory.
-
-        :param str filename: Name of file (is used as suffix to cache directory).
-        :return: Full filename with is inside cache folder.
-        :rtype: str
-        """
-
-        self.check_cache_dir()
-        return os.path.join(self.cachedir, filename)
-
-
-    def exist(self, filename: str) -> bool:
-        """
-        Check if filename exist in caching dir.
-
-        :param str filename: Filename to check.
-        :return: Returns True if file with given name exist in cachedir.
-        :rtype: bool
-        """
-
-        self.check_cache_dir()
-        return os.path.isfile(os.path.join(self.cachedir, filename))
-
-
-    def save(self, filename: str, data: str) -> str:
-        """
-        Save string as file in local storage. Returns absolute filename of save file.
-
-        :param str filename: Filename to storage file at.
-        :param str data: String data to save to cache file.
-        :return: Full filename to cached file.
-        :rtype: str
-        """
-
-        self.check_cache_dir()
-        path: str = self.build_cache_path(filename=filename)
-
-        with open(path, "w", encoding="utf-8") as f_obj:
-            f_obj.write(data)
-            f_obj.close()
-
-        return path
-
-
-    def save_dump(self, filename: str, data: Any) -> str:
-        """
-        Save binary dump as file in local storage. Returns absolute filename of save file.
-
-        :param str filename: Filename to storage file at.
-        :param typing.Any data: Data to store to cache file. Can be any object.
-        :return: Full filename to cached file.
-        :rtype: str
-        """
-
-        self.check_cache_dir()
-        path: str = self.build_cache_path(filename=filename)
-
-        with open(path, "wb") as output_file:
-            pickle.dump(data, output_file)
-
-        return path
-
-
-    def load(self, filename: str) -> str:
-        """
-        Load string from file.
-
-        :param str filename: Filename of file to load from cache folder.
-        :return: File content string.
-        :rtype: str
-        """
-
-        path: str = self.build_cache_path(filename=filename)
-
-        if not os.path.isfile(path):
-            raise FileNotFoundError(f"Can not load file. File at path '{path}' does not exist.")
-
-        with open(path, "r", encoding="utf-8") as f_obj:
-            data = f_obj.read()
-            f_obj.close()
-
-        return data
-
-
-    def load_dump(self, filename: str) -> Any:
-        """
-        Load binary dump from file.
-
-        :param str filename: Filename of file to load from cache folder.
-        :return: Object from file.
-        :rtype: typing.Any
-        """
-
-        path: str = self.build_cache_path(filename=filename)
-
-        if not os.path.isfile(path):
-            raise FileNotFoundError(f"Can not load file. File at path '{path}' does not exist.")
-
-        with open(path, "rb") as input_file:
-            return pickle.load(input_file)
+""" Storage of KEGG data. Caching downloaded files from API to local file system. """
+# pylint: disable=too-many-lines
+
+import gzip
+import hashlib
+import io
+import lzma
+import mmap
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import ExitStack, contextmanager
+from typing import Any, BinaryIO, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from .bundle import BundleReader, read_manifest, write_bundle
+from .utils import create_temp_file
+
+try:
+    import fcntl
+except ImportError: # pragma: no cover
+    # Advisory file locks are not available on Windows. Fallback to locks within the process.
+    fcntl = None # type: ignore
+
+
+# Magic bytes to detect compressed entries. Gzip, xz and zstd frames start with bytes that are invalid in UTF-8
+# text, so plain cache files are never detected as compressed. Zlib streams can start with printable characters and
+# get a custom prefix.
+ZLIB_MAGIC: bytes = b"\xfeKZ"
+GZIP_MAGIC: bytes = b"\x1f\x8b"
+LZMA_MAGIC: bytes = b"\xfd7zXZ\x00"
+ZSTD_MAGIC: bytes = b"\x28\xb5\x2f\xfd"
+
+COMPRESSION_METHODS = ("zlib", "gzip", "lzma", "zstd")
+
+
+# Seconds after which hidden temporary files of atomic writes are considered left over by crashed writers
+TEMP_FILE_MAX_AGE: float = 3600.0
+
+# Number of lock files per cache folder. Cached files are assigned to lock files by checksum of their name.
+LOCK_SLOTS: int = 64
+
+# Locks of current process by lock file path, at most LOCK_SLOTS per cache folder
+_THREAD_LOCKS: Dict[str, threading.Lock] = {}
+_THREAD_LOCKS_GUARD: threading.Lock = threading.Lock()
+
+# Seconds after which locks of SQLite storage are treated as left over by a crashed process
+SQLITE_LOCK_TIMEOUT: float = 600.0
+
+# Seconds between attempts to acquire lock of SQLite storage
+SQLITE_LOCK_POLL: float = 0.05
+
+
+
+def check_cache_key(key: str) -> None:
+    """
+    Check name of cache entry from untrusted source (e.g. bundle manifest) is a plain filename inside cache folder.
+
+    :param str key: Name of cache entry.
+    :raises ValueError: Error if name is empty, absolute, contains path separators or "..", or is hidden.
+    """
+
+    separators: List[str] = [os.sep] if os.altsep is None else [os.sep, os.altsep]
+
+    if not isinstance(key, str) or key == "" or key.startswith(".") or os.path.isabs(key) or \
+        any(item in key for item in separators + [".."]):
+        raise ValueError(f"Invalid name of cache entry '{key}'.")
+
+
+
+def compress(data: bytes, method: Optional[str] = None) -> bytes:
+    """
+    Compress binary data with given method. Zstd compression requires the "zstandard" package.
+
+    :param bytes data: Data to compress.
+    :param typing.Optional[str] method: Compression method ("zlib", "gzip", "lzma" or "zstd"). Data is returned \
+        unchanged if method is None.
+    :return: Compressed data.
+    :rtype: bytes
+    """
+
+    if method is None:
+        return data
+
+    if method == "zlib":
+        return ZLIB_MAGIC + zlib.compress(data)
+
+    if method == "gzip":
+        # Fixed mtime keeps output reproducible. The mtime argument of gzip.compress requires Python 3.8.
+        buffer: io.BytesIO = io.BytesIO()
+
+        with gzip.GzipFile(fileobj=buffer, mode="wb", mtime=0) as gzip_file:
+            gzip_file.write(data)
+
+        return buffer.getvalue()
+
+    if method == "lzma":
+        return lzma.compress(data)
+
+    if method == "zstd":
+        # pylint: disable=import-outside-toplevel
+        import zstandard # type: ignore
+        return zstandard.ZstdCompressor().compress(data)
+
+    raise ValueError(f"Compression method '{method}' is not supported.")
+
+
+
+def decompress(data: bytes) -> bytes:
+    """
+    Decompress binary data. Compression method is detected by header. Uncompressed data is returned unchanged.
+
+    :param bytes data: Data to decompress.
+    :return: Decompressed data.
+    :rtype: bytes
+    """
+
+    if data.startswith(ZLIB_MAGIC):
+        return zlib.decompress(data[len(ZLIB_MAGIC):])
+
+    if data.startswith(GZIP_MAGIC):
+        return gzip.decompress(data)
+
+    if data.startswith(LZMA_MAGIC):
+        return lzma.decompress(data)
+
+    if data.startswith(ZSTD_MAGIC):
+        # pylint: disable=import-outside-toplevel
+        import zstandard # type: ignore
+        return zstandard.ZstdDecompressor().decompress(data)
+
+    return data
+
+
+
+class Storage:
+    """
+    Storage handler class.
+    """
+    # pylint: disable=too-many-public-methods
+
+    def __init__(
+        self,
+        cachedir: Optional[str] = None,
+        compression: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ) -> None:
+        """
+        Init KEGG data storage instance.
+
+        :param typing.Optional[str] cachedir: Path to folder to use as cache.
+        :param typing.Optional[str] compression: Compression method for saved files ("zlib", "gzip", "lzma" or \
+            "zstd"). Set to None to save uncompressed files. Files are always loaded independent of this setting.
+        :param typing.Optional[int] max_bytes: Maximal size of all cached files in bytes. Enforced by `prune`.
+        :param typing.Optional[int] max_entries: Maximal number of cached files. Enforced by `prune`.
+        :param typing.Optional[float] ttl: Time to live of cached files in seconds, based on modification time. \
+            Expired files are treated as missing.
+        """
+
+        self._set_options(compression=compression, max_bytes=max_bytes, max_entries=max_entries, ttl=ttl)
+
+        if cachedir is None:
+            # Cachedir argument not given. Fallback to default cache directory
+            cachedir = os.path.join(os.getcwd(), ".keggtools_cache")
+
+
+        if os.path.isdir(cachedir) is False:
+            # Directory does not exist. Auto-generate diretory
+            os.mkdir(cachedir)
+            # logging.info("Cache folder '%s' does not exist. Auto-generating folder.", cachedir)
+            # raise NotADirectoryError(f"Directory '{cachedir}' does not exist.")
+
+
+        self.cachedir = cachedir
+
+
+
+    def _set_options(
+        self,
+        compression: Optional[str],
+        max_bytes: Optional[int],
+        max_entries: Optional[int],
+        ttl: Optional[float],
+    ) -> None:
+        """
+        Validate and set compression and eviction options.
+        """
+
+        if compression is not None and compression not in COMPRESSION_METHODS:
+            raise ValueError(f"Compression method '{compression}' is not supported.")
+
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError("Maximal size must not be negative.")
+
+        if max_entries is not None and max_entries < 0:
+            raise ValueError("Maximal number of entries must not be negative.")
+
+        if ttl is not None and ttl <= 0:
+            raise ValueError("Time to live must be greater than 0.")
+
+        self.compression: Optional[str] = compression
+        self.max_bytes: Optional[int] = max_bytes
+        self.max_entries: Optional[int] = max_entries
+        self.ttl: Optional[float] = ttl
+
+
+    def is_expired(self, mtime: float) -> bool:
+        """
+        Check if entry with given modification time is expired.
+
+        :param float mtime: Modification time of entry as unix timestamp.
+        :return: Returns True if time to live is set and exceeded.
+        :rtype: bool
+        """
+
+        return self.ttl is not None and time.time() - mtime > self.ttl
+
+
+    @property
+    def tracks_access(self) -> bool:
+        """
+        Check if access times are updated on load. Access times are only tracked if a size limit is set.
+
+        :return: Returns True if maximal size or maximal number of entries is set.
+        :rtype: bool
+        """
+
+        return self.max_bytes is not None or self.max_entries is not None
+
+
+    @property
+    def read_only(self) -> bool:
+        """
+        Check if storage is read-only. Missing entries of read-only storages can not be requested and saved.
+
+        :return: Returns True if entries can not be saved.
+        :rtype: bool
+        """
+
+        return False
+
+
+
+    def check_cache_dir(self) -> None:
+        """
+        Checks if cache dir exist. Raises "NotADirectoryError" of caching folder not found.
+
+        :raises NotADirectoryError: Error if cache folder does not exist.
+        """
+
+        if os.path.isdir(self.cachedir) is False:
+            raise NotADirectoryError(f"Directory '{self.cachedir}' does not exist.")
+
+
+
+    def build_cache_path(self, filename: str) -> str:
+        """
+        Build absolute filename for caching directory.
+
+        :param str filename: Name of file (is used as suffix to cache directory).
+        :return: Full filename with is inside cache folder.
+        :rtype: str
+        """
+
+        self.check_cache_dir()
+        return os.path.join(self.cachedir, filename)
+
+
+    def exist(self, filename: str) -> bool:
+        """
+        Check if filename exist in caching dir.
+
+        :param str filename: Filename to check.
+        :return: Returns True if file with given name exist in cachedir.
+        :rtype: bool
+        """
+
+        self.check_cache_dir()
+        path: str = os.path.join(self.cachedir, filename)
+
+        if self.ttl is None:
+            return os.path.isfile(path)
+
+        try:
+            return os.path.isfile(path) and not self.is_expired(mtime=os.path.getmtime(path))
+        except FileNotFoundError:
+            return False
+
+
+    def get_version(self, filename: str) -> Optional[Tuple[float, int]]:
+        """
+        Get version of cached file. Version changes whenever file is saved again.
+
+        :param str filename: Filename of cached file.
+        :return: Tuple of modification time and size of file. Returns None if file does not exist.
+        :rtype: typing.Optional[typing.Tuple[float, int]]
+        """
+
+        try:
+            stat_result: os.stat_result = os.stat(self.build_cache_path(filename=filename))
+        except FileNotFoundError:
+            return None
+
+        return (stat_result.st_mtime_ns, stat_result.st_size)
+
+
+    def save_bytes(self, filename: str, data: bytes, mtime: Optional[float] = None) -> str:
+        """
+        Save binary data as file in local storage. Returns absolute filename of save file.
+
+        :param str filename: Filename to storage file at.
+        :param bytes data: Binary data to save to cache file.
+        :param typing.Optional[float] mtime: Modification time of saved file as unix timestamp (e.g. of imported \
+            entries). Defaults to current time.
+        :return: Full filename to cached file.
+        :rtype: str
+        """
+
+        self.check_cache_dir()
+        path: str = self.build_cache_path(filename=filename)
+
+        # Write to hidden temporary file and rename, so readers never see partially written files
+        file_descriptor, temp_path = create_temp_file(directory=self.cachedir, prefix=f".{filename}.")
+
+        try:
+            with os.fdopen(file_descriptor, "wb") as f_obj:
+                f_obj.write(data)
+
+            if mtime is not None:
+                os.utime(temp_path, (time.time(), mtime))
+
+            os.replace(temp_path, path)
+
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+        return path
+
+
+    def build_lock_path(self, filename: str) -> str:
+        """
+        Build path of lock file for cached file. A fixed number of lock files is shared by all cached files, so lock
+        files do not add an inode per cached file. Lock files are hidden and ignored by `list_entries`.
+
+        :param str filename: Name of cached file.
+        :return: Full filename of lock file.
+        :rtype: str
+        """
+
+        slot: int = zlib.crc32(filename.encode("utf-8")) % LOCK_SLOTS
+        return os.path.join(self.cachedir, f".lock.{slot:02x}")
+
+
+    @contextmanager
+    def lock(self, filename: str) -> Iterator[None]:
+        """
+        Context manager to hold exclusive advisory lock for cached file. Locks are shared by threads and processes
+        using the same cache, which allows to coalesce concurrent requests of the same file. Files sharing a lock
+        file are locked together.
+
+        :param str filename: Name of cached file to lock.
+        """
+
+        self.check_cache_dir()
+
+        with _THREAD_LOCKS_GUARD:
+            thread_lock: threading.Lock = _THREAD_LOCKS.setdefault(self.build_lock_path(filename), threading.Lock())
+
+        with thread_lock:
+            if fcntl is None: # pragma: no cover
+                yield
+                return
+
+            # Lock files are opened read-only, so lock files created by other users of a shared cache can be used
+            lock_descriptor: int = os.open(self.build_lock_path(filename), os.O_RDONLY | os.O_CREAT, 0o666)
+
+            try:
+                fcntl.flock(lock_descriptor, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_descriptor, fcntl.LOCK_UN)
+            finally:
+                os.close(lock_descriptor)
+
+
+    @contextmanager
+    def lock_all(self, filenames: Iterable[str]) -> Iterator[None]:
+        """
+        Context manager to hold locks of multiple cached files, e.g. for a batch request. Lock files are locked in
+        sorted order, so concurrent callers with overlapping files do not deadlock. Files sharing a lock file are
+        locked once.
+
+        :param typing.Iterable[str] filenames: Names of cached files to lock.
+        """
+
+        lock_files: Dict[str, str] = {}
+
+        for filename in filenames:
+            lock_files.setdefault(self.build_lock_path(filename), filename)
+
+        with ExitStack() as stack:
+            for lock_path in sorted(lock_files):
+                stack.enter_context(self.lock(filename=lock_files[lock_path]))
+
+            yield
+
+
+    @staticmethod
+    def _update_access_time(path: str) -> None:
+        """
+        Update access time of file for LRU eviction. Modification time is kept with nanosecond precision, so time to
+        live and version of file do not change.
+
+        :param str path: Path of file.
+        """
+
+        os.utime(path, ns=(int(time.time() * 1e9), os.stat(path).st_mtime_ns))
+
+
+    def load_bytes(self, filename: str) -> bytes:
+        """
+        Load binary data from file.
+
+        :param str filename: Filename of file to load from cache folder.
+        :return: File content.
+        :rtype: bytes
+        """
+
+        path: str = self.build_cache_path(filename=filename)
+
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Can not load file. File at path '{path}' does not exist.")
+
+        with open(path, "rb") as f_obj:
+            data: bytes = f_obj.read()
+
+        if self.tracks_access:
+            self._update_access_time(path=path)
+
+        return data
+
+
+    def open_stream(self, filename: str) -> BinaryIO:
+        """
+        Open cached file as binary stream of decompressed content. Uncompressed, gzip and xz files are streamed from
+        disk, other compressed files are decompressed into memory.
+
+        :param str filename: Filename of file to open from cache folder.
+        :return: Binary stream. Must be closed by caller.
+        :rtype: typing.BinaryIO
+        """
+
+        path: str = self.build_cache_path(filename=filename)
+
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Can not open file. File at path '{path}' does not exist.")
+
+        with open(path, "rb") as f_obj:
+            header: bytes = f_obj.read(len(LZMA_MAGIC))
+
+        if self.tracks_access:
+            self._update_access_time(path=path)
+
+        if header.startswith(GZIP_MAGIC):
+            return gzip.open(path, "rb") # type: ignore
+
+        if header.startswith(LZMA_MAGIC):
+            return lzma.open(path, "rb") # type: ignore
+
+        if header.startswith((ZLIB_MAGIC, ZSTD_MAGIC)):
+            return io.BytesIO(decompress(data=self.load_bytes(filename=filename)))
+
+        return open(path, "rb") # pylint: disable=consider-using-with
+
+
+    def remove(self, filename: str) -> None:
+        """
+        Remove file from cache folder.
+
+        :param str filename: Filename of file to remove.
+        """
+
+        path: str = self.build_cache_path(filename=filename)
+
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Can not remove file. File at path '{path}' does not exist.")
+
+        os.remove(path)
+
+
+    def list_entries(self) -> List[Tuple[str, int, float, float]]:
+        """
+        List all cached files. Hidden files (starting with ".") are ignored.
+
+        :return: List of tuples with filename, size in bytes, modification time and access time.
+        :rtype: typing.List[typing.Tuple[str, int, float, float]]
+        """
+
+        self.check_cache_dir()
+        result: List[Tuple[str, int, float, float]] = []
+
+        for filename in os.listdir(self.cachedir):
+            if filename.startswith("."):
+                continue
+
+            try:
+                stat_result: os.stat_result = os.stat(os.path.join(self.cachedir, filename))
+            except FileNotFoundError:
+                continue
+
+            result.append((filename, stat_result.st_size, stat_result.st_mtime, stat_result.st_atime))
+
+        return result
+
+
+    def prune(self) -> Dict[str, int]:
+        """
+        Remove expired entries and evict least recently used entries until size limits are met. Entries removed by
+        other processes while pruning are skipped. Temporary files of atomic writes left over by crashed writers are
+        removed as well.
+
+        :return: Statistics of pruning with number of expired and evicted entries, removed bytes, number and size \
+            of remaining entries and number of removed temporary files.
+        :rtype: typing.Dict[str, int]
+        """
+
+        statistics: Dict[str, int] = {
+            "expired": 0,
+            "evicted": 0,
+            "removed_bytes": 0,
+            "entries": 0,
+            "bytes": 0,
+            "temp_files": self._prune_temp_files(),
+        }
+
+        remaining: List[Tuple[str, int, float, float]] = []
+
+        for filename, size, mtime, atime in self.list_entries():
+            if not self.is_expired(mtime=mtime):
+                remaining.append((filename, size, mtime, atime))
+
+            elif self._remove_existing(filename=filename):
+                statistics["expired"] += 1
+                statistics["removed_bytes"] += size
+
+
+        # Sort by last access. Least recently used entries are evicted first.
+        remaining.sort(key=lambda item: item[3])
+        total_bytes: int = sum(item[1] for item in remaining)
+        index: int = 0
+
+        while index < len(remaining) and (
+            (self.max_entries is not None and len(remaining) - index > self.max_entries) or
+            (self.max_bytes is not None and total_bytes > self.max_bytes)
+        ):
+            filename, size, _, _ = remaining[index]
+
+            if self._remove_existing(filename=filename):
+                statistics["evicted"] += 1
+                statistics["removed_bytes"] += size
+
+            total_bytes -= size
+            index += 1
+
+        statistics["entries"] = len(remaining) - index
+        statistics["bytes"] = total_bytes
+
+        return statistics
+
+
+    def _remove_existing(self, filename: str) -> bool:
+        """
+        Remove entry, if it still exists. Entries can be removed or replaced by other processes at any time.
+
+        :param str filename: Name of entry to remove.
+        :return: Returns True if entry was removed by this call.
+        :rtype: bool
+        """
+
+        try:
+            self.remove(filename=filename)
+        except FileNotFoundError:
+            return False
+
+        return True
+
+
+    def _prune_temp_files(self) -> int:
+        """
+        Remove hidden temporary files of atomic writes older than `TEMP_FILE_MAX_AGE`. Younger files may belong to
+        running writers and are kept.
+
+        :return: Number of removed temporary files.
+        :rtype: int
+        """
+
+        self.check_cache_dir()
+
+        removed: int = 0
+        max_mtime: float = time.time() - TEMP_FILE_MAX_AGE
+
+        for filename in os.listdir(self.cachedir):
+            if not filename.startswith(".") or not filename.endswith(".tmp"):
+                continue
+
+            path: str = os.path.join(self.cachedir, filename)
+
+            try:
+                if os.stat(path).st_mtime < max_mtime:
+                    os.remove(path)
+                    removed += 1
+            except FileNotFoundError:
+                # Renamed into place by writer or removed by other process
+                continue
+
+        return removed
+
+
+    def export_bundle(self, path: str, release: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Export all cached entries into a single indexed bundle file. Expired entries are skipped. Entries are stored
+        as saved in cache, so compressed entries stay compressed.
+
+        :param str path: Path of bundle file.
+        :param typing.Optional[str] release: KEGG release of cached data (see `Resolver.get_release`).
+        :return: Manifest of bundle.
+        :rtype: typing.Dict[str, typing.Any]
+        """
+
+        entries: Iterable[Tuple[str, bytes, float]] = (
+            (name, self.load_bytes(filename=name), mtime)
+            for name, _, mtime, _ in sorted(self.list_entries())
+            if not self.is_expired(mtime=mtime)
+        )
+
+        return write_bundle(path=path, entries=entries, release=release)
+
+
+    def import_bundle(self, path: str, overwrite: bool = True) -> int:
+        """
+        Import entries of bundle file into cache. Checksum of each entry is verified before saving. Imported entries
+        keep their modification time, so time to live is counted from the original download.
+
+        :param str path: Path of bundle file.
+        :param bool overwrite: Replace entries already present in cache.
+        :return: Number of imported entries.
+        :rtype: int
+        :raises ValueError: Error if bundle contains names of entries outside of cache folder. Nothing is imported.
+        """
+
+        imported: int = 0
+
+        with BundleReader(path=path) as reader:
+            # Names are checked before anything is written, bundles may come from untrusted sources
+            for key in reader.keys():
+                check_cache_key(key=key)
+
+            for key in reader.keys():
+                if not overwrite and self.exist(filename=key):
+                    continue
+
+                self.save_bytes(filename=key, data=reader.read(key=key), mtime=reader.entries[key].get("mtime"))
+                imported += 1
+
+        return imported
+
+
+    def save(self, filename: str, data: str) -> str:
+        """
+        Save string as file in local storage. Returns absolute filename of save file.
+
+        :param str filename: Filename to storage file at.
+        :param str data: String data to save to cache file.
+        :return: Full filename to cached file.
+        :rtype: str
+        """
+
+        return self.save_bytes(filename=filename, data=compress(data=data.encode("utf-8"), method=self.compression))
+
+
+    def save_many(self, items: Dict[str, str]) -> None:
+        """
+        Save multiple strings as files in local storage.
+
+        :param typing.Dict[str, str] items: Dict of filename to string data.
+        """
+
+        for filename, data in items.items():
+            self.save(filename=filename, data=data)
+
+
+    def save_dump(self, filename: str, data: Any) -> str:
+        """
+        Save binary dump as file in local storage. Returns absolute filename of save file.
+
+        :param str filename: Filename to storage file at.
+        :param typing.Any data: Data to store to cache file. Can be any object.
+        :return: Full filename to cached file.
+        :rtype: str
+        """
+
+        return self.save_bytes(filename=filename, data=compress(data=pickle.dumps(data), method=self.compression))
+
+
+    def load(self, filename: str) -> str:
+        """
+        Load string from file.
+
+        :param str filename: Filename of file to load from cache folder.
+        :return: File content string.
+        :rtype: str
+        """
+
+        return decompress(data=self.load_bytes(filename=filename)).decode("utf-8")
+
+
+    def load_dump(self, filename: str) -> Any:
+        """
+        Load binary dump from file. Dumps are unpickled, so only load files from trusted cache folders. Models can be
+        stored safely with `to_bytes` and `save_bytes`.
+
+        :param str filename: Filename of file to load from cache folder.
+        :return: Object from file.
+        :rtype: typing.Any
+        """
+
+        return pickle.loads(decompress(data=self.load_bytes(filename=filename)))
+
+
+
+
+class SQLiteStorage(Storage):
+    """
+    Storage handler class using a single SQLite database file as cache. The database runs in WAL mode, so multiple
+    processes can read concurrently while one process writes.
+    """
+
+    def __init__(
+        self,
+        filename: Optional[str] = None,
+        timeout: float = 30.0,
+        compression: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ) -> None:
+        """
+        Init SQLite storage instance.
+
+        :param typing.Optional[str] filename: Path to database file. Fallback to ".keggtools_cache.sqlite" in current \
+            working directory.
+        :param float timeout: Seconds to wait for a locked database before raising an error.
+        :param typing.Optional[str] compression: Compression method for saved entries ("zlib", "gzip", "lzma" or \
+            "zstd"). Set to None to save uncompressed entries.
+        :param typing.Optional[int] max_bytes: Maximal size of all entries in bytes. Enforced by `prune`.
+        :param typing.Optional[int] max_entries: Maximal number of entries. Enforced by `prune`.
+        :param typing.Optional[float] ttl: Time to live of entries in seconds. Expired entries are treated as missing.
+        """
+
+        # Parent init is not called, because no cache folder is needed
+        # pylint: disable=super-init-not-called
+
+        self._set_options(compression=compression, max_bytes=max_bytes, max_entries=max_entries, ttl=ttl)
+
+        if filename is None:
+            filename = os.path.join(os.getcwd(), ".keggtools_cache.sqlite")
+
+        self.filename: str = os.path.abspath(filename)
+        self.cachedir = os.path.dirname(self.filename)
+        self.timeout: float = timeout
+
+        # Connections can not be shared between threads or forked processes
+        self._local: threading.local = threading.local()
+
+        self.check_cache_dir()
+
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries (" \
+                "key TEXT PRIMARY KEY, data BLOB NOT NULL, size INTEGER NOT NULL, mtime REAL NOT NULL, atime REAL)"
+            )
+
+            connection.execute("CREATE TABLE IF NOT EXISTS locks (key TEXT PRIMARY KEY, acquired REAL NOT NULL)")
+
+            # Migrate databases created without access time column
+            columns: List[str] = [row[1] for row in connection.execute("PRAGMA table_info(entries)")]
+
+            if "atime" not in columns:
+                connection.execute("ALTER TABLE entries ADD COLUMN atime REAL")
+
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Get database connection of current thread and process. Connection is created on first access.
+
+        :return: Database connection.
+        :rtype: sqlite3.Connection
+        """
+
+        connection: Optional[sqlite3.Connection] = getattr(self._local, "connection", None)
+
+        if connection is None or getattr(self._local, "pid", None) != os.getpid():
+            connection = sqlite3.connect(self.filename, timeout=self.timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+
+        return connection
+
+
+    def close(self) -> None:
+        """
+        Close database connection of current thread.
+        """
+
+        connection: Optional[sqlite3.Connection] = getattr(self._local, "connection", None)
+
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+    def build_cache_path(self, filename: str) -> str:
+        """
+        Build virtual path of entry inside database file.
+
+        :param str filename: Name of entry.
+        :return: Path of database file joined with name of entry.
+        :rtype: str
+        """
+
+        return os.path.join(self.filename, filename)
+
+
+    @contextmanager
+    def lock(self, filename: str) -> Iterator[None]:
+        """
+        Context manager to hold exclusive lock for entry. Locks are rows in the database, so no lock files are created
+        next to the database file. Locks left over by crashed processes are taken over after `SQLITE_LOCK_TIMEOUT`
+        seconds.
+
+        :param str filename: Name of entry to lock.
+        """
+
+        while True:
+            acquired: float = time.time()
+
+            with self._connect() as connection:
+                connection.execute(
+                    "DELETE FROM locks WHERE key = ? AND acquired < ?", (filename, acquired - SQLITE_LOCK_TIMEOUT)
+                )
+                cursor: sqlite3.Cursor = connection.execute(
+                    "INSERT OR IGNORE INTO locks (key, acquired) VALUES (?, ?)", (filename, acquired)
+                )
+
+            if cursor.rowcount == 1:
+                break
+
+            time.sleep(SQLITE_LOCK_POLL)
+
+        try:
+            yield
+        finally:
+            with self._connect() as connection:
+                connection.execute("DELETE FROM locks WHERE key = ? AND acquired = ?", (filename, acquired))
+
+
+    @contextmanager
+    def lock_all(self, filenames: Iterable[str]) -> Iterator[None]:
+        """
+        Context manager to hold locks of multiple entries. Entries are locked in sorted order, so concurrent callers
+        with overlapping entries do not deadlock.
+
+        :param typing.Iterable[str] filenames: Names of entries to lock.
+        """
+
+        with ExitStack() as stack:
+            for filename in sorted(set(filenames)):
+                stack.enter_context(self.lock(filename=filename))
+
+            yield
+
+
+    def exist(self, filename: str) -> bool:
+        """
+        Check if entry exist in database.
+
+        :param str filename: Name of entry to check.
+        :return: Returns True if entry with given name exist in database.
+        :rtype: bool
+        """
+
+        row: Optional[tuple] = self._connect().execute(
+            "SELECT mtime FROM entries WHERE key = ?", (filename,)
+        ).fetchone()
+
+        return row is not None and not self.is_expired(mtime=row[0])
+
+
+    def get_version(self, filename: str) -> Optional[Tuple[float, int]]:
+        """
+        Get version of entry. Version changes whenever entry is saved again.
+
+        :param str filename: Name of entry.
+        :return: Tuple of modification time and size of entry. Returns None if entry does not exist.
+        :rtype: typing.Optional[typing.Tuple[float, int]]
+        """
+
+        row: Optional[tuple] = self._connect().execute(
+            "SELECT mtime, size FROM entries WHERE key = ?", (filename,)
+        ).fetchone()
+
+        return (row[0], row[1]) if row is not None else None
+
+
+    def save_bytes(self, filename: str, data: bytes, mtime: Optional[float] = None) -> str:
+        """
+        Save binary data as entry in database.
+
+        :param str filename: Name of entry.
+        :param bytes data: Binary data to save.
+        :param typing.Optional[float] mtime: Modification time of entry as unix timestamp. Defaults to current time.
+        :return: Virtual path of entry.
+        :rtype: str
+        """
+
+        timestamp: float = time.time()
+
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO entries (key, data, size, mtime, atime) VALUES (?, ?, ?, ?, ?)",
+                (filename, sqlite3.Binary(data), len(data), timestamp if mtime is None else mtime, timestamp),
+            )
+
+        return self.build_cache_path(filename=filename)
+
+
+    def save_many(self, items: Dict[str, str]) -> None:
+        """
+        Save multiple strings as entries in a single transaction.
+
+        :param typing.Dict[str, str] items: Dict of entry name to string data.
+        """
+
+        timestamp: float = time.time()
+
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO entries (key, data, size, mtime, atime) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (filename, sqlite3.Binary(data), len(data), timestamp, timestamp)
+                    for filename, data in (
+                        (key, compress(data=value.encode("utf-8"), method=self.compression))
+                        for key, value in items.items()
+                    )
+                ],
+            )
+
+
+    def load_bytes(self, filename: str) -> bytes:
+        """
+        Load binary data of entry from database.
+
+        :param str filename: Name of entry.
+        :return: Binary data of entry.
+        :rtype: bytes
+        """
+
+        row: Optional[tuple] = self._connect().execute(
+            "SELECT data FROM entries WHERE key = ?", (filename,)
+        ).fetchone()
+
+        if row is None:
+            raise FileNotFoundError(f"Can not load entry. Entry '{filename}' does not exist in '{self.filename}'.")
+
+        if self.tracks_access:
+            with self._connect() as connection:
+                connection.execute("UPDATE entries SET atime = ? WHERE key = ?", (time.time(), filename))
+
+        return bytes(row[0])
+
+
+    def open_stream(self, filename: str) -> BinaryIO:
+        """
+        Open entry as binary stream of decompressed content.
+
+        :param str filename: Name of entry.
+        :return: Binary stream.
+        :rtype: typing.BinaryIO
+        """
+
+        return io.BytesIO(decompress(data=self.load_bytes(filename=filename)))
+
+
+    def remove(self, filename: str) -> None:
+        """
+        Remove entry from database.
+
+        :param str filename: Name of entry to remove.
+        """
+
+        with self._connect() as connection:
+            cursor: sqlite3.Cursor = connection.execute("DELETE FROM entries WHERE key = ?", (filename,))
+
+        if cursor.rowcount == 0:
+            raise FileNotFoundError(f"Can not remove entry. Entry '{filename}' does not exist in '{self.filename}'.")
+
+
+    def list_entries(self) -> List[Tuple[str, int, float, float]]:
+        """
+        List all entries of database.
+
+        :return: List of tuples with name, size in bytes, modification time and access time.
+        :rtype: typing.List[typing.Tuple[str, int, float, float]]
+        """
+
+        return [
+            (key, size, mtime, atime if atime is not None else mtime)
+            for key, size, mtime, atime in self._connect().execute("SELECT key, size, mtime, atime FROM entries")
+        ]
+
+
+    def _prune_temp_files(self) -> int:
+        """
+        Entries are written in transactions of the database, so there are no temporary files to remove.
+
+        :return: Number of removed temporary files.
+        :rtype: int
+        """
+
+        return 0
+
+
+
+
+class BundleStorage(Storage):
+    """
+    Read-only storage handler class serving entries of a bundle file (see `Storage.export_bundle`). The bundle is
+    memory-mapped, so all processes on a node share one page-cached copy of the data.
+    """
+
+    def __init__(self, filename: str, verify: bool = False) -> None:
+        """
+        Init bundle storage instance.
+
+        :param str filename: Path to bundle file.
+        :param bool verify: Check sha256 checksum of entries on every load.
+        """
+
+        # Parent init is not called, because no cache folder is needed
+        # pylint: disable=super-init-not-called
+
+        self._set_options(compression=None, max_bytes=None, max_entries=None, ttl=None)
+
+        self.filename: str = os.path.abspath(filename)
+        self.cachedir = os.path.dirname(self.filename)
+        self.verify: bool = verify
+
+        with open(self.filename, "rb") as f_obj:
+            self.manifest: Dict[str, Any] = read_manifest(f_obj=f_obj)
+
+            # Mapping stays valid after file is closed
+            self._mmap: mmap.mmap = mmap.mmap(f_obj.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._view: memoryview = memoryview(self._mmap)
+        self.entries: Dict[str, Dict[str, Any]] = self.manifest["entries"]
+
+
+    @property
+    def release(self) -> Optional[str]:
+        """
+        KEGG release of bundled data.
+
+        :rtype: typing.Optional[str]
+        """
+
+        release: Optional[str] = self.manifest.get("release")
+        return release
+
+
+    @property
+    def read_only(self) -> bool:
+        """
+        Bundle storage is always read-only.
+
+        :rtype: bool
+        """
+
+        return True
+
+
+    def close(self) -> None:
+        """
+        Unmap bundle file. Views returned by `load_view` must be released before.
+        """
+
+        self._view.release()
+        self._mmap.close()
+
+
+    def check_cache_dir(self) -> None:
+        """
+        Check bundle file exists.
+        """
+
+        if not os.path.isfile(self.filename):
+            raise FileNotFoundError(f"Bundle file '{self.filename}' does not exist.")
+
+
+    def build_cache_path(self, filename: str) -> str:
+        """
+        Build virtual path of entry in bundle.
+
+        :param str filename: Name of entry.
+        :return: Virtual path of entry.
+        :rtype: str
+        """
+
+        return os.path.join(self.filename, filename)
+
+
+    @contextmanager
+    def lock(self, filename: str) -> Iterator[None]:
+        """
+        Bundle is read-only, so no lock is needed.
+
+        :param str filename: Name of entry to lock.
+        """
+
+        yield
+
+
+    @contextmanager
+    def lock_all(self, filenames: Iterable[str]) -> Iterator[None]:
+        """
+        Bundle is read-only, so no lock is needed.
+
+        :param typing.Iterable[str] filenames: Names of entries to lock.
+        """
+
+        yield
+
+
+    def exist(self, filename: str) -> bool:
+        """
+        Check if entry exist in bundle.
+
+        :param str filename: Name of entry to check.
+        :return: Returns True if entry with given name exist in bundle.
+        :rtype: bool
+        """
+
+        return filename in self.entries
+
+
+    def get_version(self, filename: str) -> Optional[Tuple[float, int]]:
+        """
+        Get version of entry. Entries of bundle never change.
+
+        :param str filename: Name of entry.
+        :return: Tuple of modification time and size of entry. Returns None if entry does not exist.
+        :rtype: typing.Optional[typing.Tuple[float, int]]
+        """
+
+        item: Optional[Dict[str, Any]] = self.entries.get(filename)
+        return (item["mtime"], item["length"]) if item is not None else None
+
+
+    def load_view(self, filename: str) -> memoryview:
+        """
+        Get zero-copy view of stored entry data in memory-mapped bundle.
+
+        :param str filename: Name of entry.
+        :return: Read-only view of stored data.
+        :rtype: memoryview
+        """
+
+        item: Optional[Dict[str, Any]] = self.entries.get(filename)
+
+        if item is None:
+            raise FileNotFoundError(f"Can not load entry. Entry '{filename}' does not exist in bundle.")
+
+        view: memoryview = self._view[item["offset"]:item["offset"] + item["length"]]
+
+        if self.verify and hashlib.sha256(view).hexdigest() != item["sha256"]:
+            raise ValueError(f"Checksum of entry '{filename}' in bundle does not match.")
+
+        return view
+
+
+    def load_bytes(self, filename: str) -> bytes:
+        """
+        Load stored data of entry as bytes.
+
+        :param str filename: Name of entry.
+        :return: Stored data.
+        :rtype: bytes
+        """
+
+        return bytes(self.load_view(filename=filename))
+
+
+    def load(self, filename: str) -> str:
+        """
+        Load string from entry. Uncompressed entries are decoded directly from the memory-mapped bundle.
+
+        :param str filename: Name of entry.
+        :return: Entry content string.
+        :rtype: str
+        """
+
+        view: memoryview = self.load_view(filename=filename)
+
+        if bytes(view[:len(LZMA_MAGIC)]).startswith((ZLIB_MAGIC, GZIP_MAGIC, LZMA_MAGIC, ZSTD_MAGIC)):
+            return decompress(data=bytes(view)).decode("utf-8")
+
+        return str(view, "utf-8")
+
+
+    def save_bytes(self, filename: str, data: bytes, mtime: Optional[float] = None) -> str:
+        """
+        Bundle storage is read-only.
+
+        :raises PermissionError: Always.
+        """
+
+        raise PermissionError("Bundle storage is read-only.")
+
+
+    def open_stream(self, filename: str) -> BinaryIO:
+        """
+        Open entry as binary stream of decompressed content.
+
+        :param str filename: Name of entry.
+        :return: Binary stream.
+        :rtype: typing.BinaryIO
+        """
+
+        return io.BytesIO(decompress(data=self.load_bytes(filename=filename)))
+
+
+    def remove(self, filename: str) -> None:
+        """
+        Bundle storage is read-only.
+
+        :raises PermissionError: Always.
+        """
+
+        raise PermissionError("Bundle storage is read-only.")
+
+
+    def list_entries(self) -> List[Tuple[str, int, float, float]]:
+        """
+        List all entries of bundle.
+
+        :return: List of tuples with name, size in bytes, modification time and access time.
+        :rtype: typing.List[typing.Tuple[str, int, float, float]]
+        """
+
+        return [(key, item["length"], item["mtime"], item["mtime"]) for key, item in self.entries.items()]
+
+
+
+
+class MemoryCache:
+    """
+    Thread-safe in-memory LRU cache for parsed objects. Each item is stored with the version of the underlying
+    storage entry and is invalidated when the version changes.
+    """
+
+    def __init__(self, capacity: int = 128) -> None:
+        """
+        Init MemoryCache instance.
+
+        :param int capacity: Maximal number of cached items.
+        """
+
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1.")
+
+        self.capacity: int = capacity
+        self._items: "OrderedDict[Hashable, Tuple[Any, Any]]" = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+        # Statistics
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+
+    def __len__(self) -> int:
+        """
+        Number of cached items.
+
+        :rtype: int
+        """
+
+        return len(self._items)
+
+
+    def get(self, key: Hashable, version: Any = None) -> Optional[Any]:
+        """
+        Get cached item. Items with different version are removed.
+
+        :param typing.Hashable key: Key of item.
+        :param typing.Any version: Version of underlying storage entry.
+        :return: Cached item or None if item is missing or outdated.
+        :rtype: typing.Optional[typing.Any]
+        """
+
+        with self._lock:
+            item: Optional[Tuple[Any, Any]] = self._items.get(key)
+
+            if item is None or item[0] != version:
+                if item is not None:
+                    del self._items[key]
+
+                self.misses += 1
+                return None
+
+            # Mark item as most recently used
+            self._items.move_to_end(key)
+            self.hits += 1
+
+            return item[1]
+
+
+    def put(self, key: Hashable, value: Any, version: Any = None) -> None:
+        """
+        Add item to cache. Least recently used items are evicted if capacity is exceeded.
+
+        :param typing.Hashable key: Key of item.
+        :param typing.Any value: Item to cache.
+        :param typing.Any version: Version of underlying storage entry.
+        """
+
+        with self._lock:
+            self._items[key] = (version, value)
+            self._items.move_to_end(key)
+
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Remove item from cache.
+
+        :param typing.Hashable key: Key of item.
+        """
+
+        with self._lock:
+            self._items.pop(key, None)
+
+
+    def clear(self) -> None:
+        """
+        Remove all items from cache.
+        """
+
+        with self._lock:
+            self._items.clear()
+
+
+    @property
+    def statistics(self) -> Dict[str, int]:
+        """
+        Hit and miss statistics of cache.
+
+        :return: Dict with number of hits, misses, evictions and cached items.
+        :rtype: typing.Dict[str, int]
+        """
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "items": len(self._items),
+        }
@@ -0,0 +1,300 @@
+""" Client-side rate limiting and retry policy for requests to KEGG data Api """
+
+import os
+import random
+import struct
+import threading
+import time
+from typing import Any, Optional, Tuple
+
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout
+
+try:
+    import fcntl
+except ImportError: # pragma: no cover
+    # Advisory file locks are not available on Windows. Fallback to buckets within the process.
+    fcntl = None # type: ignore
+
+
+# State of shared bucket file: number of tokens and unix timestamp of last refill
+_BUCKET_STATE: struct.Struct = struct.Struct("<dd")
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket rate limiter. The bucket is kept in memory, so it is shared by all threads of a process.
+    Subclasses can keep the bucket elsewhere by overriding `_reserve` (see `FileRateLimiter`).
+    """
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, rate: float = 3.0, capacity: Optional[float] = None) -> None:
+        """
+        Init RateLimiter instance.
+
+        :param float rate: Number of tokens (requests) refilled per second.
+        :param typing.Optional[float] capacity: Maximal number of tokens in bucket (burst size). Fallback to rate.
+        """
+
+        if rate <= 0:
+            raise ValueError("Rate must be greater than 0.")
+
+        if capacity is None:
+            capacity = max(rate, 1.0)
+
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1.")
+
+        self.rate: float = rate
+        self.capacity: float = capacity
+
+        # Bucket starts full
+        self._tokens: float = capacity
+        self._timestamp: float = time.monotonic()
+        self._lock: threading.Lock = threading.Lock()
+
+        # Statistics
+        self.acquired: int = 0
+        self.throttled_time: float = 0.0
+
+
+    def acquire(self) -> float:
+        """
+        Take one token from bucket. Blocks until a token is available.
+
+        :return: Time in seconds the call was throttled.
+        :rtype: float
+        """
+
+        with self._lock:
+            wait_time: float = self._reserve()
+
+            self.acquired += 1
+            self.throttled_time += wait_time
+
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+        return wait_time
+
+
+    def _refill(self, tokens: float, elapsed: float) -> Tuple[float, float]:
+        """
+        Refill bucket by elapsed time and reserve one token. A negative token count is the debt paid by waiting.
+
+        :param float tokens: Number of tokens in bucket.
+        :param float elapsed: Seconds since last refill.
+        :return: Tuple of remaining tokens and time in seconds to wait for reserved token.
+        :rtype: typing.Tuple[float, float]
+        """
+
+        tokens = min(self.capacity, tokens + max(0.0, elapsed) * self.rate) - 1.0
+        return tokens, max(0.0, -tokens / self.rate)
+
+
+    def _reserve(self) -> float:
+        """
+        Reserve one token of bucket. Called with lock of instance held.
+
+        :return: Time in seconds to wait for reserved token.
+        :rtype: float
+        """
+
+        now: float = time.monotonic()
+        self._tokens, wait_time = self._refill(tokens=self._tokens, elapsed=now - self._timestamp)
+        self._timestamp = now
+
+        return wait_time
+
+
+
+class FileRateLimiter(RateLimiter):
+    """
+    Token bucket rate limiter shared by all processes using the same bucket file, e.g. workers of a warmup sharing a
+    cache folder. The bucket state is stored in the file and updated under an exclusive advisory lock. Without
+    `fcntl` (Windows) the bucket is only shared by threads of a process.
+    """
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, path: str, rate: float = 3.0, capacity: Optional[float] = None) -> None:
+        """
+        Init FileRateLimiter instance.
+
+        :param str path: Path of bucket file, e.g. hidden file in cache folder. Created if it does not exist.
+        :param float rate: Number of tokens (requests) refilled per second for all processes together.
+        :param typing.Optional[float] capacity: Maximal number of tokens in bucket (burst size). Fallback to rate.
+        """
+
+        super().__init__(rate=rate, capacity=capacity)
+        self.path: str = path
+
+
+    def _reserve(self) -> float:
+        """
+        Reserve one token of bucket file. Unix timestamps are used, because monotonic clocks are not shared between
+        processes.
+
+        :return: Time in seconds to wait for reserved token.
+        :rtype: float
+        """
+
+        if fcntl is None: # pragma: no cover
+            return super()._reserve()
+
+        file_descriptor: int = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+
+        try:
+            fcntl.flock(file_descriptor, fcntl.LOCK_EX)
+
+            now: float = time.time()
+            data: bytes = os.read(file_descriptor, _BUCKET_STATE.size)
+
+            # New or damaged bucket files start full
+            tokens, timestamp = _BUCKET_STATE.unpack(data) if len(data) == _BUCKET_STATE.size else (self.capacity, now)
+            tokens, wait_time = self._refill(tokens=tokens, elapsed=now - timestamp)
+
+            os.lseek(file_descriptor, 0, os.SEEK_SET)
+            os.write(file_descriptor, _BUCKET_STATE.pack(tokens, now))
+
+        finally:
+            # Closing the file releases the lock
+            os.close(file_descriptor)
+
+        return wait_time
+
+
+
+class RetryPolicy:
+    """
+    Retry policy with exponential backoff and full jitter.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 60.0,
+        status_codes: Tuple[int, ...] = (403, 429, 500, 502, 503, 504),
+    ) -> None:
+        """
+        Init RetryPolicy instance.
+
+        :param int max_retries: Maximal number of retries per request.
+        :param float backoff_factor: Base delay in seconds. Delay before retry n is drawn from [0, factor * 2^n].
+        :param float max_backoff: Upper limit of delay in seconds.
+        :param typing.Tuple[int, ...] status_codes: HTTP status codes to retry.
+        """
+
+        if max_retries < 0:
+            raise ValueError("Number of retries must not be negative.")
+
+        self.max_retries: int = max_retries
+        self.backoff_factor: float = backoff_factor
+        self.max_backoff: float = max_backoff
+        self.status_codes: Tuple[int, ...] = status_codes
+
+        self._lock: threading.Lock = threading.Lock()
+
+        # Statistics
+        self.retries: int = 0
+        self.retry_time: float = 0.0
+
+
+    def get_backoff(self, attempt: int, response: Optional[Response] = None) -> float:
+        """
+        Get delay before next retry. "Retry-After" header of response is respected if present.
+
+        :param int attempt: Number of failed attempts (starting with 0).
+        :param typing.Optional[requests.Response] response: Failed response.
+        :return: Delay in seconds.
+        :rtype: float
+        """
+
+        if response is not None:
+            retry_after: Optional[str] = response.headers.get("Retry-After")
+
+            if retry_after is not None and retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff)
+
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * (2 ** attempt)))
+
+
+    def wait(self, attempt: int, response: Optional[Response] = None) -> None:
+        """
+        Sleep before next retry and count retry in statistics.
+
+        :param int attempt: Number of failed attempts (starting with 0).
+        :param typing.Optional[requests.Response] response: Failed response.
+        """
+
+        delay: float = self.get_backoff(attempt=attempt, response=response)
+
+        with self._lock:
+            self.retries += 1
+            self.retry_time += delay
+
+        time.sleep(delay)
+
+
+
+class ThrottledAdapter(HTTPAdapter):
+    """
+    HTTP adapter which applies rate limiter and retry policy to every request send by a session.
+    """
+
+    def __init__(
+        self,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Init ThrottledAdapter instance.
+
+        :param typing.Optional[RateLimiter] rate_limiter: Rate limiter shared by all requests of adapter.
+        :param typing.Optional[RetryPolicy] retry_policy: Retry policy for failed requests.
+        """
+
+        super().__init__(**kwargs)
+
+        self.rate_limiter: Optional[RateLimiter] = rate_limiter
+        self.retry_policy: Optional[RetryPolicy] = retry_policy
+
+
+    # pylint: disable=arguments-differ
+    def send(self, request: PreparedRequest, **kwargs: Any) -> Response: # type: ignore
+        """
+        Send request. Failed requests are retried with backoff.
+
+        :param requests.PreparedRequest request: Request to send.
+        :return: Response of last attempt.
+        :rtype: requests.Response
+        """
+
+        max_retries: int = self.retry_policy.max_retries if self.retry_policy is not None else 0
+        attempt: int = 0
+
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            try:
+                response: Response = super().send(request, **kwargs)
+
+            except (RequestsConnectionError, Timeout):
+                if self.retry_policy is None or attempt >= max_retries:
+                    raise
+
+                self.retry_policy.wait(attempt=attempt)
+                attempt += 1
+                continue
+
+            if self.retry_policy is None or attempt >= max_retries or \
+                response.status_code not in self.retry_policy.status_codes:
+                return response
+
+            # Release connection of failed response before retry
+            response.close()
+            self.retry_policy.wait(attempt=attempt, response=response)
+            attempt += 1
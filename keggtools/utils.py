@@ -1,291 +1,500 @@
-""" Basic utils for HTTP requests, parsing and rendering """
-
-import re
-import csv
-from io import StringIO
-
-from typing import Dict, List, Optional, Union
-from xml.etree import ElementTree
-from xml.etree.ElementTree import Element
-
-
-# XML parsing helper functions
-
-
-def get_attribute(element: Element, key: str) -> str:
-    """
-    Get attribute from XML Element object. Raises KeyError is Attribute is not found or not valid.
-
-    :param xml.etree.ElementTree.Element element: XML element to get attribute from.
-    :param str key: Name of attribute.
-    :return: Value of attribute.
-    :rtype: str
-    :raises ValueError: Error if attribute does not exist or is wrong type.
-    """
-
-    value: Optional[str] = element.attrib.get(key)
-
-    # Check if value is not none and is string
-    if value is None or isinstance(value, str) is False:
-        raise ValueError(f"Value of attribute '{key}' is not a string.")
-
-    return value
-
-
-
-def get_numeric_attribute(element: Element, key: str) -> str:
-    """
-    Get attribute from XML Element object. Raises KeyError is Attribute is not found or not valid.
-
-    :param Element element: XML element to get attribute from.
-    :param str key: Name of attribute.
-    :return: Value of attribute. ValueError is raised if value is not a numeric string.
-    :rtype: str
-    :raises ValueError: Error is attribute is not a digit (numberic string), does not exist or is wrong type.
-    """
-
-    value: str = get_attribute(element=element, key=key)
-
-    # Check if string is numeric
-    if str.isnumeric(value) is False:
-        raise ValueError(f"Value of attribute '{key}' is not numeric.")
-
-    return value
-
-
-
-def parse_xml(xml_object_or_string: Union[str, Element]) -> Element:
-    """
-    Returns XML Element object from string or XML Element.
-
-    :param typing.Union[str, xml.etree.ElementTree.Element] xml_object_or_string: Input parameter to check.
-    :return: XML element instance.
-    :rtype: xml.etree.ElementTree.Element
-    """
-    if isinstance(xml_object_or_string, str):
-        return ElementTree.fromstring(xml_object_or_string)
-    return xml_object_or_string
-
-
-
-
-def parse_tsv(data: str) -> list:
-    """
-    Parse .tsv file from string
-
-    :param str data: Tsv string to parse into list.
-    :return: List of items.
-    :rtype: list
-    """
-    return list(csv.reader(StringIO(data), delimiter="\t"))
-
-
-
-def parse_tsv_to_dict(
-    data: str,
-    col_keys: int = 0,
-    col_values: int = 1,
-    ) -> Dict[str, str]:
-    """
-    Parse .tsv file from string and build dict from first two columns. Other columns are ignored.
-
-    :param str data: Tsv string to parse.
-    :param int col_keys: Number of colum to parse as dict keys (0-index).
-    :param int col_values: Number of colum to parse as dict values (0-index).
-    :return: Dict of two tsv columns.
-    :rtype: typing.Dict[str, str]
-    """
-    list_data: list = parse_tsv(data=data)
-
-    result: Dict[str, str] = {}
-
-    for row in list_data:
-        if len(row) >= 2 and row[col_keys] != "":
-            result[row[col_keys]] = row[col_values]
-
-        # TODO: handle else cases or ignore silent ?
-
-    return result
-
-
-
-class ColorGradient:
-    """
-    Create color gradient.
-    """
-
-    def __init__(
-        self,
-        start: tuple,
-        stop: tuple,
-        steps: int = 100
-    ) -> None:
-        """
-        Init ColorGradient instance.
-
-        :param tuple start: Color tuple
-        :param tuple stop: Color tuple
-        :param int steps: Number of steps.
-        """
-        self.start: tuple = start
-        self.stop: tuple = stop
-        self.steps: int = steps
-
-
-    @staticmethod
-    def to_css(color: tuple) -> str:
-        """
-        Convert color tuple to CSS rgb color string.
-
-        :param tuple color: RGB color tuple containing 3 integers
-        :return: Color as CSS string (e.g. "rgb(0, 0, 0)").
-        :rtype: str
-        """
-        # if len(color) != 3 or not all([isinstance(value, int) for value in color]):
-        #     raise ValueError("Color must be a tuple of 3 integers.")
-
-        return f"rgb({color[0]},{color[1]},{color[2]})".lower()
-
-
-    @staticmethod
-    def to_hex(color: tuple) -> str:
-        """
-        Convert color tuple to hex color string.
-
-        :param tuple color: RGB color tuple containing 3 integers.
-        :return: Hexadecimal color string (e.g. "#000000").
-        :rtype: str
-        """
-
-        # TODO: check for int type.
-        # TODO: check for 0-255 range
-
-        return f"#{color[0]:02x}{color[1]:02x}{color[2]:02x}".lower()
-
-
-    def get_list(self) -> List[str]:
-        """
-        Get gradient color as list.
-
-        :return: Returns list of hexadecimal color strings with a gradient.
-        :rtype: typing.List[str]
-        """
-
-        step_list = [index / float(self.steps) for index in range(self.steps)]
-        result = [ColorGradient._intermediate(self.stop, self.start, step) for step in step_list]
-        result.append(self.stop)
-
-
-        return [
-            ColorGradient.to_hex(code) for code in result
-        ]
-
-
-    @staticmethod
-    def _intermediate(a_var: tuple, b_var: tuple, ratio: float) -> tuple:
-        def _array_multiply(array, c_var):
-            return [element * c_var for element in array]
-
-        a_component = _array_multiply(a_var, ratio)
-        b_component = _array_multiply(b_var, 1 - ratio)
-        values: List[float] = list(map(sum, zip(a_component, b_component)))
-
-        return tuple((int(item) for item in values))
-
-
-
-
-
-def is_valid_pathway_org(value: str) -> bool:
-    """
-    Check if organism identifier is valid.
-
-    :param str value: String value to check.
-    :return: Returns True if value is a valid organism code.
-    :rtype: bool
-    """
-
-    # Organism must be 3 letter code
-    # Identifier can also be KO or Enzyme identifer
-    # TODO: validate with KEGG organism list
-    return re.match(pattern=r"^(ko|ec|[a-z]{3})$", string=value) is not None
-
-
-def is_valid_pathway_number(value: str) -> bool:
-    """
-    Check if pathway number has correct 5 digit format.
-
-    :param str value: String value to check.
-    :return: Returns True if value has the correct format of pathway number.
-    :rtype: bool
-    """
-
-    # KEGG pathway number must be a 5 digit number
-    return re.match(pattern=r"^([0-9]{5})$", string=value) is not None
-
-
-def is_valid_pathway_name(value: str) -> bool:
-    """
-    Check if combined pathway identifer is valid. String must match "path:<org><number>".
-
-    :param str value: String value to check.
-    :return: Returns True if value matches format of pathway name.
-    :rtype: bool
-    """
-
-    return re.match(pattern=r"^path:(ko|ec|[a-z]{3})([0-9]{5})$", string=value) is not None
-
-
-def is_valid_hex_color(value: str) -> bool:
-    """
-    Check if string is a valid hex color.
-
-    :param str value: String value to check.
-    :return: Returns True if value is valid hexadecimal color string.
-    :rtype: bool
-    """
-    return re.match(pattern=r"^\#([a-fA-F0-9]{6})$", string=value) is not None
-
-
-def is_valid_gene_name(value: str) -> bool:
-    """
-    Check if gene identifer is valid. String must match "<org>:<number>".
-
-    :param str value: String value to check.
-    :return: Returns True if value matches format of gene name.
-    :rtype: bool
-    """
-
-    # TODO Support ko|ec entries ???
-    return re.match(pattern=r"^([a-z]{3}):([0-9]{5})$", string=value) is not None
-
-
-
-# TODO: is a custom warning class needed
-# class MissingDataWarning(Warning):
-#     """
-#     Warning to alert user of missing data.
-#     """
-
-#     def __init__(self, message: str) -> None:
-#         """
-#         Init custom missing data warning instance.
-
-#         :param str message: Message of missing data warning.
-#         """
-
-#         # Call super init method
-#         super().__init__()
-
-#         self.message: str = message
-
-
-#     def __str__(self) -> str:
-#         """
-#         Missing data warning instance to string.
-
-#         :return: String of message.
-#         :rtype: str
-#         """
-
-#         return repr(self.message)
+""" Basic utils for HTTP requests, parsing and rendering """
+
+import os
+import re
+import csv
+import secrets
+import sys
+import threading
+from io import StringIO
+
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+from xml.etree import ElementTree
+from xml.etree.ElementTree import Element
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError: # pragma: no cover
+    # lxml is an optional dependency for faster parsing
+    lxml_etree = None
+
+
+# Available XML parser backends. lxml is used by default if it is installed.
+XML_BACKENDS = ("lxml", "etree")
+
+# lxml parsers are not shared between threads
+_LXML_PARSERS: threading.local = threading.local()
+
+
+def create_temp_file(directory: str, prefix: str, suffix: str = ".tmp") -> Tuple[int, str]:
+    """
+    Create and open new temporary file for atomic writes. Unlike `tempfile.mkstemp`, which creates owner-only files,
+    permissions follow the umask of the process like for regular files. Files renamed into place stay readable for
+    other users of a shared cache.
+
+    :param str directory: Directory to create file in.
+    :param str prefix: Prefix of filename.
+    :param str suffix: Suffix of filename.
+    :return: Tuple of file descriptor opened for writing and path of file.
+    :rtype: typing.Tuple[int, str]
+    """
+
+    flags: int = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+
+    while True:
+        path: str = os.path.join(directory, f"{prefix}{secrets.token_hex(8)}{suffix}")
+
+        try:
+            return os.open(path, flags, 0o666), path
+        except FileExistsError: # pragma: no cover
+            continue
+
+
+
+# XML parsing helper functions
+
+
+def intern_optional(value: Optional[str]) -> Optional[str]:
+    """
+    Intern string to share a single instance of repeated attribute values (e.g. types and colors) between models.
+
+    :param typing.Optional[str] value: String to intern.
+    :return: Interned string or None.
+    :rtype: typing.Optional[str]
+    """
+
+    if value is None:
+        return None
+
+    return sys.intern(value)
+
+
+def get_attribute(element: Element, key: str, validate: bool = True) -> str:
+    """
+    Get attribute from XML Element object. Raises KeyError is Attribute is not found or not valid.
+
+    :param xml.etree.ElementTree.Element element: XML element to get attribute from.
+    :param str key: Name of attribute.
+    :param bool validate: Check attribute exists and is a string. Disable only for trusted input.
+    :return: Value of attribute.
+    :rtype: str
+    :raises ValueError: Error if attribute does not exist or is wrong type.
+    """
+
+    if not validate:
+        trusted_value: str = element.get(key) # type: ignore
+        return trusted_value
+
+    value: Optional[str] = element.get(key)
+
+    # Check if value is not none and is string
+    if value is None or isinstance(value, str) is False:
+        raise ValueError(f"Value of attribute '{key}' is not a string.")
+
+    return value
+
+
+
+def get_numeric_attribute(element: Element, key: str, validate: bool = True) -> str:
+    """
+    Get attribute from XML Element object. Raises KeyError is Attribute is not found or not valid.
+
+    :param Element element: XML element to get attribute from.
+    :param str key: Name of attribute.
+    :param bool validate: Check attribute exists and is a numeric string. Disable only for trusted input.
+    :return: Value of attribute. ValueError is raised if value is not a numeric string.
+    :rtype: str
+    :raises ValueError: Error is attribute is not a digit (numberic string), does not exist or is wrong type.
+    """
+
+    if not validate:
+        trusted_value: str = element.get(key) # type: ignore
+        return trusted_value
+
+    value: str = get_attribute(element=element, key=key)
+
+    # Check if string is numeric
+    if str.isnumeric(value) is False:
+        raise ValueError(f"Value of attribute '{key}' is not numeric.")
+
+    return value
+
+
+
+def parse_xml(xml_object_or_string: Union[str, Element]) -> Element:
+    """
+    Returns XML Element object from string or XML Element.
+
+    :param typing.Union[str, xml.etree.ElementTree.Element] xml_object_or_string: Input parameter to check.
+    :return: XML element instance.
+    :rtype: xml.etree.ElementTree.Element
+    """
+    if isinstance(xml_object_or_string, str):
+        return ElementTree.fromstring(xml_object_or_string)
+    return xml_object_or_string
+
+
+
+
+def get_xml_backend(backend: Optional[str] = None) -> str:
+    """
+    Get XML parser backend. Fallback to "lxml" if lxml is installed, otherwise "etree" (xml.etree.ElementTree).
+
+    :param typing.Optional[str] backend: Name of requested backend.
+    :return: Name of backend.
+    :rtype: str
+    """
+
+    if backend is None:
+        return "lxml" if lxml_etree is not None else "etree"
+
+    if backend not in XML_BACKENDS:
+        raise ValueError(f"XML backend '{backend}' is not supported. Use one of {XML_BACKENDS}.")
+
+    if backend == "lxml" and lxml_etree is None:
+        raise ImportError("XML backend 'lxml' requires lxml installation.")
+
+    return backend
+
+
+
+def _get_lxml_parser() -> Any:
+    """
+    Get lxml parser of current thread. Comments and processing instructions are removed and no network access or
+    entity resolution is allowed.
+
+    :return: lxml XML parser.
+    :rtype: lxml.etree.XMLParser
+    """
+
+    parser: Any = getattr(_LXML_PARSERS, "parser", None)
+
+    if parser is None:
+        parser = lxml_etree.XMLParser(
+            remove_comments=True,
+            remove_pis=True,
+            no_network=True,
+            resolve_entities=False,
+        )
+        _LXML_PARSERS.parser = parser
+
+    return parser
+
+
+
+def parse_kgml(data: Union[str, bytes], backend: Optional[str] = None) -> Element:
+    """
+    Parse KGML document into root XML element. Elements of the lxml backend provide the same interface as
+    `xml.etree.ElementTree.Element` used by the model parsers.
+
+    :param typing.Union[str, bytes] data: KGML document.
+    :param typing.Optional[str] backend: XML parser backend ("lxml" or "etree"). Fallback to lxml if installed.
+    :return: Root XML element.
+    :rtype: xml.etree.ElementTree.Element
+    """
+
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+
+    if get_xml_backend(backend=backend) == "lxml":
+        lxml_element: Element = lxml_etree.fromstring(data, parser=_get_lxml_parser())
+        return lxml_element
+
+    return ElementTree.fromstring(data)
+
+
+
+def iterparse_kgml(
+    source: Union[str, BinaryIO],
+    backend: Optional[str] = None,
+    ) -> Iterator[Tuple[str, Element]]:
+    """
+    Incrementally parse KGML document. Yields "start" and "end" events with XML element.
+
+    :param typing.Union[str, typing.BinaryIO] source: Path to KGML file or binary stream.
+    :param typing.Optional[str] backend: XML parser backend ("lxml" or "etree"). Fallback to lxml if installed.
+    :return: Iterator of event and XML element.
+    :rtype: typing.Iterator[typing.Tuple[str, xml.etree.ElementTree.Element]]
+    """
+
+    if get_xml_backend(backend=backend) == "lxml":
+        return iter(lxml_etree.iterparse(
+            source,
+            events=("start", "end"),
+            remove_comments=True,
+            remove_pis=True,
+            no_network=True,
+            resolve_entities=False,
+        ))
+
+    return iter(ElementTree.iterparse(source, events=("start", "end")))
+
+
+
+def parse_tsv(data: str) -> list:
+    """
+    Parse .tsv file from string
+
+    :param str data: Tsv string to parse into list.
+    :return: List of items.
+    :rtype: list
+    """
+    return list(csv.reader(StringIO(data), delimiter="\t"))
+
+
+
+def parse_tsv_to_dict(
+    data: str,
+    col_keys: int = 0,
+    col_values: int = 1,
+    ) -> Dict[str, str]:
+    """
+    Parse .tsv file from string and build dict from first two columns. Other columns are ignored.
+
+    :param str data: Tsv string to parse.
+    :param int col_keys: Number of colum to parse as dict keys (0-index).
+    :param int col_values: Number of colum to parse as dict values (0-index).
+    :return: Dict of two tsv columns.
+    :rtype: typing.Dict[str, str]
+    """
+    list_data: list = parse_tsv(data=data)
+
+    result: Dict[str, str] = {}
+
+    for row in list_data:
+        if len(row) >= 2 and row[col_keys] != "":
+            result[row[col_keys]] = row[col_values]
+
+        # TODO: handle else cases or ignore silent ?
+
+    return result
+
+
+
+def split_flat_file(data: str) -> List[str]:
+    """
+    Split concatenated KEGG flat file response into records. Records are terminated by a "///" line.
+
+    :param str data: Flat file string with one or more records.
+    :return: List of records including terminating line.
+    :rtype: typing.List[str]
+    """
+
+    records: List[str] = []
+    buffer: List[str] = []
+
+    for line in data.splitlines(keepends=True):
+        buffer.append(line)
+
+        if line.rstrip("\r\n") == "///":
+            records.append("".join(buffer))
+            buffer = []
+
+    # Ignore trailing whitespace after last record
+    if "".join(buffer).strip() != "":
+        records.append("".join(buffer))
+
+    return records
+
+
+
+def get_flat_file_entry_id(record: str) -> Optional[str]:
+    """
+    Get identifier of KEGG flat file record from "ENTRY" field.
+
+    :param str record: Flat file record.
+    :return: Identifier of record without database prefix (e.g. "hsa04010" or "7535"). Returns None if record has \
+        no "ENTRY" field.
+    :rtype: typing.Optional[str]
+    """
+
+    for line in record.splitlines():
+        if line.startswith("ENTRY"):
+            fields: List[str] = line.split()
+            if len(fields) > 1:
+                return fields[1]
+
+    return None
+
+
+
+class ColorGradient:
+    """
+    Create color gradient.
+    """
+
+    def __init__(
+        self,
+        start: tuple,
+        stop: tuple,
+        steps: int = 100
+    ) -> None:
+        """
+        Init ColorGradient instance.
+
+        :param tuple start: Color tuple
+        :param tuple stop: Color tuple
+        :param int steps: Number of steps.
+        """
+        self.start: tuple = start
+        self.stop: tuple = stop
+        self.steps: int = steps
+
+
+    @staticmethod
+    def to_css(color: tuple) -> str:
+        """
+        Convert color tuple to CSS rgb color string.
+
+        :param tuple color: RGB color tuple containing 3 integers
+        :return: Color as CSS string (e.g. "rgb(0, 0, 0)").
+        :rtype: str
+        """
+        # if len(color) != 3 or not all([isinstance(value, int) for value in color]):
+        #     raise ValueError("Color must be a tuple of 3 integers.")
+
+        return f"rgb({color[0]},{color[1]},{color[2]})".lower()
+
+
+    @staticmethod
+    def to_hex(color: tuple) -> str:
+        """
+        Convert color tuple to hex color string.
+
+        :param tuple color: RGB color tuple containing 3 integers.
+        :return: Hexadecimal color string (e.g. "#000000").
+        :rtype: str
+        """
+
+        # TODO: check for int type.
+        # TODO: check for 0-255 range
+
+        return f"#{color[0]:02x}{color[1]:02x}{color[2]:02x}".lower()
+
+
+    def get_list(self) -> List[str]:
+        """
+        Get gradient color as list.
+
+        :return: Returns list of hexadecimal color strings with a gradient.
+        :rtype: typing.List[str]
+        """
+
+        step_list = [index / float(self.steps) for index in range(self.steps)]
+        result = [ColorGradient._intermediate(self.stop, self.start, step) for step in step_list]
+        result.append(self.stop)
+
+
+        return [
+            ColorGradient.to_hex(code) for code in result
+        ]
+
+
+    @staticmethod
+    def _intermediate(a_var: tuple, b_var: tuple, ratio: float) -> tuple:
+        def _array_multiply(array, c_var):
+            return [element * c_var for element in array]
+
+        a_component = _array_multiply(a_var, ratio)
+        b_component = _array_multiply(b_var, 1 - ratio)
+        values: List[float] = list(map(sum, zip(a_component, b_component)))
+
+        return tuple((int(item) for item in values))
+
+
+
+
+
+def is_valid_pathway_org(value: str) -> bool:
+    """
+    Check if organism identifier is valid.
+
+    :param str value: String value to check.
+    :return: Returns True if value is a valid organism code.
+    :rtype: bool
+    """
+
+    # Organism must be 3 letter code
+    # Identifier can also be KO or Enzyme identifer
+    # TODO: validate with KEGG organism list
+    return re.match(pattern=r"^(ko|ec|[a-z]{3})$", string=value) is not None
+
+
+def is_valid_pathway_number(value: str) -> bool:
+    """
+    Check if pathway number has correct 5 digit format.
+
+    :param str value: String value to check.
+    :return: Returns True if value has the correct format of pathway number.
+    :rtype: bool
+    """
+
+    # KEGG pathway number must be a 5 digit number
+    return re.match(pattern=r"^([0-9]{5})$", string=value) is not None
+
+
+def is_valid_pathway_name(value: str) -> bool:
+    """
+    Check if combined pathway identifer is valid. String must match "path:<org><number>".
+
+    :param str value: String value to check.
+    :return: Returns True if value matches format of pathway name.
+    :rtype: bool
+    """
+
+    return re.match(pattern=r"^path:(ko|ec|[a-z]{3})([0-9]{5})$", string=value) is not None
+
+
+def is_valid_hex_color(value: str) -> bool:
+    """
+    Check if string is a valid hex color.
+
+    :param str value: String value to check.
+    :return: Returns True if value is valid hexadecimal color string.
+    :rtype: bool
+    """
+    return re.match(pattern=r"^\#([a-fA-F0-9]{6})$", string=value) is not None
+
+
+def is_valid_gene_name(value: str) -> bool:
+    """
+    Check if gene identifer is valid. String must match "<org>:<number>".
+
+    :param str value: String value to check.
+    :return: Returns True if value matches format of gene name.
+    :rtype: bool
+    """
+
+    # TODO Support ko|ec entries ???
+    return re.match(pattern=r"^([a-z]{3}):([0-9]{5})$", string=value) is not None
+
+
+
+# TODO: is a custom warning class needed
+# class MissingDataWarning(Warning):
+#     """
+#     Warning to alert user of missing data.
+#     """
+
+#     def __init__(self, message: str) -> None:
+#         """
+#         Init custom missing data warning instance.
+
+#         :param str message: Message of missing data warning.
+#         """
+
+#         # Call super init method
+#         super().__init__()
+
+#         self.message: str = message
+
+
+#     def __str__(self) -> str:
+#         """
+#         Missing data warning instance to string.
+
+#         :return: String of message.
+#         :rtype: str
+#         """
+
+#         return repr(self.message)
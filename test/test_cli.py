@@ -0,0 +1,78 @@
+""" Testing command line interface """
+
+import io
+import os
+from typing import Dict
+
+import pytest
+from responses import RequestsMock, GET as HTTP_METHOD_GET
+
+from keggtools.cli import RATE_LIMIT_FILENAME, WarmupProgress, format_duration, main
+from keggtools.storage import Storage
+
+from .conftest import CACHEDIR
+
+
+def test_format_duration() -> None:
+    """
+    Testing formatting of durations.
+    """
+
+    assert format_duration(seconds=4.6) == "5s"
+    assert format_duration(seconds=125) == "2m05s"
+    assert format_duration(seconds=3725) == "1h02m05s"
+
+
+
+def test_warmup_progress() -> None:
+    """
+    Testing progress output of warmup.
+    """
+
+    stream: io.StringIO = io.StringIO()
+    progress: WarmupProgress = WarmupProgress(stream=stream)
+
+    statistics: Dict[str, int] = {"total": 4, "cached": 1, "requested": 1, "failed": 0}
+    progress(statistics)
+
+    assert "2/4 files (1 cached, 0 failed)" in stream.getvalue()
+    assert stream.getvalue().endswith("\n") is False
+
+    progress({"total": 4, "cached": 1, "requested": 2, "failed": 1})
+    assert stream.getvalue().endswith("\n") is True
+
+
+
+def test_cli_warmup(storage: Storage, capsys: pytest.CaptureFixture) -> None:
+    """
+    Testing warmup command of command line interface.
+    """
+
+    with open(os.path.join(os.path.dirname(__file__), "pathway.kgml"), "r", encoding="utf-8") as file_obj:
+        kgml: str = file_obj.read()
+
+    with RequestsMock() as mocked_response:
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/list/organism", body="T01\tmmu\tMus musculus")
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/list/compound", body="cpd:C00001\tH2O")
+        mocked_response.add(
+            HTTP_METHOD_GET,
+            url="http://rest.kegg.jp/list/pathway/mmu",
+            body="path:mmu00010\tGlycolysis",
+        )
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/get/mmu00010/kgml", body=kgml)
+
+        assert main(["warmup", "mmu", "--cache", CACHEDIR, "--workers", "2", "--rate", "100"]) == 0
+
+    captured = capsys.readouterr()
+
+    assert "contains 4/4 files (4 requested)" in captured.out
+    assert "4/4 files" in captured.err
+    assert storage.exist(filename="mmu_path00010.kgml") is True
+
+    # Bucket of rate limiter is shared through cache folder, but not listed as cache entry
+    assert os.path.isfile(os.path.join(CACHEDIR, RATE_LIMIT_FILENAME)) is True
+    assert RATE_LIMIT_FILENAME not in [item[0] for item in storage.list_entries()]
+
+    # Missing command
+    with pytest.raises(SystemExit):
+        main([])
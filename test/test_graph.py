@@ -0,0 +1,197 @@
+""" Testing graph view of pathway relations """
+
+from typing import Dict, List, Set
+
+import pytest
+
+from keggtools.graph import PathwayGraph, get_subtype_mask, get_type_mask
+from keggtools.models import Entry, Pathway, Relation, Subtype
+
+
+def build_pathway() -> Pathway:
+    """
+    Build small pathway with chain 1 -> 2 -> 3 -| 4, an isolated relation 5 -> 6 and entry 7 without relations.
+    """
+
+    pathway: Pathway = Pathway(name="path:mmu00010", org="mmu", number="00010")
+
+    for entry_id in ("1", "2", "3", "4", "5", "6", "7"):
+        pathway.entries.append(Entry(id=entry_id, name=f"mmu:{entry_id}", type="gene"))
+
+    for entry1, entry2, subtype in (("1", "2", "activation"), ("2", "3", "expression"), ("3", "4", "inhibition"),
+        ("5", "6", "activation")):
+        relation: Relation = Relation(entry1=entry1, entry2=entry2, type="PPrel")
+        relation.subtypes.append(Subtype(name=subtype, value="-->"))
+        pathway.relations.append(relation)
+
+    return pathway
+
+
+
+def test_masks() -> None:
+    """
+    Testing bit masks of relation types and subtypes.
+    """
+
+    assert get_type_mask([]) == 0
+    assert get_type_mask(["ECrel", "PPrel"]) == 0b11
+    assert get_subtype_mask(["compound", "activation"]) == 0b101
+
+    with pytest.raises(ValueError):
+        get_type_mask(["invalid"])
+
+    with pytest.raises(ValueError):
+        get_subtype_mask(["invalid"])
+
+
+
+def test_graph_arrays() -> None:
+    """
+    Testing CSR arrays and degrees of graph.
+    """
+
+    graph: PathwayGraph = PathwayGraph(pathway=build_pathway())
+
+    assert graph.nodes == ["1", "2", "3", "4", "5", "6", "7"]
+    assert len(graph) == 7
+    assert graph.edge_count == 4
+
+    assert list(graph.succ_offsets) == [0, 1, 2, 3, 3, 4, 4, 4]
+    assert list(graph.succ_nodes) == [1, 2, 3, 5]
+    assert list(graph.pred_offsets) == [0, 0, 1, 2, 3, 3, 4, 4]
+    assert list(graph.out_degree) == [1, 1, 1, 0, 1, 0, 0]
+    assert list(graph.in_degree) == [0, 1, 1, 1, 0, 1, 0]
+
+    assert graph.degree("2") == 2
+    assert graph.degree("7") == 0
+    assert graph.degree("invalid") == 0
+
+    with pytest.raises(KeyError):
+        graph.get_index("invalid")
+
+
+
+def test_graph_queries() -> None:
+    """
+    Testing neighbor queries, traversals and components.
+    """
+
+    graph: PathwayGraph = PathwayGraph(pathway=build_pathway())
+
+    assert graph.successors("1") == ["2"]
+    assert graph.predecessors("2") == ["1"]
+    assert graph.neighbors("2", direction="both") == ["3", "1"]
+    assert graph.successors("3", subtypes=["activation"]) == []
+    assert graph.successors("3", types=["PPrel"], subtypes=["inhibition"]) == ["4"]
+    assert graph.successors("1", types=["ECrel"]) == []
+
+    with pytest.raises(ValueError):
+        graph.neighbors("1", direction="invalid")
+
+    assert graph.bfs("1") == {"1": 0, "2": 1, "3": 2, "4": 3}
+    assert graph.bfs("1", max_depth=1) == {"1": 0, "2": 1}
+    assert graph.bfs("4", direction="in") == {"4": 0, "3": 1, "2": 2, "1": 3}
+    assert graph.bfs("1", subtypes=["activation"]) == {"1": 0, "2": 1}
+    assert graph.dfs("1") == ["1", "2", "3", "4"]
+    assert graph.dfs("3", direction="both") == ["3", "4", "2", "1"]
+
+    assert graph.is_reachable("1", "4")
+    assert not graph.is_reachable("4", "1")
+    assert not graph.is_reachable("1", "6")
+
+    assert graph.connected_components() == [["1", "2", "3", "4"], ["5", "6"], ["7"]]
+    assert graph.connected_components(subtypes=["activation"]) == [["1", "2"], ["3"], ["4"], ["5", "6"], ["7"]]
+
+
+
+def test_graph_of_pathway(pathway: Pathway) -> None:
+    """
+    Testing graph of full pathway matches relations and is cached until relations change.
+    """
+
+    graph: PathwayGraph = pathway.get_graph()
+    assert pathway.get_graph() is graph
+
+    successors: Dict[str, Set[str]] = {}
+    for relation in pathway.relations:
+        successors.setdefault(relation.entry1, set()).add(relation.entry2)
+
+    for entry_id in graph.nodes:
+        assert set(graph.successors(entry_id)) == successors.get(entry_id, set())
+
+    # Components cover every node exactly once
+    components: List[List[str]] = graph.connected_components()
+    assert sorted(node for component in components for node in component) == sorted(graph.nodes)
+
+    pathway.relations.append(Relation(entry1=pathway.entries[0].id, entry2=pathway.entries[1].id, type="PPrel"))
+    assert pathway.get_graph() is not graph
+    assert pathway.entries[1].id in pathway.get_graph().successors(pathway.entries[0].id)
+
+    graph = pathway.get_graph()
+    pathway.entries.append(Entry(id="9999", name="mmu:1", type="gene"))
+    assert "9999" in pathway.get_graph().nodes
+
+
+
+def test_k_hop() -> None:
+    """
+    Testing batched k-hop queries match single searches.
+    """
+
+    graph: PathwayGraph = PathwayGraph(pathway=build_pathway())
+
+    assert graph.k_hop(["1", "5"], k=2) == {"1": {"1": 0, "2": 1, "3": 2}, "5": {"5": 0, "6": 1}}
+    assert graph.k_hop(["4"], k=1, direction="in") == {"4": {"4": 0, "3": 1}}
+    assert graph.k_hop(["1"], k=0) == {"1": {"1": 0}}
+
+    batch: Dict[str, Dict[str, int]] = graph.k_hop(graph.nodes, k=None, direction="both")
+    for entry_id in graph.nodes:
+        assert batch[entry_id] == graph.bfs(entry_id, direction="both")
+
+    with pytest.raises(ValueError):
+        graph.k_hop(["1"], k=-1)
+
+    with pytest.raises(KeyError):
+        graph.k_hop(["invalid"], k=1)
+
+
+
+def test_signed_queries() -> None:
+    """
+    Testing signed propagation and shortest signed paths.
+    """
+
+    pathway: Pathway = build_pathway()
+
+    # Second path from 1 to 3 with inhibition and unsigned relation from 4 to 5
+    for entry1, entry2, subtype in (("1", "3", "inhibition"), ("4", "5", "binding/association")):
+        relation: Relation = Relation(entry1=entry1, entry2=entry2, type="PPrel")
+        relation.subtypes.append(Subtype(name=subtype, value="---"))
+        pathway.relations.append(relation)
+
+    graph: PathwayGraph = PathwayGraph(pathway=pathway)
+
+    assert list(graph.edge_sign) == [1, 1, -1, 1, -1, 0]
+
+    assert graph.signed_k_hop(["1"]) == {"1": {
+        "1": {1: 0},
+        "2": {1: 1},
+        "3": {-1: 1, 1: 2},
+        "4": {1: 2, -1: 3},
+    }}
+    assert graph.signed_k_hop(["1"], k=1) == {"1": {"1": {1: 0}, "2": {1: 1}, "3": {-1: 1}}}
+    assert graph.signed_k_hop(["4"], direction="in")["4"]["1"] == {1: 2, -1: 3}
+    assert graph.signed_k_hop(["4"], include_unsigned=True)["4"] == {"4": {1: 0}, "5": {1: 1}, "6": {1: 2}}
+    assert graph.signed_k_hop(["1"], types=["GErel"]) == {"1": {"1": {1: 0}}}
+
+    assert graph.signed_shortest_path("1", "4") == (1, ["1", "3", "4"])
+    assert graph.signed_shortest_path("1", "4", sign=-1) == (-1, ["1", "2", "3", "4"])
+    assert graph.signed_shortest_path("4", "1", direction="in") == (1, ["4", "3", "1"])
+    assert graph.signed_shortest_path("1", "6") is None
+    assert graph.signed_shortest_path("1", "6", include_unsigned=True) == (1, ["1", "3", "4", "5", "6"])
+
+    with pytest.raises(ValueError):
+        graph.signed_shortest_path("1", "4", sign=0)
+
+    with pytest.raises(ValueError):
+        graph.signed_k_hop(["1"], direction="both")
@@ -1,6 +1,8 @@
 """ Testing parsing models """
 
+import io
 import os
+import pickle
 from typing import List, Optional
 from xml.etree import ElementTree
 
@@ -16,8 +18,10 @@ from keggtools.models import (
     Alt,
     Product,
     Substrate,
-    Reaction
+    Reaction,
+    EntryList,
 )
+from keggtools.storage import Storage
 
 
 def test_relation_model_parsing() -> None:
@@ -421,3 +425,278 @@ def test_kgml_to_xml(pathway: Pathway) -> None:
     parsed_pathway: Pathway = Pathway.parse(data=xml_string)
 
     assert parsed_pathway.name == pathway.name
+
+
+
+def test_pathway_stream_parsing(pathway: Pathway) -> None:
+    """
+    Testing streaming parser gives same result as parsing full XML tree.
+    """
+
+    kgml_path: str = os.path.join(os.path.dirname(__file__), "pathway.kgml")
+
+    streamed_pathway: Pathway = Pathway.parse_stream(kgml_path)
+
+    assert ElementTree.tostring(streamed_pathway.to_xml()) == ElementTree.tostring(pathway.to_xml())
+    assert len(streamed_pathway.relations) == len(pathway.relations)
+
+    # Parse from binary stream
+    with open(kgml_path, "rb") as file_obj:
+        assert len(Pathway.parse_stream(file_obj).entries) == len(pathway.entries)
+
+    # Parse errors of all XML backends are syntax errors
+    with pytest.raises(SyntaxError):
+        Pathway.parse_stream(io.BytesIO(b"<?xml version=\"1.0\"?>"))
+
+
+
+@pytest.mark.parametrize("backend", ["etree", "lxml"])
+def test_pathway_parsing_backends(pathway: Pathway, backend: str) -> None:
+    """
+    Testing all XML backends give identical pathways.
+    """
+
+    if backend == "lxml":
+        pytest.importorskip("lxml")
+
+    kgml_path: str = os.path.join(os.path.dirname(__file__), "pathway.kgml")
+
+    with open(kgml_path, "r", encoding="utf-8") as file_obj:
+        kgml: str = file_obj.read()
+
+    assert Pathway.parse(kgml, backend=backend).to_bytes() == pathway.to_bytes()
+    assert Pathway.parse_stream(kgml_path, backend=backend).to_bytes() == pathway.to_bytes()
+
+
+
+def test_trusted_parsing(pathway: Pathway) -> None:
+    """
+    Testing parsing without validation gives same pathway and skips checks.
+    """
+
+    with open(os.path.join(os.path.dirname(__file__), "pathway.kgml"), "r", encoding="utf-8") as file_obj:
+        kgml: str = file_obj.read()
+
+    assert Pathway.parse(kgml, validate=False).to_bytes() == pathway.to_bytes()
+
+    invalid_relation: str = "<relation entry1=\"a\" entry2=\"2\" type=\"invalid\" />"
+
+    with pytest.raises(ValueError):
+        Relation.parse(ElementTree.fromstring(invalid_relation))
+
+    relation: Relation = Relation.parse(ElementTree.fromstring(invalid_relation), validate=False)
+    assert relation.type == "invalid"
+
+    with pytest.raises(ValueError):
+        Graphics(x="abc")
+
+    assert Graphics(x="abc", validate=False).x == "abc"
+
+    with pytest.raises(ValueError):
+        Pathway(name="path:mmu00010", org="mmu", number="00020")
+
+    assert Pathway(name="path:mmu00010", org="mmu", number="00020", validate=False).number == "00020"
+
+
+
+def test_slotted_models(pathway: Pathway) -> None:
+    """
+    Testing models have no instance dict and repeated attribute strings are interned.
+    """
+
+    for model in (pathway.entries[0], pathway.entries[0].graphics, pathway.relations[0], Component(id="1"),
+        Alt(name="C00001"), Product(id="1", name="C00001"), Substrate(id="1", name="C00001"),
+        Reaction(id="1", name="rn:R00001", type="reversible"), Subtype(name="compound", value="1")):
+        assert not hasattr(model, "__dict__")
+
+    with pytest.raises(AttributeError):
+        pathway.entries[0].unknown = "value" # type: ignore
+
+    # Public attributes are still writable
+    entry: Entry = Entry(id="1", name="hsa:1", type="gene")
+    entry.link = "https://www.kegg.jp"
+    assert entry.link == "https://www.kegg.jp"
+
+    genes: List[Entry] = [item for item in pathway.entries if item.type == "gene"]
+    assert len(genes) > 1
+    assert all(item.type is genes[0].type for item in genes)
+
+    loaded: Pathway = Pathway.from_bytes(pathway.to_bytes())
+    assert loaded.entries[0].type is pathway.entries[0].type
+    assert loaded.entries[0].graphics.bgcolor is pathway.entries[0].graphics.bgcolor # type: ignore
+
+    # Pickled state of models before slots is a dict, slotted models pickle a tuple of dict and slots
+    subtype: Subtype = Subtype.__new__(Subtype)
+    subtype.__setstate__({"name": "compound", "value": "1"})
+    assert (subtype.name, subtype.value) == ("compound", "1")
+
+    subtype.__setstate__((None, {"value": "2"}))
+    assert (subtype.name, subtype.value) == ("compound", "2")
+
+    relation: Relation = pickle.loads(pickle.dumps(pathway.relations[0]))
+    assert [(item.name, item.value) for item in relation.subtypes] == \
+        [(item.name, item.value) for item in pathway.relations[0].subtypes]
+
+
+
+def test_legacy_pickle(pathway: Pathway, storage: Storage) -> None:
+    """
+    Testing dumps of pathways pickled before models used slots and entry indexes still load.
+    """
+
+    # Dump was pickled with pathway.kgml and an additional reaction by keggtools before slotted models
+    with open(os.path.join(os.path.dirname(__file__), "pathway_legacy.dump"), "rb") as file_obj:
+        storage.save_bytes(filename="pathway.dump", data=file_obj.read())
+
+    loaded: Pathway = storage.load_dump(filename="pathway.dump")
+
+    pathway.reactions.append(Reaction.parse(ElementTree.fromstring(
+        "<reaction id=\"1\" name=\"rn:R001\" type=\"reversible\">"
+        "<substrate id=\"2\" name=\"cpd:C001\"><alt name=\"cpd:C002\"/></substrate>"
+        "<product id=\"3\" name=\"cpd:C003\"/>"
+        "</reaction>"
+    )))
+
+    assert ElementTree.tostring(loaded.to_xml()) == ElementTree.tostring(pathway.to_xml())
+    assert not hasattr(loaded.entries[0], "__dict__")
+    assert [[(item.name, item.value) for item in relation.subtypes] for relation in loaded.relations] == \
+        [[(item.name, item.value) for item in relation.subtypes] for relation in pathway.relations]
+
+    # Entries are converted to EntryList, memoized values are rebuilt
+    assert isinstance(loaded.entries, EntryList)
+    assert loaded.get_entry_by_id(pathway.entries[-1].id).name == pathway.entries[-1].name # type: ignore
+    assert loaded.get_genes() == pathway.get_genes()
+    assert len(loaded.get_graph()) == len(pathway.get_graph())
+
+    assert loaded.reactions[0].substrates[0].alt.name == "cpd:C002" # type: ignore
+
+    # Slotted models are pickled with slot state
+    reloaded: Pathway = pickle.loads(pickle.dumps(loaded))
+    assert ElementTree.tostring(reloaded.to_xml()) == ElementTree.tostring(pathway.to_xml())
+    assert reloaded.reactions[0].substrates[0].alt.name == "cpd:C002" # type: ignore
+
+
+
+def test_entry_indexes(pathway: Pathway) -> None:
+    """
+    Testing indexed entry lookups match linear search and follow changes of entries.
+    """
+
+    assert isinstance(pathway.entries, EntryList)
+
+    for entry in pathway.entries:
+        assert pathway.get_entry_by_id(entry.id) is next(item for item in pathway.entries if item.id == entry.id)
+
+    genes: List[Entry] = pathway.get_entries_by_type("gene")
+    assert genes == [item for item in pathway.entries if item.type == "gene"]
+
+    found: List[Entry] = pathway.get_entries_by_name("mmu:19697")
+    assert len(found) > 0
+    assert all("mmu:19697" in item.name.split(" ") for item in found)
+    assert pathway.get_entries_by_name("mmu:0") == []
+
+    # Appended entries are added to built indexes
+    added: Entry = Entry(id="9999", name="mmu:1 mmu:2", type="gene")
+    pathway.entries.append(added)
+    assert pathway.get_entry_by_id("9999") is added
+    assert pathway.get_entries_by_name("mmu:2") == [added]
+    assert pathway.get_entries_by_type("gene")[-1] is added
+
+    # Other changes invalidate indexes
+    pathway.entries.remove(added)
+    assert pathway.get_entry_by_id("9999") is None
+    assert pathway.get_entries_by_name("mmu:2") == []
+
+    # Assigned plain lists are converted
+    pathway.entries = [added]
+    assert isinstance(pathway.entries, EntryList)
+    assert pathway.get_entry_by_id("9999") is added
+
+    loaded: Pathway = pickle.loads(pickle.dumps(pathway))
+    assert isinstance(loaded.entries, EntryList)
+    assert loaded.get_entry_by_id("9999").name == "mmu:1 mmu:2" # type: ignore
+
+
+
+def test_memoized_genes(pathway: Pathway) -> None:
+    """
+    Testing gene list is unique, keeps order and is updated when entries change.
+    """
+
+    expected: List[str] = []
+
+    for entry in pathway.entries:
+        if entry.type == "gene":
+            for gene_id in entry.get_gene_id():
+                if gene_id not in expected:
+                    expected.append(gene_id)
+
+    assert pathway.get_genes() == expected
+    assert pathway.gene_set == frozenset(expected)
+
+    # Returned list is a copy of memoized result
+    pathway.get_genes().append("invalid")
+    assert pathway.get_genes() == expected
+
+    pathway.entries.append(Entry(id="9999", name="mmu:1 mmu:19697", type="gene"))
+    assert pathway.get_genes() == expected + ["1"]
+    assert "1" in pathway.gene_set
+
+    pathway.entries = []
+    assert pathway.get_genes() == []
+    assert pathway.gene_set == frozenset()
+
+
+
+def test_pathway_merge(pathway: Pathway) -> None:
+    """
+    Testing merge of identical entries with remapping of relations, groups and reactions.
+    """
+
+    small: Pathway = Pathway(name="path:mmu00010", org="mmu", number="00010", title="Test")
+
+    for entry_id, name, entry_type in (("1", "mmu:1", "gene"), ("2", "mmu:1", "gene"), ("3", "mmu:2", "gene"),
+        ("4", "cpd:C00001", "compound"), ("5", "undefined", "group"), ("6", "undefined", "group"),
+        ("7", "undefined", "group")):
+        small.entries.append(Entry(id=entry_id, name=name, type=entry_type))
+
+    small.entries[4].components.append(Component(id="1"))
+    small.entries[5].components.append(Component(id="2"))
+    small.entries[6].components.append(Component(id="3"))
+
+    for entry1, entry2 in (("1", "3"), ("2", "3"), ("3", "5"), ("3", "6")):
+        relation: Relation = Relation(entry1=entry1, entry2=entry2, type="PPrel")
+        relation.subtypes.append(Subtype(name="compound", value="4"))
+        small.relations.append(relation)
+
+    reaction: Reaction = Reaction(id="4", name="rn:R00001", type="reversible")
+    reaction.substrates.append(Substrate(id="2", name="cpd:C00002"))
+    small.reactions.append(reaction)
+
+    original: bytes = small.to_bytes()
+    merged, mapping = small.merge_with_mapping()
+
+    assert small.to_bytes() == original
+    assert merged.merge().to_bytes() == merged.to_bytes()
+    assert small.merge().to_bytes() == merged.to_bytes()
+
+    assert mapping == {"1": "1", "2": "1", "3": "3", "4": "4", "5": "5", "6": "5", "7": "7"}
+    assert [entry.id for entry in merged.entries] == ["1", "3", "4", "5", "7"]
+    assert [component.id for component in merged.get_entry_by_id("7").components] == ["3"] # type: ignore
+    assert [(relation.entry1, relation.entry2) for relation in merged.relations] == [("1", "3"), ("3", "5")]
+    assert merged.relations[0].subtypes[0].value == "4"
+    assert merged.reactions[0].substrates[0].id == "1"
+    assert merged.title == "Test"
+
+    # Full pathway has no duplicates of name and type after merging
+    merged, mapping = pathway.merge_with_mapping()
+
+    assert set(mapping.keys()) == {entry.id for entry in pathway.entries}
+    assert set(mapping.values()) == {entry.id for entry in merged.entries}
+    assert len(merged.entries) < len(pathway.entries)
+    assert len({(entry.name, entry.type) for entry in merged.entries if entry.type != "group"}) == \
+        len([entry for entry in merged.entries if entry.type != "group"])
+
+    for relation in merged.relations:
+        assert merged.get_entry_by_id(relation.entry1) is not None
+        assert merged.get_entry_by_id(relation.entry2) is not None
@@ -1,16 +1,21 @@
 """ Testing keggtools resolver module """
 
+import asyncio
+import time
 import warnings
 import os
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
 from unittest.mock import patch
 import pytest
 
 
+from requests.adapters import HTTPAdapter
 from responses import RequestsMock, GET as HTTP_METHOD_GET
 
-from keggtools.resolver import Resolver, get_gene_names
-from keggtools.storage import Storage
+from keggtools.resolver import Resolver, AsyncResolver, get_gene_names, create_session
+from keggtools.storage import Storage, MemoryCache
 from keggtools.models import Pathway
 
 from .conftest import CACHEDIR, ORGANISM
@@ -48,9 +53,46 @@ def test_get_gene_names() -> None:
         assert result_dict["mmu:11797"] == "Birc2" and result_dict["mmu:266632"] == "Irak4"
 
 
-    # Check Value error on too many items
+    # Check Value error on empty list and invalid chunk size
     with pytest.raises(ValueError):
-        get_gene_names(genes=["mmu:12345"] * 51)
+        get_gene_names(genes=[])
+
+    with pytest.raises(ValueError):
+        get_gene_names(genes=["mmu:12345"], max_genes=0)
+
+
+
+def test_get_gene_names_chunks(resolver: Resolver) -> None:
+    """
+    Testing chunked requests of long gene lists and caching of resolved gene names.
+    """
+
+    gene_list: List[str] = [f"mmu:{index}" for index in range(10000, 10005)]
+
+    # Long gene list is split into chunks of 2 genes
+    with RequestsMock() as mocked_response:
+        for index in range(0, len(gene_list), 2):
+            chunk: List[str] = gene_list[index:index + 2]
+            mocked_response.add(
+                method=HTTP_METHOD_GET,
+                url="http://rest.kegg.jp/list/" + "+".join(chunk),
+                body="".join(f"{gene}\tGene{gene[4:]}, Alias\n" for gene in chunk),
+                status=200,
+            )
+
+        result_dict: Dict[str, str] = get_gene_names(
+            genes=gene_list,
+            max_genes=2,
+            session=resolver.session,
+            storage=resolver.storage,
+        )
+
+    assert list(result_dict.keys()) == gene_list
+    assert result_dict["mmu:10004"] == "Gene10004"
+
+    # Cached names are resolved without request
+    with RequestsMock():
+        assert resolver.get_gene_names(genes=gene_list[::-1]) == {gene: result_dict[gene] for gene in gene_list[::-1]}
 
 
 
@@ -65,6 +107,16 @@ def test_resolver_init(storage: Storage) -> None:
 
     assert Resolver(cache=CACHEDIR).storage.cachedir == CACHEDIR
 
+    # Resolver creates pooled session or uses given session
+    session = create_session(pool_size=2)
+    assert Resolver(cache=storage, session=session).session is session
+    adapter = Resolver(cache=storage, pool_size=4).session.get_adapter("http://rest.kegg.jp")
+    assert isinstance(adapter, HTTPAdapter)
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == 4
+
+    with pytest.raises(ValueError):
+        create_session(pool_size=0)
+
 
 
 def test_resolver_cache_or_request(resolver: Resolver) -> None:
@@ -106,6 +158,29 @@ def test_resolver_cache_or_request(resolver: Resolver) -> None:
 
 
 
+def test_resolver_coalesce_requests(resolver: Resolver) -> None:
+    """
+    Testing that concurrent cache misses of the same file are requested only once.
+    """
+
+    def slow_request(url: str) -> str:
+        time.sleep(0.05)
+        return f"content of {url}"
+
+    with patch.object(resolver, "_get", side_effect=slow_request) as mock:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            # pylint: disable=protected-access
+            results: List[str] = list(executor.map(
+                lambda _: resolver._cache_or_request(filename="test.txt", url="http://example.com/test.txt"),
+                range(4),
+            ))
+
+        mock.assert_called_once()
+
+    assert results == ["content of http://example.com/test.txt"] * 4
+
+
+
 def test_get_pathway_list(resolver: Resolver) -> None:
     """
     Testing request of pathway list.
@@ -150,6 +225,135 @@ def test_get_pathway(resolver: Resolver) -> None:
         assert isinstance(resolver.get_pathway(organism=ORGANISM, code="12345"), Pathway) is True
 
 
+
+def test_resolver_memory_cache(storage: Storage) -> None:
+    """
+    Testing parsed pathways are served from memory cache until the cached file changes.
+    """
+
+    with open(os.path.join(os.path.dirname(__file__), "pathway.kgml"), "r", encoding="utf-8") as file_obj:
+        response_content: str = file_obj.read()
+
+    memory_cache: MemoryCache = MemoryCache(capacity=4)
+    resolver: Resolver = Resolver(cache=storage, memory_cache=memory_cache)
+
+    with RequestsMock() as mocked_response:
+        mocked_response.add(
+            HTTP_METHOD_GET,
+            url="http://rest.kegg.jp/get/mmu12345/kgml",
+            body=response_content,
+            status=200,
+        )
+
+        pathway: Pathway = resolver.get_pathway(organism=ORGANISM, code="12345")
+
+        # Second call is neither requested nor parsed again
+        with patch("keggtools.resolver.Pathway.parse") as parse_mock:
+            assert resolver.get_pathway(organism=ORGANISM, code="12345") is pathway
+            parse_mock.assert_not_called()
+
+        assert len(mocked_response.calls) == 1
+
+    assert memory_cache.statistics["hits"] == 1
+
+    # Changed cache entry invalidates parsed pathway
+    assert pathway.title is not None
+    storage.save(filename="mmu_path12345.kgml", data=response_content.replace(pathway.title, "Changed title"))
+
+    assert resolver.get_pathway(organism=ORGANISM, code="12345").title == "Changed title"
+
+
+def test_resolver_memory_cache_ttl(storage: Storage) -> None:
+    """
+    Testing parsed objects in memory cache expire together with cached files.
+    """
+
+    resolver: Resolver = Resolver(cache=Storage(cachedir=storage.cachedir, ttl=0.2), memory_cache=MemoryCache())
+
+    with RequestsMock() as mocked_response:
+        mocked_response.add(
+            HTTP_METHOD_GET,
+            url=f"http://rest.kegg.jp/list/pathway/{ORGANISM}",
+            body="path:mmu00010\tGlycolysis / Gluconeogenesis\n",
+            status=200,
+        )
+
+        resolver.get_pathway_list(organism=ORGANISM)
+        resolver.get_pathway_list(organism=ORGANISM)
+        assert len(mocked_response.calls) == 1
+
+        time.sleep(0.3)
+
+        # Expired file is requested again instead of served from memory cache
+        assert resolver.get_pathway_list(organism=ORGANISM) == {"path:mmu00010": "Glycolysis / Gluconeogenesis"}
+        assert len(mocked_response.calls) == 2
+
+
+def test_resolver_parsed_cache(storage: Storage) -> None:
+    """
+    Testing parsed pathways are loaded from dump until KGML file or schema version changes.
+    """
+
+    with open(os.path.join(os.path.dirname(__file__), "pathway.kgml"), "r", encoding="utf-8") as file_obj:
+        response_content: str = file_obj.read()
+
+    storage.save(filename="mmu_path12345.kgml", data=response_content)
+
+    resolver: Resolver = Resolver(cache=storage, parsed_cache=True)
+    pathway: Pathway = resolver.get_pathway(organism=ORGANISM, code="12345")
+
+    assert storage.exist(filename="mmu_path12345.kgml.dump") is True
+
+    # Warm load skips parsing
+    with patch("keggtools.resolver.Pathway.parse") as parse_mock:
+        loaded_pathway: Pathway = Resolver(cache=storage, parsed_cache=True).get_pathway(
+            organism=ORGANISM,
+            code="12345",
+        )
+        parse_mock.assert_not_called()
+
+    assert loaded_pathway.title == pathway.title
+    assert len(loaded_pathway.entries) == len(pathway.entries)
+
+    # Changed KGML file is parsed again
+    assert pathway.title is not None
+    storage.save(filename="mmu_path12345.kgml", data=response_content.replace(pathway.title, "Changed title"))
+    assert resolver.get_pathway(organism=ORGANISM, code="12345").title == "Changed title"
+
+    # Outdated format version is parsed again
+    with patch("keggtools.serialize.FORMAT_VERSION", 0):
+        with patch("keggtools.resolver.Pathway.parse", wraps=Pathway.parse) as parse_mock:
+            resolver.get_pathway(organism=ORGANISM, code="12345")
+            parse_mock.assert_called_once()
+
+    # Corrupt dump is replaced
+    storage.save_bytes(filename="mmu_path12345.kgml.dump", data=b"invalid")
+    assert resolver.get_pathway(organism=ORGANISM, code="12345").title == "Changed title"
+
+
+
+def test_get_release(resolver: Resolver) -> None:
+    """
+    Testing request of KEGG release.
+    """
+
+    with RequestsMock() as mocked_response:
+        mocked_response.add(
+            HTTP_METHOD_GET,
+            url="http://rest.kegg.jp/info/kegg",
+            body="kegg             Kyoto Encyclopedia of Genes and Genomes\n" \
+                "kegg             Release 108.0+/10-18, Oct 23\n" \
+                "                 Kanehisa Laboratories\n",
+        )
+
+        assert resolver.get_release() == "108.0+/10-18, Oct 23"
+
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/info/kegg", body="kegg\n")
+
+        assert resolver.get_release() is None
+
+
+
 def test_get_organism_list(resolver: Resolver) -> None:
     """
     Testing request of org list.
@@ -176,6 +380,48 @@ def test_get_organism_list(resolver: Resolver) -> None:
     assert resolver.check_organism(organism="hsa") is True
 
 
+def test_resolver_warmup(resolver: Resolver) -> None:
+    """
+    Testing cache warmup of organism is resumed after failed requests.
+    """
+
+    with open(os.path.join(os.path.dirname(__file__), "pathway.kgml"), "r", encoding="utf-8") as file_obj:
+        kgml: str = file_obj.read()
+
+    progress: List[Dict[str, int]] = []
+
+    with RequestsMock() as mocked_response:
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/list/organism", body="T01\tmmu\tMus musculus")
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/list/compound", body="cpd:C00001\tH2O")
+        mocked_response.add(
+            HTTP_METHOD_GET,
+            url="http://rest.kegg.jp/list/pathway/mmu",
+            body="path:mmu00010\tGlycolysis\npath:mmu00020\tCitrate cycle\n",
+        )
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/get/mmu00010/kgml", body=kgml)
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/get/mmu00020/kgml", status=404)
+
+        statistics, errors = resolver.warmup(organism=ORGANISM, max_workers=2, progress=progress.append)
+
+    assert statistics == {"total": 5, "cached": 0, "requested": 4, "failed": 1}
+    assert list(errors.keys()) == ["mmu_path00020.kgml"]
+    assert progress[-1] == statistics
+    assert len(progress) == 5
+
+    # Second run only requests missing file
+    with RequestsMock() as mocked_response:
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/get/mmu00020/kgml", body=kgml)
+
+        statistics, errors = resolver.warmup(organism=ORGANISM)
+
+    assert statistics == {"total": 5, "cached": 4, "requested": 1, "failed": 0}
+    assert len(errors) == 0
+
+    with pytest.raises(ValueError):
+        resolver.warmup(organism=ORGANISM, max_workers=0)
+
+
+
 def test_get_compounds(resolver: Resolver) -> None:
     """
     Testing get compund function.
@@ -196,3 +442,183 @@ def test_get_compounds(resolver: Resolver) -> None:
         result: Dict[str, str] = resolver.get_compounds()
 
     assert result["cpd:C00007"] == "Oxygen; O2"
+
+
+def test_get_pathways(resolver: Resolver) -> None:
+    """
+    Testing concurrent request of multiple KGML pathways.
+    """
+
+    # Load pathway from file
+    with open(os.path.join(os.path.dirname(__file__), "pathway.kgml"), "r", encoding="utf-8") as file_obj:
+        response_content: str = file_obj.read()
+
+    # Store one pathway in cache before request
+    resolver.storage.save(filename=f"{ORGANISM}_path00001.kgml", data=response_content)
+
+    with RequestsMock() as mocked_response:
+        mocked_response.add(
+            HTTP_METHOD_GET,
+            url="http://rest.kegg.jp/get/mmu12345/kgml",
+            body=response_content,
+            status=200,
+        )
+        mocked_response.add(
+            HTTP_METHOD_GET,
+            url="http://rest.kegg.jp/get/mmu99999/kgml",
+            status=404,
+        )
+
+        pathways, errors = resolver.get_pathways(
+            organism=ORGANISM,
+            codes=["12345", "99999", "00001"],
+            max_workers=2,
+        )
+
+    # Failed pathway is reported, but does not abort the batch
+    assert len(pathways) == 2 and all(isinstance(item, Pathway) for item in pathways)
+    assert list(errors.keys()) == ["99999"]
+
+    # Requested pathway is stored in cache
+    assert resolver.storage.exist(filename=f"{ORGANISM}_path12345.kgml") is True
+
+    with pytest.raises(ValueError):
+        resolver.get_pathways(organism=ORGANISM, codes=["12345"], max_workers=0)
+
+
+
+def test_async_resolver(resolver: Resolver) -> None:
+    """
+    Testing asynchronous resolver coroutines.
+    """
+
+    async_resolver: AsyncResolver = AsyncResolver(cache=resolver, max_concurrency=2)
+
+    # Load pathway from file
+    with open(os.path.join(os.path.dirname(__file__), "pathway.kgml"), "r", encoding="utf-8") as file_obj:
+        response_content: str = file_obj.read()
+
+    loop = asyncio.new_event_loop()
+
+    with RequestsMock() as mocked_response:
+        for code in ("00001", "00002", "00003"):
+            mocked_response.add(
+                HTTP_METHOD_GET,
+                url=f"http://rest.kegg.jp/get/mmu{code}/kgml",
+                body=response_content,
+                status=200,
+            )
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/get/mmu99999/kgml", status=404)
+        mocked_response.add(
+            HTTP_METHOD_GET,
+            url="http://rest.kegg.jp/list/compound",
+            body="cpd:C00001\tH2O; Water\n",
+            status=200,
+        )
+
+        pathways, errors = loop.run_until_complete(
+            async_resolver.get_pathways(organism=ORGANISM, codes=["00001", "99999", "00002", "00003"])
+        )
+        compounds: Dict[str, str] = loop.run_until_complete(async_resolver.get_compounds())
+
+    # Loading from cache does not request again
+    with RequestsMock():
+        cached_pathway: Pathway = loop.run_until_complete(async_resolver.get_pathway(organism=ORGANISM, code="00001"))
+
+    loop.close()
+
+    assert len(pathways) == 3 and list(errors.keys()) == ["99999"]
+    assert compounds["cpd:C00001"] == "H2O; Water"
+    assert isinstance(cached_pathway, Pathway)
+
+    with pytest.raises(ValueError):
+        AsyncResolver(cache=resolver, max_concurrency=0)
+
+    # Memory cache of wrapped resolver is shared with synchronous calls
+    cached_resolver: Resolver = Resolver(cache=resolver.storage, memory_cache=MemoryCache(capacity=8))
+    async_resolver = AsyncResolver(cache=cached_resolver)
+    loop = asyncio.new_event_loop()
+
+    with RequestsMock():
+        shared_pathway: Pathway = cached_resolver.get_pathway(organism=ORGANISM, code="00001")
+        assert loop.run_until_complete(async_resolver.get_pathway(organism=ORGANISM, code="00001")) is shared_pathway
+
+    loop.close()
+
+    assert cached_resolver.memory_cache is not None and cached_resolver.memory_cache.hits == 1
+
+    # Resolver can be used by multiple event loops, e.g. repeated calls of asyncio.run. Concurrent calls wait for
+    # semaphore of their own loop.
+    async_resolver = AsyncResolver(cache=cached_resolver, max_concurrency=1)
+
+    for _ in range(2):
+        loop = asyncio.new_event_loop()
+        pathways, errors = loop.run_until_complete(
+            async_resolver.get_pathways(organism=ORGANISM, codes=["00001", "00002", "00003"])
+        )
+        loop.close()
+
+        assert len(pathways) == 3 and errors == {}
+
+
+
+def test_get_entries(resolver: Resolver) -> None:
+    """
+    Testing batched request of flat file entries.
+    """
+
+    def build_record(entry_id: str) -> str:
+        return f"ENTRY       {entry_id}            CDS       T01002\nNAME        Gene{entry_id}\n///\n"
+
+    with RequestsMock() as mocked_response:
+
+        # Entries with identical suffix are requested in separate batches
+        mocked_response.add(
+            HTTP_METHOD_GET,
+            url="http://rest.kegg.jp/get/mmu:11797+mmu:266632",
+            body=build_record("11797") + build_record("266632"),
+            status=200,
+        )
+        mocked_response.add(
+            HTTP_METHOD_GET,
+            url="http://rest.kegg.jp/get/hsa:11797+hsa:00000",
+            body=build_record("11797"),
+            status=200,
+        )
+
+        results, errors = resolver.get_entries(
+            entries=["mmu:11797", "mmu:266632", "hsa:11797", "hsa:00000"],
+            batch_size=2,
+        )
+
+    assert list(results.keys()) == ["mmu:11797", "mmu:266632", "hsa:11797"]
+    assert results["mmu:266632"].startswith("ENTRY       266632")
+    assert list(errors.keys()) == ["hsa:00000"]
+
+    # Each record is cached as single file
+    with RequestsMock():
+        cached_results, _ = resolver.get_entries(entries=["mmu:266632"])
+
+    assert cached_results["mmu:266632"] == results["mmu:266632"]
+
+    # Entries saved by another process while waiting for locks are not requested again
+    lock_all = resolver.storage.lock_all
+
+    @contextmanager
+    def concurrent_lock_all(filenames: List[str]) -> Iterator[None]:
+        with lock_all(filenames=filenames):
+            resolver.storage.save(filename="entry_mmu_12345.txt", data=build_record("12345"))
+            yield
+
+    with RequestsMock() as mocked_response, patch.object(resolver.storage, "lock_all", concurrent_lock_all):
+        mocked_response.add(
+            HTTP_METHOD_GET,
+            url="http://rest.kegg.jp/get/mmu:67890",
+            body=build_record("67890"),
+            status=200,
+        )
+
+        results, errors = resolver.get_entries(entries=["mmu:12345", "mmu:67890"])
+
+    assert list(results.keys()) == ["mmu:12345", "mmu:67890"]
+    assert errors == {}
@@ -0,0 +1,120 @@
+""" Testing binary serialization of models """
+
+from unittest.mock import patch
+from xml.etree import ElementTree
+
+import pytest
+
+from keggtools.models import Pathway, Relation, Entry, Graphics, Reaction, Subtype
+from keggtools.serialize import BinaryReader, BinaryWriter
+
+
+def test_binary_writer_reader() -> None:
+    """
+    Testing string table and values of binary writer and reader.
+    """
+
+    writer: BinaryWriter = BinaryWriter()
+    writer.write_str("value")
+    writer.write_str(None)
+    writer.write_str("ünïcode")
+    writer.write_str("value")
+    writer.write_int(42)
+
+    reader: BinaryReader = BinaryReader(data=writer.to_bytes())
+
+    # Strings are stored only once
+    assert reader.strings == [None, "value", "ünïcode"]
+
+    assert reader.read_str() == "value"
+    assert reader.read_str() is None
+    assert reader.read_required_str() == "ünïcode"
+    assert reader.read_str() == "value"
+    assert reader.read_int() == 42
+
+    reader.check_end()
+
+    with pytest.raises(ValueError):
+        reader.read_int()
+
+
+
+def test_pathway_serialization(pathway: Pathway) -> None:
+    """
+    Testing serialized pathway is equal to source pathway.
+    """
+
+    loaded_pathway: Pathway = Pathway.from_bytes(pathway.to_bytes())
+
+    assert ElementTree.tostring(loaded_pathway.to_xml()) == ElementTree.tostring(pathway.to_xml())
+
+    # Subtypes of relations are not part of XML export
+    for relation, loaded_relation in zip(pathway.relations, loaded_pathway.relations):
+        assert [(item.name, item.value) for item in relation.subtypes] == \
+            [(item.name, item.value) for item in loaded_relation.subtypes]
+
+    # Field counts used by Entry and Relation match layout written by pack
+    for model in (pathway.entries[0].graphics, pathway.relations[0].subtypes[0]):
+        writer: BinaryWriter = BinaryWriter()
+        model.pack(writer=writer) # type: ignore
+        assert len(writer.values) == type(model).FIELD_COUNT # type: ignore
+
+    assert Graphics.FIELD_COUNT == 9 and Subtype.FIELD_COUNT == 2
+
+    # Child models are serialized on its own
+    entry: Entry = pathway.entries[0]
+    assert ElementTree.tostring(Entry.from_bytes(entry.to_bytes()).to_xml()) == ElementTree.tostring(entry.to_xml())
+
+    reaction: Reaction = Reaction.parse(ElementTree.fromstring(
+        "<reaction id=\"1\" name=\"rn:R001\" type=\"reversible\">"
+        "<substrate id=\"2\" name=\"cpd:C001\"><alt name=\"cpd:C002\"/></substrate>"
+        "<product id=\"3\" name=\"cpd:C003\"/>"
+        "</reaction>"
+    ))
+    assert ElementTree.tostring(Reaction.from_bytes(reaction.to_bytes()).to_xml()) == \
+        ElementTree.tostring(reaction.to_xml())
+
+
+
+def test_invalid_serialization(pathway: Pathway) -> None:
+    """
+    Testing invalid binary data is rejected.
+    """
+
+    data: bytes = pathway.to_bytes()
+
+    # Wrong model type
+    with pytest.raises(ValueError):
+        Relation.from_bytes(data)
+
+    # Truncated data and trailing bytes
+    with pytest.raises(ValueError):
+        Pathway.from_bytes(data[:-3])
+
+    with pytest.raises(ValueError):
+        Pathway.from_bytes(data + b"\x00")
+
+    # Invalid magic bytes
+    with pytest.raises(ValueError):
+        Pathway.from_bytes(b"XXXX" + data[4:])
+
+    # Unsupported format version
+    with patch("keggtools.serialize.FORMAT_VERSION", 0):
+        with pytest.raises(ValueError):
+            Pathway.from_bytes(data)
+
+    # Entry and relation fields with invalid references to string table or missing values
+    writer: BinaryWriter = BinaryWriter()
+    writer.write_str("Entry")
+    for _ in range(5):
+        writer.write_int(1000)
+
+    with pytest.raises(ValueError):
+        Entry.from_bytes(writer.to_bytes())
+
+    writer = BinaryWriter()
+    writer.write_str("Relation")
+    writer.write_str("1")
+
+    with pytest.raises(ValueError):
+        Relation.from_bytes(writer.to_bytes())
@@ -1,10 +1,24 @@
 """ Testing storage module """
 
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+from unittest.mock import patch
 
 import pytest
 
-from keggtools.storage import Storage
+from keggtools.bundle import BundleReader, write_bundle
+from keggtools.resolver import Resolver
+from keggtools.storage import (
+    LOCK_SLOTS,
+    Storage,
+    SQLiteStorage,
+    BundleStorage,
+    MemoryCache,
+    compress,
+    decompress,
+)
 
 from .conftest import CACHEDIR
 
@@ -98,3 +112,575 @@ def test_cache_readwrite(storage: Storage) -> None:
 
     with pytest.raises(FileNotFoundError):
         storage.load_dump("invalid.txt")
+
+
+
+def test_sqlite_storage(storage: Storage) -> None:
+    """
+    Testing saving/loading of entries with SQLite storage.
+    """
+
+    database: str = os.path.join(storage.cachedir, "cache.sqlite")
+    sqlite_storage: SQLiteStorage = SQLiteStorage(filename=database)
+
+    # Database file is created
+    assert os.path.isfile(database) is True
+
+    # Testing string entry
+    assert sqlite_storage.exist("test.txt") is False
+    assert sqlite_storage.save(filename="test.txt", data="hello world!") == os.path.join(database, "test.txt")
+    assert sqlite_storage.exist("test.txt") is True
+    assert sqlite_storage.load(filename="test.txt") == "hello world!"
+
+    # Testing binary dump
+    sqlite_storage.save_dump(filename="test.dump", data={"key": [1, 2, 3]})
+    assert sqlite_storage.load_dump(filename="test.dump") == {"key": [1, 2, 3]}
+
+    # Testing batched save and concurrent reads from multiple threads
+    sqlite_storage.save_many(items={f"file{index}.txt": f"content{index}" for index in range(100)})
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        loaded = list(executor.map(lambda index: sqlite_storage.load(f"file{index}.txt"), range(100)))
+
+    assert loaded == [f"content{index}" for index in range(100)]
+
+    # Second instance on same file reads the same entries
+    assert SQLiteStorage(filename=database).load(filename="file42.txt") == "content42"
+
+    with pytest.raises(FileNotFoundError):
+        sqlite_storage.load("invalid.txt")
+
+    sqlite_storage.close()
+
+
+
+@pytest.mark.parametrize("method", ["zlib", "gzip", "lzma", "zstd"])
+def test_compressed_storage(storage: Storage, method: str) -> None:
+    """
+    Testing transparent compression of cached files.
+    """
+
+    if method == "zstd":
+        pytest.importorskip("zstandard")
+
+    testing_payload: str = "<pathway>" + "<entry id=\"1\" />" * 100 + "</pathway>"
+
+    # Plain files written before compression was enabled are still readable
+    storage.save(filename="plain.kgml", data=testing_payload)
+
+    compressed_storage: Storage = Storage(cachedir=CACHEDIR, compression=method)
+    compressed_storage.save(filename="compressed.kgml", data=testing_payload)
+    compressed_storage.save_dump(filename="compressed.dump", data=testing_payload)
+
+    assert os.path.getsize(os.path.join(CACHEDIR, "compressed.kgml")) < len(testing_payload)
+
+    # Compressed files are detected by header
+    assert storage.load(filename="compressed.kgml") == testing_payload
+    assert storage.load_dump(filename="compressed.dump") == testing_payload
+    assert compressed_storage.load(filename="plain.kgml") == testing_payload
+
+    assert decompress(data=compress(data=b"x^test", method=method)) == b"x^test"
+
+
+
+def test_compression_invalid_method() -> None:
+    """
+    Testing error on unknown compression method.
+    """
+
+    assert decompress(data=b"x^plain text") == b"x^plain text"
+
+    with pytest.raises(ValueError):
+        compress(data=b"test", method="invalid")
+
+    with pytest.raises(ValueError):
+        Storage(cachedir=CACHEDIR, compression="invalid")
+
+
+
+def test_gzip_compression_reproducible() -> None:
+    """
+    Testing gzip output has no timestamp, so equal data gives equal compressed data.
+    """
+
+    compressed: bytes = compress(data=b"test" * 100, method="gzip")
+
+    assert compressed[4:8] == b"\0\0\0\0"
+    assert compress(data=b"test" * 100, method="gzip") == compressed
+    assert decompress(data=compressed) == b"test" * 100
+
+
+
+@pytest.mark.usefixtures("storage")
+def test_storage_prune() -> None:
+    """
+    Testing eviction of expired and least recently used files.
+    """
+
+    bounded_storage: Storage = Storage(cachedir=CACHEDIR, max_entries=2, max_bytes=1000, ttl=3600)
+
+    for index in range(4):
+        bounded_storage.save(filename=f"file{index}.txt", data="x" * 100)
+
+    # Expired file is treated as missing
+    expired_time: float = time.time() - 7200
+    os.utime(os.path.join(CACHEDIR, "file0.txt"), (expired_time, expired_time))
+    assert bounded_storage.exist("file0.txt") is False
+
+    # Set access times to make file3 the least recently used file
+    for index, access_time in ((1, 100.0), (2, 300.0), (3, 50.0)):
+        os.utime(os.path.join(CACHEDIR, f"file{index}.txt"), (access_time, time.time()))
+
+    bounded_storage.load("file1.txt")
+
+    statistics: Dict[str, int] = bounded_storage.prune()
+
+    assert statistics == {
+        "expired": 1,
+        "evicted": 1,
+        "removed_bytes": 200,
+        "entries": 2,
+        "bytes": 200,
+        "temp_files": 0,
+    }
+    assert sorted(os.listdir(CACHEDIR)) == ["file1.txt", "file2.txt"]
+
+    # Size limit evicts entries until remaining size fits
+    assert Storage(cachedir=CACHEDIR, max_bytes=150).prune()["evicted"] == 1
+
+    # Entries removed by other processes while pruning are skipped and not counted
+    bounded_storage.save(filename="file4.txt", data="x" * 100)
+    bounded_storage.save(filename="file5.txt", data="x" * 100)
+    os.utime(os.path.join(CACHEDIR, "file4.txt"), (10.0, time.time()))
+    entries: List[Tuple[str, int, float, float]] = bounded_storage.list_entries()
+    os.remove(os.path.join(CACHEDIR, "file4.txt"))
+
+    with patch.object(bounded_storage, "list_entries", return_value=entries):
+        statistics = bounded_storage.prune()
+
+    assert statistics["evicted"] == 0 and statistics["removed_bytes"] == 0 and statistics["entries"] == 2
+
+    # Stale temporary files of crashed writers are removed, temporary files of running writers are kept
+    for filename, age in ((".file1.txt.crashed.tmp", 7200), (".file1.txt.running.tmp", 0)):
+        with open(os.path.join(CACHEDIR, filename), "wb") as file_obj:
+            file_obj.write(b"partial")
+
+        os.utime(os.path.join(CACHEDIR, filename), (time.time() - age, time.time() - age))
+
+    with bounded_storage.lock(filename="file1.txt"):
+        assert bounded_storage.prune()["temp_files"] == 1
+
+    assert os.path.isfile(os.path.join(CACHEDIR, ".file1.txt.crashed.tmp")) is False
+    assert os.path.isfile(os.path.join(CACHEDIR, ".file1.txt.running.tmp")) is True
+    assert any(filename.startswith(".lock.") for filename in os.listdir(CACHEDIR))
+
+    with pytest.raises(ValueError):
+        Storage(cachedir=CACHEDIR, ttl=0)
+
+
+
+def test_sqlite_storage_prune(storage: Storage) -> None:
+    """
+    Testing eviction of entries in SQLite storage.
+    """
+
+    sqlite_storage: SQLiteStorage = SQLiteStorage(
+        filename=os.path.join(storage.cachedir, "cache.sqlite"),
+        max_entries=3,
+    )
+    sqlite_storage.save_many(items={f"file{index}.txt": "x" * 10 for index in range(5)})
+
+    # Loaded entry is most recently used and is kept
+    time.sleep(0.01)
+    sqlite_storage.load("file0.txt")
+
+    statistics: Dict[str, int] = sqlite_storage.prune()
+
+    assert statistics["evicted"] == 2 and statistics["entries"] == 3
+    assert sqlite_storage.exist("file0.txt") is True
+
+    sqlite_storage.close()
+
+
+
+def test_atomic_write(storage: Storage) -> None:
+    """
+    Testing that failed writes keep previous file content and leave no temporary files.
+    """
+
+    storage.save(filename="test.txt", data="old content")
+
+    with patch("keggtools.storage.os.replace", side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            storage.save(filename="test.txt", data="new content")
+
+    assert storage.load(filename="test.txt") == "old content"
+    assert os.listdir(CACHEDIR) == ["test.txt"]
+
+
+
+@pytest.mark.skipif(os.name != "posix", reason="File modes are only supported on POSIX systems.")
+def test_atomic_write_file_mode(storage: Storage) -> None:
+    """
+    Testing saved files and bundles follow umask like regular files, so shared caches stay readable.
+    """
+
+    umask: int = os.umask(0o022)
+
+    try:
+        bundle_path: str = os.path.join(CACHEDIR, "cache.bundle")
+
+        storage.save(filename="test.txt", data="content")
+        storage.export_bundle(path=bundle_path)
+
+        for path in (os.path.join(CACHEDIR, "test.txt"), bundle_path):
+            assert os.stat(path).st_mode & 0o777 == 0o644
+
+    finally:
+        os.umask(umask)
+
+
+
+def test_storage_lock(storage: Storage) -> None:
+    """
+    Testing exclusive lock of cached file across threads.
+    """
+
+    events: List[str] = []
+
+    def locked_write(name: str) -> None:
+        with storage.lock(filename="test.txt"):
+            events.append(f"enter-{name}")
+            time.sleep(0.05)
+            events.append(f"exit-{name}")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(locked_write, ["a", "b"]))
+
+    # Critical sections do not overlap
+    assert events[0].startswith("enter") and events[1].startswith("exit")
+    assert events[0][6:] == events[1][5:]
+
+    # Lock files are hidden from list of entries
+    assert [item[0] for item in storage.list_entries()] == []
+
+    # Number of lock files is bounded
+    for index in range(200):
+        with storage.lock(filename=f"file{index}.txt"):
+            pass
+
+    assert 0 < len([name for name in os.listdir(CACHEDIR) if name.startswith(".lock.")]) <= LOCK_SLOTS
+
+    # Files sharing a lock file are locked together without deadlock
+    filenames: List[str] = [f"file{index}.txt" for index in range(LOCK_SLOTS + 1)]
+
+    with storage.lock_all(filenames=filenames + filenames):
+        events.append("enter-all")
+
+    assert events[-1] == "enter-all"
+
+
+
+def test_sqlite_storage_lock(storage: Storage) -> None:
+    """
+    Testing exclusive lock of SQLite storage entry across threads without lock files.
+    """
+
+    sqlite_storage: SQLiteStorage = SQLiteStorage(filename=os.path.join(storage.cachedir, "db.sqlite"))
+    events: List[str] = []
+
+    def locked_write(name: str) -> None:
+        with sqlite_storage.lock(filename="test.txt"):
+            events.append(f"enter-{name}")
+            time.sleep(0.1)
+            events.append(f"exit-{name}")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(locked_write, ["a", "b"]))
+
+    assert events[0][6:] == events[1][5:]
+
+    # Lock of other entry is not blocked
+    with sqlite_storage.lock(filename="test.txt"):
+        with sqlite_storage.lock(filename="other.txt"):
+            pass
+
+    with sqlite_storage.lock_all(filenames=["test.txt", "other.txt", "test.txt"]):
+        pass
+
+    assert not any(name.endswith(".lock") for name in os.listdir(storage.cachedir))
+
+
+
+def test_memory_cache() -> None:
+    """
+    Testing LRU eviction, version check and statistics of in-memory cache.
+    """
+
+    with pytest.raises(ValueError):
+        MemoryCache(capacity=0)
+
+    cache: MemoryCache = MemoryCache(capacity=2)
+
+    cache.put(key="a", value=1, version=1)
+    cache.put(key="b", value=2, version=1)
+
+    # Access "a" to make "b" the least recently used item
+    assert cache.get(key="a", version=1) == 1
+
+    cache.put(key="c", value=3, version=1)
+
+    assert len(cache) == 2
+    assert cache.get(key="b", version=1) is None
+    assert cache.get(key="c", version=1) == 3
+
+    # Outdated items are removed
+    assert cache.get(key="a", version=2) is None
+    assert len(cache) == 1
+
+    assert cache.statistics == {"hits": 2, "misses": 2, "evictions": 1, "items": 1}
+
+    cache.invalidate(key="c")
+    assert len(cache) == 0
+
+
+
+def test_storage_get_version(storage: Storage) -> None:
+    """
+    Testing version of cached files changes with file content.
+    """
+
+    assert storage.get_version(filename="test.txt") is None
+
+    storage.save(filename="test.txt", data="content")
+    version = storage.get_version(filename="test.txt")
+
+    assert version is not None
+
+    storage.save(filename="test.txt", data="new content")
+    assert storage.get_version(filename="test.txt") != version
+
+    # Loading with access tracking keeps version, also for modification times not representable as float
+    tracking_storage: Storage = Storage(cachedir=CACHEDIR, max_entries=10)
+    path: str = os.path.join(CACHEDIR, "test.txt")
+    os.utime(path, ns=(1792304104705089501, 1792304104705089501))
+    version = tracking_storage.get_version(filename="test.txt")
+
+    tracking_storage.load(filename="test.txt")
+    tracking_storage.open_stream(filename="test.txt").close()
+
+    assert tracking_storage.get_version(filename="test.txt") == version
+    assert os.stat(path).st_mtime_ns == 1792304104705089501
+
+    sqlite_storage: SQLiteStorage = SQLiteStorage(filename=os.path.join(CACHEDIR, "cache.db"))
+
+    try:
+        assert sqlite_storage.get_version(filename="test.txt") is None
+
+        sqlite_storage.save(filename="test.txt", data="content")
+        version = sqlite_storage.get_version(filename="test.txt")
+
+        assert version is not None
+
+        sqlite_storage.save(filename="test.txt", data="new content")
+        assert sqlite_storage.get_version(filename="test.txt") != version
+    finally:
+        sqlite_storage.close()
+
+
+
+def test_storage_bundle(storage: Storage) -> None:
+    """
+    Testing export and import of cache bundle.
+    """
+
+    storage.save(filename="a.txt", data="content a")
+    storage.save(filename="b.txt", data="content b" * 100)
+
+    bundle_path: str = os.path.join(CACHEDIR, ".bundle.ktb")
+    manifest: Dict[str, Any] = storage.export_bundle(path=bundle_path, release="108.0")
+
+    assert manifest["release"] == "108.0"
+    assert sorted(manifest["entries"].keys()) == ["a.txt", "b.txt"]
+
+    # Entries are readable in place
+    with BundleReader(path=bundle_path) as reader:
+        assert reader.release == "108.0"
+        assert "a.txt" in reader and "c.txt" not in reader
+        assert reader.read(key="b.txt") == b"content b" * 100
+
+        with pytest.raises(FileNotFoundError):
+            reader.read(key="c.txt")
+
+    # Import into compressed SQLite storage
+    sqlite_storage: SQLiteStorage = SQLiteStorage(filename=os.path.join(CACHEDIR, ".cache.db"), compression="zlib")
+
+    try:
+        assert sqlite_storage.import_bundle(path=bundle_path) == 2
+        assert sqlite_storage.load(filename="a.txt") == "content a"
+
+        sqlite_storage.save(filename="a.txt", data="changed")
+        assert sqlite_storage.import_bundle(path=bundle_path, overwrite=False) == 0
+        assert sqlite_storage.load(filename="a.txt") == "changed"
+    finally:
+        sqlite_storage.close()
+
+    # Corrupted entries are rejected
+    with open(bundle_path, "r+b") as f_obj:
+        f_obj.seek(manifest["entries"]["a.txt"]["offset"])
+        f_obj.write(b"X")
+
+    storage.remove(filename="a.txt")
+
+    with pytest.raises(ValueError):
+        storage.import_bundle(path=bundle_path)
+
+    with pytest.raises(ValueError):
+        storage.import_bundle(path=os.path.join(CACHEDIR, "b.txt"))
+
+
+
+def test_storage_bundle_mtime(storage: Storage) -> None:
+    """
+    Testing imported entries keep modification time of bundle, so time to live is not reset.
+    """
+
+    storage.save(filename="old.txt", data="content")
+    os.utime(storage.build_cache_path(filename="old.txt"), (time.time(), time.time() - 3600))
+
+    bundle_path: str = os.path.join(CACHEDIR, ".bundle.ktb")
+    storage.export_bundle(path=bundle_path)
+    storage.remove(filename="old.txt")
+
+    assert storage.import_bundle(path=bundle_path) == 1
+    assert time.time() - storage.list_entries()[0][2] == pytest.approx(3600, abs=60)
+
+    # Expired entries of bundle are pruned
+    storage.ttl = 60
+    assert storage.prune()["expired"] == 1
+
+    sqlite_storage: SQLiteStorage = SQLiteStorage(filename=os.path.join(CACHEDIR, ".cache.db"), ttl=60)
+
+    try:
+        assert sqlite_storage.import_bundle(path=bundle_path) == 1
+        assert sqlite_storage.exist(filename="old.txt") is False
+    finally:
+        sqlite_storage.close()
+
+
+
+@pytest.mark.parametrize("key", [
+    "../evil.txt",
+    "sub/evil.txt",
+    os.path.join(os.path.abspath(CACHEDIR), "evil.txt"),
+    ".hidden",
+    "..",
+    "",
+])
+def test_storage_bundle_invalid_key(storage: Storage, key: str) -> None:
+    """
+    Testing bundles with names of entries outside of cache folder are rejected before anything is written.
+    """
+
+    bundle_path: str = os.path.join(CACHEDIR, ".bundle.ktb")
+    write_bundle(path=bundle_path, entries=[("valid.txt", b"content", time.time()), (key, b"evil", time.time())])
+
+    with pytest.raises(ValueError):
+        storage.import_bundle(path=bundle_path)
+
+    assert storage.exist(filename="valid.txt") is False
+    assert not os.path.exists(os.path.join(os.path.dirname(os.path.abspath(CACHEDIR)), "evil.txt"))
+
+
+
+def test_bundle_storage(storage: Storage) -> None:
+    """
+    Testing read-only memory-mapped bundle storage with resolver.
+    """
+
+    with open(os.path.join(os.path.dirname(__file__), "pathway.kgml"), "r", encoding="utf-8") as file_obj:
+        kgml: str = file_obj.read()
+
+    storage.save(filename="mmu_path12345.kgml", data=kgml)
+    Storage(cachedir=CACHEDIR, compression="zlib").save(filename="compound.tsv", data="cpd:C00001\tH2O\n")
+
+    bundle_path: str = os.path.join(CACHEDIR, ".bundle.ktb")
+    storage.export_bundle(path=bundle_path, release="108.0")
+
+    bundle_storage: BundleStorage = BundleStorage(filename=bundle_path, verify=True)
+
+    assert bundle_storage.release == "108.0"
+    assert bundle_storage.exist(filename="mmu_path12345.kgml") is True
+    assert bundle_storage.exist(filename="missing.kgml") is False
+    assert bundle_storage.get_version(filename="missing.kgml") is None
+    assert sorted(item[0] for item in bundle_storage.list_entries()) == ["compound.tsv", "mmu_path12345.kgml"]
+
+    # Uncompressed and compressed entries
+    assert bundle_storage.load(filename="mmu_path12345.kgml") == kgml
+    assert bundle_storage.load(filename="compound.tsv") == "cpd:C00001\tH2O\n"
+
+    view: memoryview = bundle_storage.load_view(filename="compound.tsv")
+    assert view.readonly is True
+    view.release()
+
+    with pytest.raises(FileNotFoundError):
+        bundle_storage.load(filename="missing.kgml")
+
+    with pytest.raises(PermissionError):
+        bundle_storage.save(filename="test.txt", data="content")
+
+    with pytest.raises(PermissionError):
+        bundle_storage.remove(filename="compound.tsv")
+
+    # Resolver works on bundle without requests, parsed cache is skipped for read-only storage
+    resolver: Resolver = Resolver(cache=bundle_storage, parsed_cache=True)
+
+    assert resolver.get_pathway(organism="mmu", code="12345").title is not None
+    assert resolver.get_compounds() == {"cpd:C00001": "H2O"}
+
+    # Missing entries are not requested
+    assert bundle_storage.read_only is True
+    assert storage.read_only is False
+
+    with patch.object(resolver, "_get") as get_mock:
+        with pytest.raises(FileNotFoundError):
+            resolver.get_pathway(organism="mmu", code="99999")
+
+        results, errors = resolver.get_entries(entries=["mmu:99999"])
+
+        get_mock.assert_not_called()
+
+    assert results == {}
+    assert isinstance(errors["mmu:99999"], FileNotFoundError)
+
+    with bundle_storage.lock_all(filenames=["compound.tsv"]):
+        pass
+
+    bundle_storage.close()
+
+
+
+@pytest.mark.parametrize("method", [None, "zlib", "gzip", "lzma"])
+def test_open_stream(storage: Storage, method: str) -> None:
+    """
+    Testing streams of cached files are decompressed.
+    """
+
+    compressed_storage: Storage = Storage(cachedir=CACHEDIR, compression=method)
+    compressed_storage.save(filename="test.txt", data="content" * 100)
+
+    with compressed_storage.open_stream(filename="test.txt") as stream:
+        assert stream.read() == b"content" * 100
+
+    sqlite_storage: SQLiteStorage = SQLiteStorage(filename=os.path.join(CACHEDIR, ".cache.db"), compression=method)
+
+    try:
+        sqlite_storage.save(filename="test.txt", data="content")
+
+        with sqlite_storage.open_stream(filename="test.txt") as stream:
+            assert stream.read() == b"content"
+    finally:
+        sqlite_storage.close()
+
+    with pytest.raises(FileNotFoundError):
+        storage.open_stream(filename="missing.txt")
@@ -0,0 +1,121 @@
+""" Testing keggtools throttle module """
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from responses import RequestsMock, GET as HTTP_METHOD_GET
+
+from keggtools.resolver import Resolver
+from keggtools.storage import Storage
+from keggtools.throttle import FileRateLimiter, RateLimiter, RetryPolicy
+
+
+def test_rate_limiter() -> None:
+    """
+    Testing token bucket rate limiter.
+    """
+
+    limiter: RateLimiter = RateLimiter(rate=10.0, capacity=2)
+
+    with patch("keggtools.throttle.time.sleep") as mock:
+
+        # Burst of bucket capacity is not throttled
+        assert limiter.acquire() == 0.0
+        assert limiter.acquire() == 0.0
+        mock.assert_not_called()
+
+        # Empty bucket throttles next request by approx. 1/rate seconds
+        wait_time: float = limiter.acquire()
+        assert 0.0 < wait_time <= 0.1
+        mock.assert_called_once()
+
+    assert limiter.acquired == 3
+    assert limiter.throttled_time == wait_time
+
+    with pytest.raises(ValueError):
+        RateLimiter(rate=0)
+
+
+
+def test_file_rate_limiter(storage: Storage) -> None:
+    """
+    Testing token bucket shared by rate limiters of different processes through bucket file.
+    """
+
+    path: str = os.path.join(storage.cachedir, ".rate_limit")
+
+    # Instances with same bucket file stand for limiters of separate processes
+    first: FileRateLimiter = FileRateLimiter(path=path, rate=10.0, capacity=2)
+    second: FileRateLimiter = FileRateLimiter(path=path, rate=10.0, capacity=2)
+
+    with patch("keggtools.throttle.time.sleep") as mock:
+
+        # Burst of bucket capacity is shared by both instances
+        assert first.acquire() == 0.0
+        assert second.acquire() == 0.0
+        mock.assert_not_called()
+
+        # Empty bucket throttles requests of both instances. Debt of first request delays the second one further.
+        first_wait: float = first.acquire()
+        second_wait: float = second.acquire()
+        assert 0.0 < first_wait <= 0.1
+        assert first_wait < second_wait <= 0.2
+        assert mock.call_count == 2
+
+    assert first.acquired == 2
+    assert second.throttled_time == second_wait
+
+    # Damaged bucket file starts with full bucket
+    with open(path, "wb") as file_obj:
+        file_obj.write(b"invalid")
+
+    assert FileRateLimiter(path=path, rate=10.0, capacity=1).acquire() == 0.0
+
+
+
+def test_retry_policy_backoff() -> None:
+    """
+    Testing exponential backoff with jitter.
+    """
+
+    policy: RetryPolicy = RetryPolicy(backoff_factor=1.0, max_backoff=5.0)
+
+    for attempt in range(6):
+        assert 0.0 <= policy.get_backoff(attempt=attempt) <= min(5.0, 2 ** attempt)
+
+    with pytest.raises(ValueError):
+        RetryPolicy(max_retries=-1)
+
+
+
+def test_resolver_retry(resolver: Resolver) -> None:
+    """
+    Testing retry of throttled requests by resolver session.
+    """
+
+    with RequestsMock() as mocked_response, patch("keggtools.throttle.time.sleep") as mock:
+
+        # First two requests are rejected by server
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/list/organism", status=429)
+        mocked_response.add(
+            HTTP_METHOD_GET,
+            url="http://rest.kegg.jp/list/organism",
+            status=403,
+            headers={"Retry-After": "2"},
+        )
+        mocked_response.add(
+            HTTP_METHOD_GET,
+            url="http://rest.kegg.jp/list/organism",
+            body="T01001\thsa\tHomo sapiens (human)\tEukaryotes\n",
+            status=200,
+        )
+
+        assert resolver.get_organism_list()["hsa"] == "Homo sapiens (human)"
+
+        # Retry-After header of second response is respected
+        assert mock.call_count == 2
+        assert mock.call_args[0][0] == 2.0
+
+    assert resolver.statistics["retries"] == 2
@@ -3,12 +3,18 @@
 from typing import Dict, List
 from xml.etree.ElementTree import Element
 
+import pytest
+
 
 from keggtools.utils import (
     ColorGradient,
     parse_tsv,
     parse_xml,
+    parse_kgml,
+    get_xml_backend,
     parse_tsv_to_dict,
+    split_flat_file,
+    get_flat_file_entry_id,
     is_valid_pathway_name,
     is_valid_pathway_number,
     is_valid_pathway_org,
@@ -35,6 +41,33 @@ def test_xml_parsing_wrapper() -> None:
 
 
 
+@pytest.mark.parametrize("backend", ["etree", "lxml"])
+def test_kgml_parsing_backends(backend: str) -> None:
+    """
+    Testing KGML parsing with all XML backends.
+    """
+
+    if backend == "lxml":
+        pytest.importorskip("lxml")
+
+    element: Element = parse_kgml(
+        data="<?xml version=\"1.0\"?>\n<pathway name=\"path:mmu00010\"><!-- comment --><entry id=\"1\"/></pathway>",
+        backend=backend,
+    )
+
+    assert element.tag == "pathway"
+    assert element.attrib.get("name") == "path:mmu00010"
+
+    # Comments are not part of children
+    assert [child.tag for child in element] == ["entry"]
+
+    assert get_xml_backend(backend=backend) == backend
+
+    with pytest.raises(ValueError):
+        get_xml_backend(backend="invalid")
+
+
+
 def test_attribute_checks() -> None:
     """
     Test XML element attribute check functions.
@@ -96,6 +129,24 @@ def test_parse_tsv() -> None:
 
 
 
+def test_split_flat_file() -> None:
+    """
+    Testing splitting of concatenated flat file records.
+    """
+
+    flat_data: str = "ENTRY       hsa04010    Pathway\nNAME        MAPK\n///\n" \
+        "ENTRY       C00001    Compound\n///\n\n"
+
+    records: List[str] = split_flat_file(data=flat_data)
+
+    assert len(records) == 2
+    assert records[1] == "ENTRY       C00001    Compound\n///\n"
+
+    assert get_flat_file_entry_id(record=records[0]) == "hsa04010"
+    assert get_flat_file_entry_id(record="NAME        MAPK\n///\n") is None
+
+
+
 def test_valid_pathway_org() -> None:
     """
     Testing org code validation function.